@@ -0,0 +1,199 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+from datetime import datetime
+
+from utils_fingerprint import cache_fingerprints, file_sha256
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the layout of a bundle changes
+BUNDLE_FORMAT_VERSION = 1
+BUNDLE_MANIFEST_FILE_NAME = 'bundle_manifest.json'
+BUNDLE_CURRENT_FILE_NAME = 'current.json'
+
+# Data files are validated at startup. Cached outputs (.pkl) are keyed by their fingerprint and
+# gain entries as the app runs, and the store manifest is rewritten with them, so they aren't.
+BUNDLE_UNVALIDATED_EXTENSIONS = ('.pkl', '.tmp')
+BUNDLE_UNVALIDATED_FILE_NAMES = ('store_manifest.json', BUNDLE_MANIFEST_FILE_NAME)
+
+
+def bundle_id_for(fingerprints_dict, latest_period):
+    """
+    Returns the ID of the bundle of a set of cache layer fingerprints, e.g. '2023-12-3f9c2a1b0d4e'.
+    """
+    fingerprints_hash = hashlib.sha256(json.dumps(fingerprints_dict, sort_keys=True).encode('utf-8')).hexdigest()
+    return f"{latest_period.strftime('%Y-%m')}-{fingerprints_hash[:12]}"
+
+
+def bundle_data_files(bundle_path):
+    """
+    Returns the data files of a bundle (relative paths, sorted), the files validated at startup.
+    """
+    return sorted(
+        file_name for file_name in os.listdir(bundle_path)
+        if os.path.isfile(os.path.join(bundle_path, file_name))
+        and not file_name.endswith(BUNDLE_UNVALIDATED_EXTENSIONS)
+        and file_name not in BUNDLE_UNVALIDATED_FILE_NAMES
+    )
+
+
+def write_bundle_manifest(
+        bundle_path,
+        bundle_id,
+        source_fingerprint,
+        fingerprints_dict,
+        source_file_names,
+        precomputed_dict,
+):
+    """
+    Writes a bundle's manifest, recording what it was compiled from and the size and sha256 of
+    every data file in it.
+
+    Parameters:
+    - bundle_path (str): The bundle folder.
+    - bundle_id (str): The bundle ID.
+    - source_fingerprint (str): Fingerprint of the source workbooks.
+    - fingerprints_dict (dict): Cache layer fingerprints the bundle was compiled with.
+    - source_file_names (list): The source workbooks.
+    - precomputed_dict (dict): What was precomputed, e.g. periods and top x values.
+
+    Returns:
+    - dict: The manifest.
+    """
+    manifest = {
+        'bundle_format_version': BUNDLE_FORMAT_VERSION,
+        'bundle_id': bundle_id,
+        'compiled_at': datetime.now().isoformat(timespec='seconds'),
+        'source_fingerprint': source_fingerprint,
+        'source_file_names': [os.path.basename(file_name) for file_name in source_file_names],
+        'fingerprints': fingerprints_dict,
+        'precomputed': precomputed_dict,
+        'files': {
+            file_name: {
+                'size': os.path.getsize(os.path.join(bundle_path, file_name)),
+                'sha256': file_sha256(os.path.join(bundle_path, file_name)),
+            }
+            for file_name in bundle_data_files(bundle_path)
+        },
+    }
+
+    manifest_path = os.path.join(bundle_path, BUNDLE_MANIFEST_FILE_NAME)
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_path + '.tmp', manifest_path)
+
+    return manifest
+
+
+def read_bundle_manifest(bundle_path):
+    manifest_path = os.path.join(bundle_path, BUNDLE_MANIFEST_FILE_NAME)
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path, 'r') as f:
+        return json.load(f)
+
+
+def set_current_bundle(bundles_folder, bundle_id):
+    """
+    Points the bundles folder at a bundle, atomically, so the app never sees a partial switch.
+    """
+    current_path = os.path.join(bundles_folder, BUNDLE_CURRENT_FILE_NAME)
+    with open(current_path + '.tmp', 'w') as f:
+        json.dump({'bundle_id': bundle_id}, f)
+    os.replace(current_path + '.tmp', current_path)
+
+
+def current_bundle_id(bundles_folder):
+    current_path = os.path.join(bundles_folder, BUNDLE_CURRENT_FILE_NAME)
+    if not os.path.exists(current_path):
+        return None
+    with open(current_path, 'r') as f:
+        return json.load(f)['bundle_id']
+
+
+def prune_old_bundles(bundles_folder, keep_bundles):
+    """
+    Removes all but the keep_bundles most recently compiled bundles, never the current one.
+    """
+    keep_id = current_bundle_id(bundles_folder)
+    bundle_ids = sorted(
+        (
+            file_name for file_name in os.listdir(bundles_folder)
+            if read_bundle_manifest(os.path.join(bundles_folder, file_name)) is not None
+        ),
+        key=lambda bundle_id: read_bundle_manifest(os.path.join(bundles_folder, bundle_id))['compiled_at'],
+        reverse=True,
+    )
+    for bundle_id in bundle_ids[keep_bundles:]:
+        if bundle_id != keep_id:
+            logger.info(f"Removing old bundle: {bundle_id}")
+            shutil.rmtree(os.path.join(bundles_folder, bundle_id))
+
+
+def validate_bundle(bundle_path, data_config_dict, verify_checksums=False):
+    """
+    Checks that a bundle can be served: it has this bundle format, was compiled with the
+    current config and code versions (the same cache layer fingerprints) and its data files
+    are complete.
+
+    Parameters:
+    - bundle_path (str): The bundle folder.
+    - data_config_dict (dict): The data configuration dictionary.
+    - verify_checksums (bool): Also check each data file's sha256, not only its size.
+
+    Returns:
+    - dict: The bundle manifest, or None (with the reason logged) if the bundle isn't valid.
+    """
+    manifest = read_bundle_manifest(bundle_path)
+    if manifest is None:
+        logger.warning(f"Bundle {bundle_path} has no manifest")
+        return None
+
+    if manifest['bundle_format_version'] != BUNDLE_FORMAT_VERSION:
+        logger.warning(f"Bundle {manifest['bundle_id']} has bundle format {manifest['bundle_format_version']}")
+        return None
+
+    fingerprints_dict = cache_fingerprints(
+        source_fingerprint=manifest['source_fingerprint'],
+        data_config_dict=data_config_dict,
+    )
+    if fingerprints_dict != manifest['fingerprints']:
+        stale_layers = [layer for layer in fingerprints_dict if fingerprints_dict[layer] != manifest['fingerprints'].get(layer)]
+        logger.warning(f"Bundle {manifest['bundle_id']} was compiled with another config or code version: {stale_layers}")
+        return None
+
+    for file_name, file_entry in manifest['files'].items():
+        file_path = os.path.join(bundle_path, file_name)
+        if (
+            not os.path.exists(file_path) or
+            os.path.getsize(file_path) != file_entry['size'] or
+            (verify_checksums and file_sha256(file_path) != file_entry['sha256'])
+        ):
+            logger.warning(f"Bundle {manifest['bundle_id']} file {file_name} is missing or changed")
+            return None
+
+    return manifest
+
+
+def load_current_bundle(data_config_dict):
+    """
+    Returns the current bundle if it is valid, see validate_bundle.
+
+    Returns:
+    - tuple: (bundle_path, manifest), or (None, None) if there is no valid current bundle.
+    """
+    bundle_settings = data_config_dict['bundle_settings']
+    bundle_id = current_bundle_id(bundle_settings['folder'])
+    if bundle_id is None:
+        return None, None
+
+    bundle_path = os.path.join(bundle_settings['folder'], bundle_id)
+    manifest = validate_bundle(bundle_path, data_config_dict, verify_checksums=bundle_settings['verify_checksums'])
+    if manifest is None:
+        return None, None
+
+    logger.info(f"Serving bundle {bundle_id}, compiled {manifest['compiled_at']}")
+    return bundle_path, manifest
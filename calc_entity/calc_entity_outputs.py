@@ -5,7 +5,11 @@ import pandas as pd
 import numpy as np
 
 from chart_generator import chart_selected_col_bar
+from data_cube import metric_values
+from data_rank_index import top_companies
 from utils import rounded_dollars, format_percentage
+from utils_calendar import to_month_index, month_end_dates
+from utils_fingerprint import fingerprinted_name, prune_stale_cache_files
 
 
 logger = logging.getLogger(__name__)
@@ -20,8 +24,13 @@ def initiate_col_to_graph_current_df(
         company_order_list,
         color_discrete_map,
 ):
-    col_to_graph_current_df = col_to_graph_df[
-            col_to_graph_df[date_column] == selected_date].copy()
+    # Balances of the companies with data for the selected date
+    current_balances = col_to_graph_df.loc[selected_date].dropna()
+    col_to_graph_current_df = pd.DataFrame({
+        date_column: pd.Timestamp(selected_date),
+        company_column: current_balances.index,
+        col_to_graph: current_balances.values,
+    })
 
     # Set monthly total value
     month_total_column = f"{col_to_graph} - month total"
@@ -59,6 +68,7 @@ def initiate_col_to_graph_current_df(
 
 def period_movements(
         col_to_graph_df,
+        period_month_lookup,
         col_to_graph_current_df,
         col_to_graph,
         date_column,
@@ -70,32 +80,24 @@ def period_movements(
 ):
     # initiate dictionary
     period_movements_dict = {}
+    selected_month_index = to_month_index([selected_date])[0]
 
     # Run through all month in the reference_dates_config
     for period_key, period_values in data_config_dict['reference_dates_config'].items():
-        # Calculate the month end date of the reference month based on months_int
-        date_value = (
-            pd.to_datetime(selected_date).date() - 
-            pd.DateOffset(months=period_values['info']['months_int'])
-        ) + pd.offsets.MonthEnd(0)
-
-        # Check if date_value exists in the date_column
-        if date_value in col_to_graph_df[date_column].values:
+        # Position of the reference month based on months_int, if it exists in the data
+        reference_month_index = selected_month_index - period_values['info']['months_int']
+        reference_position = period_month_lookup.get(reference_month_index)
+
+        if reference_position is not None:
             reference_balance_col = f"{col_to_graph} - {period_key} - balance"
             ref_bal_mvmt_dol_col = f"{col_to_graph} - {period_key} - movement ($)"
             ref_bal_mvmt_dol_col_txt = f"{col_to_graph} - {period_key} - movement ($) - text"
             ref_bal_mvmt_perc_col = f"{col_to_graph} - {period_key} - CAGR (%)"
             ref_bal_mvmt_perc_col_txt = f"{col_to_graph} - {period_key} - CAGR (%) - text"
 
-            # Merge the reference data data to the current df
-            filtered_df = col_to_graph_df[
-                col_to_graph_df[date_column] == date_value][[company_column, col_to_graph]].copy()
-            filtered_df.rename(columns={col_to_graph: reference_balance_col}, inplace=True)
-            col_to_graph_current_df = col_to_graph_current_df.merge(
-                filtered_df,
-                on=company_column,
-                how='left',
-            )
+            # Add the reference date balances to the current df
+            col_to_graph_current_df[reference_balance_col] = col_to_graph_current_df[
+                company_column].map(col_to_graph_df.iloc[reference_position])
 
             # Create the dollar movement column
             col_to_graph_current_df[ref_bal_mvmt_dol_col] = (
@@ -154,13 +156,14 @@ def period_movements(
             )
 
         else:
-            logger.debug(f"{date_value} doesn't exist in the data, no graph created")
+            logger.debug(f"{month_end_dates([reference_month_index])[0]} doesn't exist in the data, no graph created")
     
     return col_to_graph_current_df, period_movements_dict
 
 
 def graph_columns(
-        df_cleaned,
+        data_cube,
+        rank_index,
         date_column,
         selected_date,
         company_column,
@@ -180,32 +183,24 @@ def graph_columns(
         col_dict = {}
 
         # Get top_x company order for consistency across graphs
-        df_cleaned_ordered = df_cleaned[
-            (df_cleaned[date_column] == selected_date)
-        ][[date_column, company_column, col_to_graph]].copy()
-        top_x_companies = list(df_cleaned_ordered.sort_values(
-            by=col_to_graph, ascending=False).head(top_x_value)[company_column])
-        del df_cleaned_ordered
+        top_x_companies = top_companies(rank_index, selected_date, col_to_graph, top_x_value)
         if selected_company not in top_x_companies:
             top_x_companies.pop()
             top_x_companies.append(selected_company)
 
-        # Filter DataFrame to get rows for top companies only
-        top_companies_df = df_cleaned[
-            df_cleaned[company_column].isin(top_x_companies)
-        ][[date_column, company_column, col_to_graph]].copy()
-
-        # Filter DataFrame for 'other' companies and group by date_column to sum their values
-        other_companies_df = df_cleaned[
-            ~df_cleaned[company_column].isin(top_x_companies)][[date_column, col_to_graph]]
-        other_companies_grouped = other_companies_df.groupby(date_column).sum().reset_index()
-        other_companies_grouped[company_column] = other_col
+        # Dates by companies data frame, top companies keep their own column (in cube order)
+        col_values = metric_values(data_cube, col_to_graph)
+        is_top_company = np.zeros(len(data_cube['companies']), dtype=bool)
+        is_top_company[[data_cube['company_lookup'][company] for company in top_x_companies]] = True
+        col_to_graph_df = pd.DataFrame(
+            col_values[:, is_top_company],
+            index=pd.DatetimeIndex(data_cube['periods'], name=date_column),
+            columns=np.array(data_cube['companies'], dtype=object)[is_top_company],
+        )
 
-        # Combine top companies data with 'Other' companies data
-        col_to_graph_df = pd.concat([top_companies_df, other_companies_grouped])
-        
-        # reset index
-        col_to_graph_df.reset_index(drop=True, inplace=True)
+        # Sum the 'other' companies for each date
+        if not is_top_company.all():
+            col_to_graph_df[other_col] = np.nansum(col_values[:, ~is_top_company], axis=1)
 
         # Ordered company list
         company_order_list = top_x_companies
@@ -224,6 +219,7 @@ def graph_columns(
         # Calculate Period Movements
         col_to_graph_current_df, period_movements_dict = period_movements(
             col_to_graph_df=col_to_graph_df,
+            period_month_lookup=data_cube['period_month_lookup'],
             col_to_graph_current_df=col_to_graph_current_df,
             col_to_graph=col_to_graph,
             date_column=date_column,
@@ -246,7 +242,8 @@ def graph_columns(
 
 
 def generate_entity_outputs(
-        df_cleaned,
+        data_cube,
+        rank_index,
         date_column,
         selected_date,
         company_column,
@@ -255,13 +252,17 @@ def generate_entity_outputs(
         pkl_folder_name,
         data_config_dict,
         color_discrete_map,
+        cache_fingerprint,
 ):
     logger.info("Executing: generate_entity_outputs")
 
-    # Set pickle variable path
+    # Set pickle variable path, keyed by the entity outputs cache fingerprint
     entity_dict_pkl=os.path.join(
         pkl_folder_name,
-        f"entity_pickle-{selected_date.strftime('%Y-%m-%d')}_{top_x_value}.pkl"
+        fingerprinted_name(
+            f"entity_pickle-{selected_date.strftime('%Y-%m-%d')}_{top_x_value}",
+            cache_fingerprint,
+        ) + '.pkl'
     )
 
     # Check if entity data already exists and load it, otherwise create the empty dictionary
@@ -290,7 +291,8 @@ def generate_entity_outputs(
 
         # create entity outputs
         entity_dict[entity_key] = graph_columns(
-            df_cleaned=df_cleaned,
+            data_cube=data_cube,
+            rank_index=rank_index,
             date_column=date_column,
             selected_date=selected_date,
             company_column=company_column,
@@ -305,5 +307,6 @@ def generate_entity_outputs(
         # Write entity dictionary to pickle file
         with open(entity_dict_pkl, 'wb') as f:
             pickle.dump(entity_dict, f)
+        prune_stale_cache_files(pkl_folder_name, 'entity_pickle-', cache_fingerprint, '.pkl')
 
     return entity_dict[entity_key]
\ No newline at end of file
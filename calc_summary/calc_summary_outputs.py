@@ -6,61 +6,69 @@ import plotly.express as px
 import pandas as pd
 import plotly.graph_objects as go
 
-from calc_summary.summary_utils import determine_reference_dates
+from calc_summary.summary_movements import REFERENCE_MONTHS_COLUMN, REFERENCE_PERIOD_COLUMN
 from calc_summary.summerise_loans import generate_summary_loans_dict
 from calc_summary.summerise_deposits import generate_summary_deposits_dict
+from utils_fingerprint import fingerprinted_name, prune_stale_cache_files
 from utils import movement_text, dollar_movement_text, rounded_dollars
 
 logger = logging.getLogger(__name__)
 
 def generate_df_summary_output(
-        df_summary,
+        df_summary_movements,
         date_column,
         selected_date,
         reference_dates,
 ):
-    # Obtain reference dates
-    dates_list = []
-    for key in reference_dates.keys():
-        dates_list = dates_list + [reference_dates[key]['date']]
-    dates_list = [selected_date] + dates_list
-
-    # Filter the DataFrame for rows where the date is one of the reference dates or the selected_date
-    df_summary_output = df_summary[df_summary[date_column].isin(dates_list)].copy()
-
-    # Sort the DataFrame by Period for better visualization and to ensure calculations are done correctly
-    df_summary_output.sort_values(date_column, inplace=True)
-
-    # Find the row for the selected_date
-    selected_date_row = df_summary_output[df_summary_output[date_column] == selected_date]
-
-    # For each column (except 'Period'), calculate the movement and create a new column
-    for column in df_summary_output.columns:
-        if column != date_column:  # Skip the 'Period' column
-            # Calculate the difference from each row to the value at selected_date for this column
-            df_summary_output[column + ' - movement'] = selected_date_row[column].values[0] - df_summary_output[column]
-
-    for key, value in reference_dates.items():
-        df_summary_output.loc[df_summary_output['Period'] == value['date'], 'date_reference'] = key
-    df_summary_output.loc[df_summary_output['Period'] == selected_date, 'date_reference'] = 'selected_date'
+    """
+    Looks up the summary output of the selected date in the movement table: the row of each
+    reference date and of the selected date, with the movement of every column to the
+    selected date.
+
+    Parameters:
+    - df_summary_movements (pandas.DataFrame): The movement table, see
+      load_or_generate_summary_movements.
+    - date_column (str): The name of the date column.
+    - selected_date (datetime): The selected date.
+    - reference_dates (dict): The reference dates of the selected date.
+
+    Returns:
+    - pandas.DataFrame: One row per date, in date order, labelled by its reference in the
+      'date_reference' column.
+    """
+    # Reference of each months ago, the selected date being 0 months ago
+    date_reference_dict = {value['months_int']: key for key, value in reference_dates.items()}
+    date_reference_dict[0] = 'selected_date'
+    months_list = sorted(date_reference_dict, reverse=True)
+
+    # Rows of the selected date, reference period first
+    df_summary_output = df_summary_movements.loc[[(selected_date, months) for months in months_list]].reset_index()
+    df_summary_output['date_reference'] = df_summary_output[REFERENCE_MONTHS_COLUMN].map(date_reference_dict)
+    df_summary_output = df_summary_output.drop(columns=[date_column, REFERENCE_MONTHS_COLUMN])
+    df_summary_output = df_summary_output.rename(columns={REFERENCE_PERIOD_COLUMN: date_column})
 
     return df_summary_output
 
 
 def generate_summary_outputs(
         df_summary,
+        df_summary_movements,
         pkl_folder_name,
         date_column,
         selected_date,
         top_x_value,
-        data_config_dict,
+        reference_dates,
+        cache_fingerprint,
 ):
     logger.info("Executing: generate_summary_outputs")
 
-    # Set pickle variable path
+    # Set pickle variable path, keyed by the summary outputs cache fingerprint
     summary_dict_pkl=os.path.join(
         pkl_folder_name,
-        f"summary_pickle_{selected_date.strftime('%Y-%m-%d')}_top_{top_x_value}.pkl"
+        fingerprinted_name(
+            f"summary_pickle_{selected_date.strftime('%Y-%m-%d')}_top_{top_x_value}",
+            cache_fingerprint,
+        ) + '.pkl'
     )
 
     # Check if summary data already exists and load it, otherwise create the data
@@ -75,16 +83,9 @@ def generate_summary_outputs(
     else:
         logger.info("Creating summary data")
 
-        # Generate reference dates
-        reference_dates = determine_reference_dates(
-            selected_date=selected_date,
-            available_dates=set(df_summary[date_column]),
-            date_periods=data_config_dict['reference_dates_config'],
-        )
-
         # Create the summary output df for the selected date
         df_summary_output = generate_df_summary_output(
-            df_summary=df_summary,
+            df_summary_movements=df_summary_movements,
             date_column=date_column,
             selected_date=selected_date,
             reference_dates=reference_dates,
@@ -110,11 +111,12 @@ def generate_summary_outputs(
         )
 
         # Add values to the dictionary
-        summary_dict['reference_dates'] = reference_dates
+        summary_dict['reference_dates'] = {period_name: dict(info) for period_name, info in reference_dates.items()}
         summary_dict['df_summary_output'] = df_summary_output
 
         # Write summary dictionary to pickle file
         with open(summary_dict_pkl, 'wb') as f:
             pickle.dump(summary_dict, f)
+        prune_stale_cache_files(pkl_folder_name, 'summary_pickle_', cache_fingerprint, '.pkl')
 
     return summary_dict
\ No newline at end of file
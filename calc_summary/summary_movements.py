@@ -0,0 +1,128 @@
+import logging
+import numpy as np
+import pandas as pd
+
+from data_store import DATASET_FILE_EXTENSION, dataset_exists, read_dataset, write_dataset
+from utils_calendar import to_month_index, month_end_dates
+from utils_fingerprint import fingerprinted_name, prune_stale_cache_files
+
+logger = logging.getLogger(__name__)
+
+REFERENCE_MONTHS_COLUMN = 'Reference months'
+REFERENCE_PERIOD_COLUMN = 'Reference period'
+
+
+def reference_months(date_periods):
+    """
+    Lists the months ago of every reference period in reference_dates_config, fallbacks
+    included, and 0 for the selected date itself.
+
+    Returns:
+    - list: Months ago, largest first (so reference periods are in date order).
+    """
+    months_set = {0}
+    for info_and_fallback in date_periods.values():
+        months_set.add(info_and_fallback['info']['months_int'])
+        if info_and_fallback['fallback']:
+            months_set.update(reference_months(info_and_fallback['fallback']))
+
+    return sorted(months_set, reverse=True)
+
+
+def build_summary_movements(df_summary, date_column, months_list):
+    """
+    Builds the movement table of the summary data: for every period and every reference
+    months ago, the reference period's values and the movement of each column from the
+    reference period to the period.
+
+    The summary data is laid out on a month grid, so each reference period is a shift of the
+    grid, and the movements of all periods are computed in one array operation per reference
+    months ago. References outside the data are left empty.
+
+    Parameters:
+    - df_summary (pandas.DataFrame): The summary data frame, one row per period.
+    - date_column (str): The name of the date column.
+    - months_list (list): Reference months ago, see reference_months.
+
+    Returns:
+    - pandas.DataFrame: One row per (period, reference months ago), with the period, the
+      reference months ago, the reference period, the columns' values in the reference period
+      and their '<column> - movement' columns.
+    """
+    df_summary = df_summary.sort_values(date_column)
+    value_columns = [column for column in df_summary.columns if column != date_column]
+    values = df_summary[value_columns].to_numpy(dtype='float64')
+
+    # Month grid of the summary data, with no data in months missing from it
+    month_indices = to_month_index(df_summary[date_column])
+    grid_positions = month_indices - month_indices.min()
+    grid_values = np.full((grid_positions.max() + 1, len(value_columns)), np.nan)
+    grid_values[grid_positions] = values
+    grid_has_data = np.zeros(grid_positions.max() + 1, dtype=bool)
+    grid_has_data[grid_positions] = True
+
+    # (period, reference months ago) blocks
+    reference_positions = grid_positions[:, np.newaxis] - np.asarray(months_list)[np.newaxis, :]
+    has_reference = (reference_positions >= 0) & grid_has_data[np.clip(reference_positions, 0, None)]
+    reference_values = np.where(
+        has_reference[:, :, np.newaxis],
+        grid_values[np.clip(reference_positions, 0, None)],
+        np.nan,
+    )
+    movements = values[:, np.newaxis, :] - reference_values
+
+    row_count = len(df_summary) * len(months_list)
+    reference_periods = month_end_dates(reference_positions.ravel() + month_indices.min())
+    df_movements = pd.DataFrame({
+        date_column: np.repeat(df_summary[date_column].to_numpy(), len(months_list)),
+        REFERENCE_MONTHS_COLUMN: np.tile(np.asarray(months_list, dtype='int64'), len(df_summary)),
+        REFERENCE_PERIOD_COLUMN: reference_periods.where(has_reference.ravel()),
+    })
+    df_reference_values = pd.DataFrame(reference_values.reshape(row_count, -1), columns=value_columns)
+    df_movements_values = pd.DataFrame(
+        movements.reshape(row_count, -1),
+        columns=[column + ' - movement' for column in value_columns],
+    )
+
+    return pd.concat([df_movements, df_reference_values, df_movements_values], axis=1)
+
+
+def load_or_generate_summary_movements(
+        df_summary,
+        pkl_folder_name,
+        fingerprint,
+        date_column,
+        data_config_dict,
+        dataset_name='summary_movements',
+):
+    """
+    Loads the movement table of the summary data from the data store, building and writing it
+    first if it doesn't exist for the given fingerprint.
+
+    Parameters:
+    - df_summary (pandas.DataFrame): The summary data frame.
+    - pkl_folder_name (str): Folder holding the data store.
+    - fingerprint (str): The summary_movements cache layer fingerprint.
+    - date_column (str): The name of the date column.
+    - data_config_dict (dict): The data configuration dictionary.
+    - dataset_name (str): Name the table is written under.
+
+    Returns:
+    - pandas.DataFrame: The movement table (see build_summary_movements), indexed by period
+      and reference months ago.
+    """
+    fingerprinted_dataset_name = fingerprinted_name(dataset_name, fingerprint)
+
+    if dataset_exists(pkl_folder_name, fingerprinted_dataset_name):
+        df_movements = read_dataset(pkl_folder_name, fingerprinted_dataset_name)
+    else:
+        logger.info("Generating summary movements")
+        df_movements = build_summary_movements(
+            df_summary=df_summary,
+            date_column=date_column,
+            months_list=reference_months(data_config_dict['reference_dates_config']),
+        )
+        write_dataset(df_movements, pkl_folder_name, fingerprinted_dataset_name, data_config_dict)
+        prune_stale_cache_files(pkl_folder_name, dataset_name, fingerprint, DATASET_FILE_EXTENSION)
+
+    return df_movements.set_index([date_column, REFERENCE_MONTHS_COLUMN])
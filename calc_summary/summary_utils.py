@@ -1,95 +1,104 @@
-import streamlit as st
+import json
 import pandas as pd
-from dateutil.relativedelta import relativedelta
+from functools import lru_cache
+from types import MappingProxyType
 import pandas as pd
 import plotly.graph_objects as go
 import numpy as np
 
+from utils_calendar import to_month_index
 
-def get_month_end_x_months_ago(current_date, months_ago):
+
+def compile_reference_periods(date_periods):
+    """
+    Compiles the fallback tree of reference_dates_config into nested tuples of (period name,
+    months ago, info, compiled fallback or None), leaving date_periods untouched.
     """
-    Calculates the month-end date for 'months_ago' months before 'current_date',
-    returning only the date component (year, month, day).
+    return tuple(
+        (
+            period_name,
+            info_and_fallback['info']['months_int'],
+            MappingProxyType(dict(info_and_fallback['info'])),
+            compile_reference_periods(info_and_fallback['fallback']) if info_and_fallback['fallback'] else None,
+        )
+        for period_name, info_and_fallback in date_periods.items()
+    )
 
-    Parameters:
-    current_date (str or datetime): The date from which to calculate.
-    months_ago (int): The number of months to go back.
+
+def resolve_compiled_periods(month_index, month_index_dates, compiled_periods):
+    """
+    Resolves the reference dates of one selected month index, see resolve_reference_dates.
 
     Returns:
-    datetime: The month-end date 'months_ago' months before 'current_date', with no time component.
+    - dict: Period name to its info with the reference 'date', or None if a period has
+      neither its reference date nor a fallback available.
     """
-    # Convert current_date to datetime if it is not already
-    if isinstance(current_date, str):
-        current_date = pd.to_datetime(current_date)
-    
-    # Calculate the date 'months_ago' months before the current_date
-    target_date = current_date - relativedelta(months=months_ago)
-    
-    # Get the month end for the target date, and normalize to remove time component
-    month_end_date = pd.to_datetime(target_date).to_period('M').to_timestamp(how='end').normalize()
-    
-    return month_end_date
+    reference_dates_dict = {}
+    for period_name, months_int, info, fallback in compiled_periods:
+        reference_date = month_index_dates.get(month_index - months_int)
+        if reference_date is not None:
+            reference_dates_dict[period_name] = MappingProxyType({**info, 'date': reference_date})
+        elif fallback is not None:
+            fallback_dates_dict = resolve_compiled_periods(month_index, month_index_dates, fallback)
+            if fallback_dates_dict is None:
+                return None
+            reference_dates_dict.update(fallback_dates_dict)
+        else:
+            return None
 
-def determine_reference_dates(selected_date, available_dates, date_periods):
+    return reference_dates_dict
+
+
+@lru_cache(maxsize=16)
+def cached_reference_dates(available_dates, date_periods_json):
+    compiled_periods = compile_reference_periods(json.loads(date_periods_json))
+    month_index_dates = dict(zip(to_month_index(list(available_dates)).tolist(), available_dates))
+
+    resolved_dict = {}
+    for month_index, selected_date in month_index_dates.items():
+        reference_dates_dict = resolve_compiled_periods(month_index, month_index_dates, compiled_periods)
+        resolved_dict[selected_date] = None if reference_dates_dict is None else MappingProxyType(reference_dates_dict)
+
+    return MappingProxyType(resolved_dict)
+
+
+def resolve_reference_dates(available_dates, date_periods):
     """
-    Determines the most appropriate reference dates based on a given date and a set of available dates.
-    This function recursively selects reference dates from predefined periods, using a cascading fallback
-    mechanism if the preferred reference date is not available in the provided dates.
+    Resolves the reference dates of every available date in one pass over their integer month
+    indices, following each period's fallbacks when its reference date isn't available.
+
+    The result is cached per set of available dates and date_periods, and is read-only, so it
+    can be shared (e.g. between Streamlit sessions). date_periods is never modified.
 
     Parameters:
-    - selected_date (datetime): The date from which the reference periods are calculated. This is 
-                                the base date used to compute historical reference dates.
-    - available_dates (set or list): A collection of dates that are available for referencing. The function
-                                     checks if computed reference dates exist within this collection.
-    - date_periods (dict): A dictionary where each key is an integer representing the number of months
-                           ago from the selected_date for which to find a reference date. Each key maps to
-                           a dictionary containing:
-                           - 'info': A dictionary with details about the period (e.g., name, description).
-                           - 'fallback': A nested dictionary that follows the same structure, representing
-                                         the next fallback if the initial period's reference date is unavailable.
+    - available_dates (set or list): The available (month-end) dates.
+    - date_periods (dict): reference_dates_config, where each period name maps to a dictionary
+                           containing:
+                           - 'info': Details of the period, with 'months_int' (months ago),
+                                     'name' and 'over_period'.
+                           - 'fallback': Periods, in the same structure, to try if the
+                                         period's reference date is unavailable, or None.
 
     Returns:
-    - dict: A dictionary where keys are datetime objects of the successfully determined reference dates,
-            and values are the 'info' dictionaries from date_periods corresponding to each date. If no
-            dates are found, the function returns None.
+    - mappingproxy: Each available date to its reference dates (period name to the period's
+      info with its reference 'date'), or to None if a period has no reference date available,
+      so the date can't be selected.
 
     Example of usage:
     date_periods = {
-        60: {'info': {'name': '5 years ago', 'over_period': 'over the past 5 years'}, 'fallback': {...}}
+        'long_term': {'info': {'months_int': 120, 'name': '10 years', ...}, 'fallback': {...}}
     }
-    reference_dates = determine_reference_dates(pd.to_datetime('2023-12-31'), available_dates, date_periods)
+    reference_dates = resolve_reference_dates(available_dates, date_periods)[pd.to_datetime('2023-12-31')]
     """
-    reference_dates_dict = {}
-    for period_name, info_and_fallback in date_periods.items():
-        reference_date = get_month_end_x_months_ago(selected_date, info_and_fallback['info']['months_int'])
-        if reference_date in available_dates:
-            info_and_fallback['info']['date'] = reference_date
-            reference_dates_dict[period_name] = info_and_fallback['info']
-        elif info_and_fallback['fallback'] is not None:
-            ret = determine_reference_dates(selected_date, available_dates, info_and_fallback['fallback'])
-            if ret:
-                reference_dates_dict.update(ret)
-        else:
-            st.error(f"Error: All 4 date references must be present.")
-            st.error(f"Please makke another selection")
-            st.stop()
-
-    return reference_dates_dict if reference_dates_dict else None
+    return cached_reference_dates(tuple(sorted(available_dates)), json.dumps(date_periods, default=str))
 
 
-def generate_reference_dates(
-        df,
-        date_column,
-        selected_date,
-        reference_dates_config,
-):
-    ret_dict = determine_reference_dates(
-        selected_date=selected_date,
-        available_dates=set(df[date_column]),
-        date_periods=reference_dates_config,
-    )
-
-    return ret_dict
+def determine_reference_dates(selected_date, available_dates, date_periods):
+    """
+    Returns the reference dates of selected_date, see resolve_reference_dates, or None if a
+    period has no reference date available.
+    """
+    return resolve_reference_dates(available_dates, date_periods)[selected_date]
 
 
 def generate_bar_chart(
@@ -145,6 +154,53 @@ def generate_bar_chart(
     return fig
 
 
+def pos_and_neg_movement_traces(
+        df,
+        category_column,
+        prior_label,
+        movement_label,
+        marker_color_prior='lightblue',
+        marker_color_positive='blue',
+        marker_color_negative='red',
+):
+    """
+    Returns the prior amount, positive movement and negative movement bar traces of a
+    movements chart.
+    """
+    # Assign positive and negative movements
+    movement_label_positive = "Positive " + movement_label
+    movement_label_negative = "Negative " + movement_label
+    df[movement_label_positive] = np.where(df[movement_label] >= 0, df[movement_label], 0)
+    df[movement_label_negative] = np.where(df[movement_label] < 0, df[movement_label], 0)
+
+    return [
+        # Prior amounts
+        go.Bar(
+            x=df[category_column],
+            y=df[prior_label],
+            name=prior_label,
+            marker_color=marker_color_prior
+        ),
+        # Positive Movements
+        go.Bar(
+            x=df[category_column],
+            y=df[movement_label_positive],
+            name=movement_label_positive,
+            marker_color=marker_color_positive,
+            base=df[prior_label]  # This starts the positive movements right on top of the prior amounts
+        ),
+        # Negative Movements
+        go.Bar(
+            x=df[category_column],
+            y=df[movement_label_negative],
+            name=movement_label_negative,
+            marker_color=marker_color_negative,
+            # base=df[prior_label]  # This starts the negative movements at the top of the prior amounts
+            base=df[prior_label]*0  # This starts the negative movements at the top of the prior amounts
+        ),
+    ]
+
+
 def column_pos_and_neg_movements_chart(
         df,
         category_column,
@@ -162,40 +218,18 @@ def column_pos_and_neg_movements_chart(
         legend_x=0.5,
         legend_y=1.05,
 ):
-    # Assign positive and negative movements
-    movement_label_positive = "Positive " + movement_label
-    movement_label_negative = "Negative " + movement_label
-    df[movement_label_positive] = np.where(df[movement_label] >= 0, df[movement_label], 0)
-    df[movement_label_negative] = np.where(df[movement_label] < 0, df[movement_label], 0)
-
     # Initiate Figure
     fig = go.Figure()
 
-    # Add Prior amounts
-    fig.add_trace(go.Bar(
-        x=df[category_column],
-        y=df[prior_label],
-        name=prior_label,
-        marker_color=marker_color_prior
-    ))
-
-    # Add Positive Movements
-    fig.add_trace(go.Bar(
-        x=df[category_column],
-        y=df[movement_label_positive],
-        name=movement_label_positive,
-        marker_color=marker_color_positive,
-        base=df[prior_label]  # This starts the positive movements right on top of the prior amounts
-    ))
-
-    # Add Negative Movements
-    fig.add_trace(go.Bar(
-        x=df[category_column],
-        y=df[movement_label_negative],
-        name=movement_label_negative,
-        marker_color=marker_color_negative,
-        # base=df[prior_label]  # This starts the negative movements at the top of the prior amounts
-        base=df[prior_label]*0  # This starts the negative movements at the top of the prior amounts
+    # Add Prior amounts, Positive and Negative Movements
+    fig.add_traces(pos_and_neg_movement_traces(
+        df=df,
+        category_column=category_column,
+        prior_label=prior_label,
+        movement_label=movement_label,
+        marker_color_prior=marker_color_prior,
+        marker_color_positive=marker_color_positive,
+        marker_color_negative=marker_color_negative,
     ))
 
     # Update the layout
@@ -227,49 +261,109 @@ def column_pos_and_neg_movements_chart(
     return fig
 
 
-def generate_pos_neg_charts(
+def generate_pos_neg_multi_period_chart(
         df_summary_output,
         column_names,
         reference_dates,
         category_column,
         grouping_name, # E.g. 'Loan', 'Deposit'
+        marker_color_prior='lightblue',
+        marker_color_positive='blue',
+        marker_color_negative='red',
 ):
-    # Initiate dictionary
-    pos_neg_charts = {}
+    """
+    Builds the movements by category chart of every reference period as one figure, with the
+    prior, positive and negative traces of each period and a button per period toggling which
+    period's traces are visible. The figure is sent to the browser once and periods are
+    switched there, without a Streamlit rerun.
+
+    Parameters:
+    - df_summary_output (pandas.DataFrame): The summary output of the selected date.
+    - column_names (list): The category columns to chart.
+    - reference_dates (dict): The reference dates of the selected date.
+    - category_column (str): Name of the category axis.
+    - grouping_name (str): E.g. 'Loan', 'Deposit'.
+
+    Returns:
+    - plotly.graph_objects.Figure: The chart, showing the first reference period.
+    """
+    # Initiate Figure
+    fig = go.Figure()
+    titles_list = []
+
+    # Create movement column names list
+    movement_column_names = [name + " - movement" for name in column_names]
 
-    # Generate Loan Movements by Category bar charts
     for reference_date, date_details in reference_dates.items():
         # Labels
         prior_label = f"Total {date_details['name']} ago"
         movement_label = f"{date_details['name']} Movement"
 
-        # Create movement column names list
-        movement_column_names = [name + " - movement" for name in column_names]
-
         # Create data to be charted
-        data = {
+        df_reference = df_summary_output[df_summary_output['date_reference'] == reference_date]
+        df = pd.DataFrame({
             category_column: column_names,
-            prior_label: df_summary_output[df_summary_output['date_reference'] == reference_date][column_names].values[0],
-            movement_label: df_summary_output[df_summary_output['date_reference'] == reference_date][movement_column_names].values[0],
-        }
-        df = pd.DataFrame(data)
+            prior_label: df_reference[column_names].values[0],
+            movement_label: df_reference[movement_column_names].values[0],
+        })
 
-        pos_neg_charts[f"{grouping_name.lower()}_pos_neg_chart_{reference_date}"] = column_pos_and_neg_movements_chart(
+        # Only the first period is visible to start with
+        period_traces = pos_and_neg_movement_traces(
             df=df,
             category_column=category_column,
             prior_label=prior_label,
             movement_label=movement_label,
-            title=f"{grouping_name} Movements by Category - movements over {date_details['name']}",
-            yaxis_title=f"{grouping_name} Amount",
-            marker_color_prior='lightblue',
-            marker_color_positive='blue',
-            marker_color_negative='red',
-            margin_l=50,
-            margin_r=200,
-            margin_t=50,
-            margin_b=180,
-            legend_x=0.5,
-            legend_y=1.05,
+            marker_color_prior=marker_color_prior,
+            marker_color_positive=marker_color_positive,
+            marker_color_negative=marker_color_negative,
+        )
+        for trace in period_traces:
+            trace.visible = not titles_list
+        fig.add_traces(period_traces)
+        titles_list.append(f"{grouping_name} Movements by Category - movements over {date_details['name']}")
+
+    # A button per period, showing that period's traces
+    traces_per_period = len(fig.data) // len(titles_list)
+    buttons = [
+        dict(
+            label=date_details['name'],
+            method='update',
+            args=[
+                {'visible': [trace_position // traces_per_period == period_position for trace_position in range(len(fig.data))]},
+                {'title.text': titles_list[period_position]},
+            ],
         )
+        for period_position, date_details in enumerate(reference_dates.values())
+    ]
 
-    return pos_neg_charts
\ No newline at end of file
+    # Update the layout
+    fig.update_layout(
+        title=titles_list[0],
+        barmode='overlay',  # Using overlay to allow manual stacking and handling of bases
+        xaxis_title=category_column,
+        yaxis_title=f"{grouping_name} Amount",
+        updatemenus=[dict(
+            type='buttons',
+            direction='right',
+            active=0,
+            buttons=buttons,
+            x=1,
+            xanchor='right',
+            y=1.15,
+            yanchor='bottom',
+        )],
+        legend=dict(
+            x=0.5,
+            y=1.05,  # Places the legend above the plot
+            xanchor='center',
+            orientation='h'
+        ),
+        margin=dict(
+            l=50,
+            r=200,
+            t=100,
+            b=180,
+        )  # Adjust bottom margin to give more space for x-axis labels
+    )
+
+    return fig
@@ -4,7 +4,7 @@ import plotly.graph_objects as go
 
 from calc_summary.summary_utils import determine_reference_dates
 from calc_summary.summary_utils import column_pos_and_neg_movements_chart
-from calc_summary.summary_utils import generate_pos_neg_charts
+from calc_summary.summary_utils import generate_pos_neg_multi_period_chart
 from calc_summary.summary_utils import generate_bar_chart
 from utils import movement_text, dollar_movement_text, rounded_dollars
 
@@ -92,7 +92,7 @@ def generate_summary_deposits_dict(
     )
     
     # Generate Deposit positive and negative movements charts
-    summary_deposits_dict['deposit_pos_neg_charts'] = generate_pos_neg_charts(
+    summary_deposits_dict['deposit_pos_neg_chart'] = generate_pos_neg_multi_period_chart(
         df_summary_output=df_summary_output,
         column_names=deposits_column_names,
         reference_dates=reference_dates,
@@ -5,7 +5,7 @@ import plotly.graph_objects as go
 from calc_summary.summary_utils import determine_reference_dates
 from calc_summary.summary_utils import column_pos_and_neg_movements_chart
 from calc_summary.summary_utils import generate_bar_chart
-from calc_summary.summary_utils import generate_pos_neg_charts
+from calc_summary.summary_utils import generate_pos_neg_multi_period_chart
 from utils import movement_text, dollar_movement_text, rounded_dollars
 
 def generate_housing_percentages_pie(
@@ -132,7 +132,7 @@ def generate_summary_loans_dict(
     ##     category_column='Loan Category',
     ## )
     # Generate Deposit positive and negative movements charts
-    summary_loans_dict['loan_pos_neg_charts'] = generate_pos_neg_charts(
+    summary_loans_dict['loan_pos_neg_chart'] = generate_pos_neg_multi_period_chart(
         df_summary_output=df_summary_output,
         column_names=loan_column_names,
         reference_dates=reference_dates,
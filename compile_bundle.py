@@ -0,0 +1,219 @@
+"""
+Compiles the data into a versioned artifact bundle ahead of time, so the app only has to
+validate and memory-map it at startup.
+
+    python compile_bundle.py [--file-name WORKBOOK] [--all-companies]
+
+The bundle holds the data store datasets, the institution registry, the data cube and the
+summary and entity outputs for every period (for the default institution, or every institution
+with --all-companies), and is written to bundle_settings.folder/<bundle ID>. Once complete, it
+becomes the current bundle.
+"""
+import os
+import sys
+import shutil
+import logging
+import argparse
+
+from utils_logging import setup_logging
+from read_yaml_files import read_yamls
+from data_loading import data_loader, load_url_xlsx, source_file_names
+from data_back_series import back_series_fingerprint
+from data_cube import load_or_generate_data_cube, period_companies
+from data_rank_index import rank_index_for_data_cube
+from calc_summary.summary_utils import resolve_reference_dates
+from calc_summary.calc_summary_outputs import generate_summary_outputs
+from calc_summary.summary_movements import load_or_generate_summary_movements
+from calc_entity.calc_entity_outputs import generate_entity_outputs
+from artifact_bundle import bundle_id_for, write_bundle_manifest, read_bundle_manifest
+from artifact_bundle import current_bundle_id, set_current_bundle, prune_old_bundles
+
+logger = logging.getLogger(__name__)
+
+
+def precompute_outputs(
+        data_cube,
+        rank_index,
+        df_summary,
+        df_summary_movements,
+        bundle_path,
+        date_column,
+        data_config_dict,
+        color_discrete_map,
+        cache_fingerprints_dict,
+        all_companies=False,
+):
+    """
+    Computes the summary and entity outputs for every period with all its reference dates and
+    every top x value in bundle_settings, for the default institution (or the first with data,
+    as the app selects) or every institution.
+
+    Returns:
+    - dict: The periods, top x values and number of entity outputs precomputed.
+    """
+    company_column = data_config_dict['column_settings']['company_column']
+    default_company = data_config_dict['column_settings']['default_company']
+    top_x_values = data_config_dict['bundle_settings']['top_x_values']
+    reference_dates_dict = resolve_reference_dates(
+        available_dates=set(df_summary[date_column]),
+        date_periods=data_config_dict['reference_dates_config'],
+    )
+    periods = [selected_date for selected_date, reference_dates in reference_dates_dict.items() if reference_dates is not None]
+    entity_output_count = 0
+
+    for selected_date in periods:
+        companies = period_companies(data_cube, selected_date)
+        if all_companies:
+            selected_companies = companies
+        else:
+            selected_companies = [default_company if default_company in companies else companies[0]]
+
+        for top_x_value in top_x_values:
+            generate_summary_outputs(
+                df_summary=df_summary,
+                df_summary_movements=df_summary_movements,
+                pkl_folder_name=bundle_path,
+                date_column=date_column,
+                selected_date=selected_date,
+                top_x_value=top_x_value,
+                reference_dates=reference_dates_dict[selected_date],
+                cache_fingerprint=cache_fingerprints_dict['summary_outputs'],
+            )
+            for selected_company in selected_companies:
+                generate_entity_outputs(
+                    data_cube=data_cube,
+                    rank_index=rank_index,
+                    date_column=date_column,
+                    selected_date=selected_date,
+                    company_column=company_column,
+                    selected_company=selected_company,
+                    top_x_value=top_x_value,
+                    pkl_folder_name=bundle_path,
+                    data_config_dict=data_config_dict,
+                    color_discrete_map=color_discrete_map,
+                    cache_fingerprint=cache_fingerprints_dict['entity_outputs'],
+                )
+                entity_output_count += 1
+
+    return {
+        'periods': [period.strftime('%Y-%m-%d') for period in periods],
+        'top_x_values': top_x_values,
+        'all_companies': all_companies,
+        'entity_output_count': entity_output_count,
+    }
+
+
+def compile_bundle(file_name=None, all_companies=False):
+    """
+    Compiles a bundle and makes it the current bundle.
+
+    The bundle is built in a staging folder, starting from the current bundle's institution
+    registry so institution IDs stay stable, and moved into place once complete. If a bundle
+    with the same ID (the same source, config and code versions) exists, it is kept instead.
+
+    Parameters:
+    - file_name (str, optional): Source workbook. Defaults to the latest APRA release.
+    - all_companies (bool): Precompute the entity outputs of every institution.
+
+    Returns:
+    - str: The path of the current bundle.
+    """
+    aliases_dict, color_discrete_map, data_config_dict, date_column = read_yamls()
+    bundle_settings = data_config_dict['bundle_settings']
+    bundles_folder = bundle_settings['folder']
+
+    if file_name is None:
+        file_name = load_url_xlsx(data_config_dict)
+    file_names = source_file_names(file_name, data_config_dict)
+
+    # Staging folder, seeded with the current institution registry
+    staging_path = os.path.join(bundles_folder, f".staging-{os.getpid()}")
+    shutil.rmtree(staging_path, ignore_errors=True)
+    os.makedirs(staging_path)
+    registry_file_name = data_config_dict['institution_registry']['file_name']
+    previous_bundle_id = current_bundle_id(bundles_folder)
+    if previous_bundle_id is not None:
+        previous_registry_path = os.path.join(bundles_folder, previous_bundle_id, registry_file_name)
+        if os.path.exists(previous_registry_path):
+            shutil.copy2(previous_registry_path, os.path.join(staging_path, registry_file_name))
+
+    try:
+        df_original, df_cleaned, df_summary, cache_fingerprints_dict = data_loader(
+            pkl_folder_name=staging_path,
+            data_config_dict=data_config_dict,
+            date_column=date_column,
+            file_name=file_name,
+            aliases_dict=aliases_dict,
+        )
+
+        data_cube = load_or_generate_data_cube(
+            df_cleaned=df_cleaned,
+            pkl_folder_name=staging_path,
+            fingerprint=cache_fingerprints_dict['data_cube'],
+            date_column=date_column,
+            data_config_dict=data_config_dict,
+        )
+
+        df_summary_movements = load_or_generate_summary_movements(
+            df_summary=df_summary,
+            pkl_folder_name=staging_path,
+            fingerprint=cache_fingerprints_dict['summary_movements'],
+            date_column=date_column,
+            data_config_dict=data_config_dict,
+        )
+
+        bundle_id = bundle_id_for(cache_fingerprints_dict, max(data_cube['periods']))
+        bundle_path = os.path.join(bundles_folder, bundle_id)
+        if read_bundle_manifest(bundle_path) is not None:
+            logger.info(f"Bundle {bundle_id} is already compiled")
+        else:
+            precomputed_dict = precompute_outputs(
+                data_cube=data_cube,
+                rank_index=rank_index_for_data_cube(
+                    data_cube=data_cube,
+                    df_cleaned=df_cleaned,
+                    date_column=date_column,
+                    data_config_dict=data_config_dict,
+                ),
+                df_summary=df_summary,
+                df_summary_movements=df_summary_movements,
+                bundle_path=staging_path,
+                date_column=date_column,
+                data_config_dict=data_config_dict,
+                color_discrete_map=color_discrete_map,
+                cache_fingerprints_dict=cache_fingerprints_dict,
+                all_companies=all_companies,
+            )
+            write_bundle_manifest(
+                bundle_path=staging_path,
+                bundle_id=bundle_id,
+                source_fingerprint=back_series_fingerprint(file_names),
+                fingerprints_dict=cache_fingerprints_dict,
+                source_file_names=file_names,
+                precomputed_dict=precomputed_dict,
+            )
+            shutil.rmtree(bundle_path, ignore_errors=True)
+            os.replace(staging_path, bundle_path)
+            logger.info(f"Bundle {bundle_id} compiled: {len(os.listdir(bundle_path))} files")
+    finally:
+        shutil.rmtree(staging_path, ignore_errors=True)
+
+    set_current_bundle(bundles_folder, bundle_id)
+    prune_old_bundles(bundles_folder, bundle_settings['keep_bundles'])
+    return bundle_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile the MADIS data into an artifact bundle for the app.")
+    parser.add_argument('--file-name', default=None, help="Source workbook, defaults to the latest APRA release")
+    parser.add_argument('--all-companies', action='store_true', help="Precompute the entity outputs of every institution")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    bundle_path = compile_bundle(file_name=args.file_name, all_companies=args.all_companies)
+    print(bundle_path)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,63 @@
+import json
+import hashlib
+import logging
+import pandas as pd
+
+from utils_fingerprint import file_sha256
+
+logger = logging.getLogger(__name__)
+
+
+def back_series_fingerprint(file_names):
+    """
+    Fingerprints a list of workbooks, in order. A single workbook keeps its own sha256, so
+    its caches stay valid when no other workbooks are added.
+    """
+    file_hashes = [file_sha256(file_name) for file_name in file_names]
+    if len(file_hashes) == 1:
+        return file_hashes[0]
+    return hashlib.sha256(json.dumps(file_hashes).encode('utf-8')).hexdigest()
+
+
+def reconcile_back_series(frames, file_names, date_column):
+    """
+    Combines the data frames of overlapping back-series workbooks into one history.
+
+    Each period is taken whole from the highest priority workbook holding it, so a revised
+    period replaces the earlier publication of it (including institutions it no longer
+    reports). Workbooks are prioritised by vintage, the newest (latest period) first, and
+    then in list order.
+
+    Parameters:
+    - frames (list): The workbooks' processed data frames.
+    - file_names (list): The workbooks, in the same order as frames.
+    - date_column (str): The name of the date column.
+
+    Returns:
+    - pandas.DataFrame: One row per (period, institution), sorted by period.
+    """
+    if len(frames) == 1:
+        return frames[0]
+
+    priority_order = sorted(
+        range(len(frames)),
+        key=lambda position: (-frames[position][date_column].max().value, position),
+    )
+
+    frames_list = []
+    claimed_periods = pd.DatetimeIndex([])
+    for position in priority_order:
+        df = frames[position]
+        is_claimed = df[date_column].isin(claimed_periods)
+        frames_list.append(df[~is_claimed])
+
+        workbook_periods = pd.DatetimeIndex(df[date_column].unique())
+        logger.info(
+            f"Back-series {file_names[position]}: {workbook_periods.difference(claimed_periods).size} periods used, "
+            f"{workbook_periods.intersection(claimed_periods).size} superseded by newer workbooks"
+        )
+        claimed_periods = claimed_periods.union(workbook_periods)
+
+    df_combined = pd.concat(frames_list, ignore_index=True)
+    df_combined.sort_values(by=date_column, kind='stable', inplace=True, ignore_index=True)
+    return df_combined
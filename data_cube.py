@@ -0,0 +1,187 @@
+import os
+import json
+import logging
+import numpy as np
+import pandas as pd
+
+from utils_calendar import month_index_positions
+from utils_fingerprint import fingerprinted_name, prune_stale_cache_files
+
+logger = logging.getLogger(__name__)
+
+CUBE_VALUES_EXTENSION = '.npy'
+CUBE_LOOKUP_EXTENSION = '.json'
+
+
+def build_data_cube(
+        df_cleaned,
+        date_column,
+        company_column,
+        metric_columns,
+        fill_value=np.nan,
+):
+    """
+    Builds a dense (period, company, metric) cube from the long format cleaned data frame.
+
+    Periods are sorted ascending and companies keep the order they first appear in df_cleaned.
+    Cells without a row in df_cleaned are set to fill_value.
+
+    Parameters:
+    - df_cleaned (pandas.DataFrame): The cleaned data frame.
+    - date_column (str): The name of the date column.
+    - company_column (str): The name of the company column.
+    - metric_columns (list): Value columns to store in the cube.
+    - fill_value (float): Value for company-months without a row, NaN by default.
+
+    Returns:
+    - dict: The data cube, see data_cube_from_values.
+    """
+    periods = pd.DatetimeIndex(np.sort(df_cleaned[date_column].unique()))
+    companies = pd.Index(df_cleaned[company_column].astype(str).unique())
+
+    period_positions = periods.get_indexer(df_cleaned[date_column])
+    company_positions = companies.get_indexer(df_cleaned[company_column].astype(str))
+
+    values = np.full((len(periods), len(companies), len(metric_columns)), fill_value, dtype='float64')
+    values[period_positions, company_positions, :] = df_cleaned[list(metric_columns)].to_numpy(dtype='float64')
+
+    return data_cube_from_values(values, list(periods), list(companies), list(metric_columns))
+
+
+def data_cube_from_values(values, periods, companies, metrics):
+    """
+    Wraps the cube values with its axis labels and the label to position lookups.
+
+    Returns:
+    - dict: 'values' (numpy array indexed [period, company, metric]), 'periods', 'companies'
+      and 'metrics' (axis labels), 'period_lookup', 'company_lookup' and 'metric_lookup'
+      (label to position dictionaries) and 'period_month_lookup' (period month index to
+      position, see utils_calendar).
+    """
+    return {
+        'values': values,
+        'periods': periods,
+        'companies': companies,
+        'metrics': metrics,
+        'period_lookup': {period: i for i, period in enumerate(periods)},
+        'period_month_lookup': month_index_positions(periods),
+        'company_lookup': {company: i for i, company in enumerate(companies)},
+        'metric_lookup': {metric: i for i, metric in enumerate(metrics)},
+    }
+
+
+def write_data_cube(data_cube, pkl_folder_name, cube_name):
+    """
+    Writes the cube values to a .npy file and its axis labels to a json lookup file.
+    """
+    values_path = os.path.join(pkl_folder_name, cube_name + CUBE_VALUES_EXTENSION)
+    lookup_path = os.path.join(pkl_folder_name, cube_name + CUBE_LOOKUP_EXTENSION)
+
+    # np.save appends .npy to names without it, so the temporary file keeps the extension
+    tmp_values_path = values_path + '.tmp' + CUBE_VALUES_EXTENSION
+    np.save(tmp_values_path, np.ascontiguousarray(data_cube['values']))
+    os.replace(tmp_values_path, values_path)
+
+    lookup_dict = {
+        'periods': [period.strftime('%Y-%m-%d') for period in data_cube['periods']],
+        'companies': data_cube['companies'],
+        'metrics': data_cube['metrics'],
+    }
+    with open(lookup_path + '.tmp', 'w') as f:
+        json.dump(lookup_dict, f)
+    os.replace(lookup_path + '.tmp', lookup_path)
+
+    logger.debug(f"Data cube written: {values_path} {data_cube['values'].shape}")
+
+
+def read_data_cube(pkl_folder_name, cube_name):
+    """
+    Reads a cube with its values memory-mapped read-only, so processes reading the same cube
+    share one copy of it in the page cache.
+    """
+    values_path = os.path.join(pkl_folder_name, cube_name + CUBE_VALUES_EXTENSION)
+    lookup_path = os.path.join(pkl_folder_name, cube_name + CUBE_LOOKUP_EXTENSION)
+
+    with open(lookup_path, 'r') as f:
+        lookup_dict = json.load(f)
+
+    return data_cube_from_values(
+        values=np.load(values_path, mmap_mode='r'),
+        periods=list(pd.to_datetime(lookup_dict['periods'])),
+        companies=lookup_dict['companies'],
+        metrics=lookup_dict['metrics'],
+    )
+
+
+def load_or_generate_data_cube(
+        df_cleaned,
+        pkl_folder_name,
+        fingerprint,
+        date_column,
+        data_config_dict,
+        cube_name='data_cube',
+):
+    """
+    Loads the data cube for the cleaned data frame, building and writing it first if it doesn't
+    exist for the given fingerprint.
+
+    The cube holds every balance (float) column of df_cleaned. If df_cleaned only holds the
+    observed company-months (completion_settings.sparse), absent ones are zeros in the cube.
+
+    Parameters:
+    - df_cleaned (pandas.DataFrame): The cleaned data frame.
+    - pkl_folder_name (str): Cache folder.
+    - fingerprint (str): The data_cube cache layer fingerprint.
+    - date_column (str): The name of the date column.
+    - data_config_dict (dict): The data configuration dictionary.
+    - cube_name (str): Name the cube files are written under.
+
+    Returns:
+    - dict: The data cube, with its values memory-mapped.
+    """
+    fingerprinted_cube_name = fingerprinted_name(cube_name, fingerprint)
+    values_path = os.path.join(pkl_folder_name, fingerprinted_cube_name + CUBE_VALUES_EXTENSION)
+    lookup_path = os.path.join(pkl_folder_name, fingerprinted_cube_name + CUBE_LOOKUP_EXTENSION)
+
+    if not (os.path.exists(values_path) and os.path.exists(lookup_path)):
+        logger.info("Generating data cube")
+        data_cube = build_data_cube(
+            df_cleaned=df_cleaned,
+            date_column=date_column,
+            company_column=data_config_dict['column_settings']['company_column'],
+            metric_columns=list(df_cleaned.select_dtypes(include=['float']).columns),
+            fill_value=0.0 if data_config_dict['completion_settings']['sparse'] else np.nan,
+        )
+        write_data_cube(data_cube, pkl_folder_name, fingerprinted_cube_name)
+        prune_stale_cache_files(pkl_folder_name, cube_name, fingerprint, CUBE_VALUES_EXTENSION)
+        prune_stale_cache_files(pkl_folder_name, cube_name, fingerprint, CUBE_LOOKUP_EXTENSION)
+
+    return read_data_cube(pkl_folder_name, fingerprinted_cube_name)
+
+
+def period_companies(data_cube, period):
+    """
+    Returns the companies with data for a period, in cube order.
+    """
+    period_values = data_cube['values'][data_cube['period_lookup'][period]]
+    company_has_data = ~np.isnan(period_values).all(axis=1)
+    return [company for company, has_data in zip(data_cube['companies'], company_has_data) if has_data]
+
+
+def observed_cells(data_cube, df_cleaned, date_column, company_column):
+    """
+    Returns a boolean (period, company) array of the cube cells with a row in df_cleaned.
+    """
+    observed = np.zeros(data_cube['values'].shape[:2], dtype=bool)
+    observed[
+        pd.DatetimeIndex(data_cube['periods']).get_indexer(df_cleaned[date_column]),
+        pd.Index(data_cube['companies']).get_indexer(df_cleaned[company_column].astype(str)),
+    ] = True
+    return observed
+
+
+def metric_values(data_cube, metric):
+    """
+    Returns a (period, company) view of one metric.
+    """
+    return data_cube['values'][:, :, data_cube['metric_lookup'][metric]]
@@ -0,0 +1,154 @@
+import os
+import json
+import logging
+import calendar
+from datetime import datetime
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+from dateutil.relativedelta import relativedelta
+
+from data_download import create_session, mirror_url
+from utils import create_directory_if_not_exists
+
+logger = logging.getLogger(__name__)
+
+
+def candidate_releases(discovery_settings, base_url, today=None):
+    """
+    Generates the candidate MADIS release urls, newest first.
+
+    Candidates cover every publication month in the search window, each data month lag after
+    publication, each filename template and, for templates with a {publication_date} prefix,
+    each of the last days of the publication month.
+
+    Parameters:
+    - discovery_settings (dict): The release_discovery section of the data config.
+    - base_url (str): APRA files base url.
+    - today (datetime, optional): Date to search back from. Defaults to now.
+
+    Returns:
+    - list: Candidate release dictionaries with 'url', 'data_month', 'publication_month' and
+      'publication_date' keys, ordered newest first.
+    """
+    if today is None:
+        today = datetime.now()
+    first_of_month = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+    candidates = []
+    for months_back in range(discovery_settings['months_back']):
+        publication_month = first_of_month - relativedelta(months=months_back)
+        days_in_month = calendar.monthrange(publication_month.year, publication_month.month)[1]
+        publication_days = range(
+            days_in_month,
+            max(days_in_month - discovery_settings['date_prefix_days'], 0),
+            -1,
+        )
+
+        for data_month_lag in discovery_settings['data_month_lags']:
+            data_month = publication_month - relativedelta(months=data_month_lag)
+
+            for template in discovery_settings['filename_templates']:
+                if '{publication_date}' in template:
+                    publication_dates = [publication_month.replace(day=day) for day in publication_days]
+                else:
+                    publication_dates = [None]
+
+                for publication_date in publication_dates:
+                    file_name = template.format(
+                        data_month=data_month.strftime('%B %Y'),
+                        publication_date=publication_date.strftime('%Y%m%d') if publication_date else '',
+                    )
+                    candidates.append({
+                        'url': base_url + publication_month.strftime('%Y-%m') + '/' + quote(file_name),
+                        'data_month': data_month.strftime('%Y-%m'),
+                        'publication_month': publication_month.strftime('%Y-%m'),
+                        'publication_date': publication_date.strftime('%Y-%m-%d') if publication_date else None,
+                    })
+
+    # Newest data first, then the latest publication of that data
+    candidates.sort(
+        key=lambda c: (c['data_month'], c['publication_month'], c['publication_date'] or ''),
+        reverse=True,
+    )
+
+    return candidates
+
+
+def probe_url(session, url, timeout):
+    """
+    Returns True if a HEAD request for the url succeeds.
+    """
+    try:
+        response = session.head(url, allow_redirects=True, timeout=timeout)
+        return response.status_code == 200
+    except Exception as e:
+        logger.debug(f"Probe failed for {url}: {e}")
+        return False
+
+
+def read_release_manifest(manifest_file_name):
+    if os.path.exists(manifest_file_name):
+        with open(manifest_file_name, 'r') as f:
+            return json.load(f)
+    return None
+
+
+def write_release_manifest(manifest_file_name, release):
+    create_directory_if_not_exists(manifest_file_name)
+    with open(manifest_file_name + '.tmp', 'w') as f:
+        json.dump(release, f, indent=2)
+    os.replace(manifest_file_name + '.tmp', manifest_file_name)
+
+
+def discover_latest_release(download_settings, discovery_settings, today=None):
+    """
+    Finds the newest published MADIS release by probing the candidate urls concurrently, one
+    data month at a time from the newest, and stops at the first data month with a release.
+
+    The newest release found is recorded in the local release manifest. If no candidate
+    responds (e.g. no network), the release recorded in the manifest is returned instead.
+
+    Parameters:
+    - download_settings (dict): The download_settings section of the data config.
+    - discovery_settings (dict): The release_discovery section of the data config.
+    - today (datetime, optional): Date to search back from. Defaults to now.
+
+    Returns:
+    - dict or None: The release dictionary (see candidate_releases) with the 'url' to
+      download, or None if no release has ever been found.
+    """
+    candidates = candidate_releases(discovery_settings, download_settings['base_url'], today=today)
+    for candidate in candidates:
+        candidate['url'] = mirror_url(candidate['url'], download_settings)
+
+    # Candidates of each data month, newest first (candidates are already in that order)
+    data_month_candidates_dict = {}
+    for candidate in candidates:
+        data_month_candidates_dict.setdefault(candidate['data_month'], []).append(candidate)
+
+    # Probe a data month's candidates at once, so each data month costs one round trip rather
+    # than one per miss, and stop once a release is found, without probing older data months.
+    # A miss is expected for most candidates, so probes are not retried.
+    manifest_file_name = discovery_settings['manifest_file_name']
+    probed_count = 0
+    with create_session(pool_maxsize=discovery_settings['max_workers'], max_retries=0) as session:
+        with ThreadPoolExecutor(max_workers=discovery_settings['max_workers']) as executor:
+            for data_month, month_candidates in data_month_candidates_dict.items():
+                found_list = list(executor.map(
+                    lambda candidate: probe_url(session, candidate['url'], discovery_settings['timeout']),
+                    month_candidates,
+                ))
+                probed_count += len(month_candidates)
+
+                for candidate, found in zip(month_candidates, found_list):
+                    if found:
+                        release = dict(candidate, discovered_at=datetime.now().isoformat(timespec='seconds'))
+                        write_release_manifest(manifest_file_name, release)
+                        logger.info(
+                            f"Discovered MADIS release for {data_month} after {probed_count} of "
+                            f"{len(candidates)} candidate urls: {release['url']}"
+                        )
+                        return release
+
+    logger.info(f"No MADIS release found across {len(candidates)} candidate urls")
+    return read_release_manifest(manifest_file_name)
@@ -0,0 +1,212 @@
+import os
+import json
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils import create_directory_if_not_exists
+
+logger = logging.getLogger(__name__)
+
+# Shared session, so connections to APRA (or the mirror) are pooled across downloads
+_download_session = None
+
+
+def create_session(pool_maxsize=10, max_retries=2):
+    """
+    Creates a requests session with a pooled adapter that retries failed requests.
+    """
+    retries = Retry(
+        total=max_retries,
+        backoff_factor=0.5,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=['HEAD', 'GET'],
+    )
+    adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize, max_retries=retries)
+
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    return session
+
+
+def get_download_session(pool_maxsize=10, max_retries=2):
+    """
+    Returns the shared requests session, creating it on first use.
+    """
+    global _download_session
+
+    if _download_session is None:
+        _download_session = create_session(pool_maxsize=pool_maxsize, max_retries=max_retries)
+
+    return _download_session
+
+
+def mirror_url(url, download_settings):
+    """
+    Rewrites an APRA url to the configured local mirror, if one is set.
+
+    Parameters:
+    - url (str): The APRA url.
+    - download_settings (dict): The download_settings section of the data config.
+
+    Returns:
+    - str: The url to request.
+    """
+    mirror_base_url = download_settings.get('mirror_base_url')
+    base_url = download_settings['base_url']
+
+    if mirror_base_url and url.startswith(base_url):
+        return mirror_base_url + url[len(base_url):]
+    return url
+
+
+def download_metadata_path(file_name):
+    return file_name + '.download.json'
+
+
+def read_download_metadata(file_name):
+    metadata_path = download_metadata_path(file_name)
+    if os.path.exists(metadata_path):
+        with open(metadata_path, 'r') as f:
+            return json.load(f)
+    return {}
+
+
+def write_download_metadata(file_name, metadata):
+    metadata_path = download_metadata_path(file_name)
+    with open(metadata_path + '.tmp', 'w') as f:
+        json.dump(metadata, f)
+    os.replace(metadata_path + '.tmp', metadata_path)
+
+
+def validator_headers(response):
+    """
+    Returns the cache validators (ETag and Last-Modified) from a response.
+    """
+    return {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+    }
+
+
+def content_range_length(response):
+    """
+    Returns the complete length from a response's Content-Range header (e.g. 'bytes */1234'
+    on a 416 response), or None if it isn't given.
+    """
+    complete_length = response.headers.get('Content-Range', '').rpartition('/')[2]
+    return int(complete_length) if complete_length.isdigit() else None
+
+
+def download_file(
+        url,
+        file_name,
+        session=None,
+        chunk_size=1024 * 1024,
+        timeout=30,
+):
+    """
+    Downloads a url to a file, streaming it to disk in chunks.
+
+    - If the file was downloaded before, the request is made conditional on the stored ETag and
+      Last-Modified validators, so an unchanged file costs a 304 response and no transfer.
+    - The body is written to a '.part' file which is renamed into place once complete, so a
+      failed download never replaces a good file.
+    - If an earlier download was interrupted, the '.part' file is resumed with a Range request,
+      guarded by If-Range so a changed file is downloaded again from the start. If the server
+      can't satisfy the range (416), a '.part' file of the expected length is finished as is,
+      and any other is discarded and downloaded again from the start.
+
+    Parameters:
+    - url (str): The url to download.
+    - file_name (str): The path to save the file to.
+    - session (requests.Session, optional): Session to use, defaults to the shared session.
+    - chunk_size (int): Number of bytes written per chunk.
+    - timeout (int): Connect and read timeout in seconds.
+
+    Returns:
+    - bool: True if the file was (re)downloaded, False if the existing file is still current.
+    """
+    if session is None:
+        session = get_download_session()
+
+    create_directory_if_not_exists(file_name)
+    metadata = read_download_metadata(file_name)
+    part_file_name = file_name + '.part'
+
+    # Ask for the raw bytes, so byte ranges line up with the part file on disk
+    headers = {'Accept-Encoding': 'identity'}
+
+    # Resume an interrupted download of the same url, otherwise revalidate the existing file
+    partial = metadata.get('partial', {})
+    resume_from = 0
+    if os.path.exists(part_file_name) and partial.get('url') == url:
+        resume_from = os.path.getsize(part_file_name)
+        if_range = partial.get('etag') or partial.get('last_modified')
+        if if_range:
+            headers['Range'] = f"bytes={resume_from}-"
+            headers['If-Range'] = if_range
+    elif os.path.exists(file_name) and metadata.get('url') == url:
+        if metadata.get('etag'):
+            headers['If-None-Match'] = metadata['etag']
+        if metadata.get('last_modified'):
+            headers['If-Modified-Since'] = metadata['last_modified']
+
+    with session.get(url, headers=headers, stream=True, timeout=timeout) as response:
+        if response.status_code == 304:
+            logger.info(f"File is up to date, not modified since last download: {file_name}")
+            return False
+
+        # The range starts at the end of the part file, so the part file is either complete (the
+        # download was interrupted before it was renamed into place) or not the file being served
+        if response.status_code == 416 and 'Range' in headers:
+            expected_size = partial.get('content_length') or content_range_length(response)
+            if expected_size is not None and int(expected_size) == resume_from:
+                logger.info(f"Download already complete, finishing part file: {part_file_name}")
+                os.replace(part_file_name, file_name)
+                write_download_metadata(file_name, {
+                    'url': url,
+                    'etag': partial.get('etag'),
+                    'last_modified': partial.get('last_modified'),
+                })
+                return True
+
+            # Start again without the part file, so the next request has no Range
+            logger.info(f"Discarding part file that can't be resumed: {part_file_name}")
+            response.close()
+            os.remove(part_file_name)
+            metadata.pop('partial', None)
+            write_download_metadata(file_name, metadata)
+            return download_file(url, file_name, session=session, chunk_size=chunk_size, timeout=timeout)
+
+        response.raise_for_status()
+
+        # Append to the part file only if the server honoured the range request
+        resuming = (
+            response.status_code == 206 and
+            response.headers.get('Content-Range', '').startswith(f"bytes {resume_from}-")
+        )
+        if resuming:
+            logger.info(f"Resuming download from byte {resume_from}: {url}")
+        else:
+            metadata['partial'] = {
+                'url': url,
+                **validator_headers(response),
+                'content_length': response.headers.get('Content-Length') if response.status_code == 200 else None,
+            }
+            write_download_metadata(file_name, metadata)
+
+        with open(part_file_name, 'ab' if resuming else 'wb') as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(part_file_name, file_name)
+        write_download_metadata(file_name, {'url': url, **validator_headers(response)})
+
+    logger.debug(f"File downloaded successfully! file_name:{file_name}")
+    return True
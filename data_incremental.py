@@ -0,0 +1,148 @@
+import logging
+import pandas as pd
+
+from utils_calendar import month_end_range
+
+logger = logging.getLogger(__name__)
+
+
+def period_hashes(df, date_column):
+    """
+    Hashes the rows of each period, independent of row order.
+
+    Parameters:
+    - df (pandas.DataFrame): DataFrame to hash.
+    - date_column (str): The name of the date column.
+
+    Returns:
+    - pandas.DataFrame: One row per period with the wrapping sum of its row hashes and its row count.
+    """
+    row_hashes = pd.util.hash_pandas_object(df[sorted(df.columns)], index=False)
+    return row_hashes.groupby(df[date_column].values).agg(['sum', 'count'])
+
+
+def detect_changed_periods(df_new, df_previous, date_column):
+    """
+    Compares a newly loaded dataset against the stored one, period by period.
+
+    Parameters:
+    - df_new (pandas.DataFrame): The newly loaded dataset.
+    - df_previous (pandas.DataFrame): The previously stored dataset, with the same columns.
+    - date_column (str): The name of the date column.
+
+    Returns:
+    - tuple: (changed_periods, removed_periods), where changed_periods are new or revised
+      periods in df_new and removed_periods are periods that are only in df_previous.
+    """
+    new_hashes = period_hashes(df_new, date_column)
+    previous_hashes = period_hashes(df_previous, date_column)
+
+    # Align the hashes on period, periods missing from either side never match
+    aligned_hashes = new_hashes.join(previous_hashes, how='outer', lsuffix='_new', rsuffix='_previous')
+    unchanged_mask = (
+        (aligned_hashes['sum_new'] == aligned_hashes['sum_previous']) &
+        (aligned_hashes['count_new'] == aligned_hashes['count_previous'])
+    )
+
+    changed_periods = aligned_hashes.index[~unchanged_mask & aligned_hashes['count_new'].notna()]
+    removed_periods = aligned_hashes.index[aligned_hashes['count_new'].isna()]
+
+    logger.info(
+        f"Incremental refresh: {len(changed_periods)} new or revised periods, "
+        f"{len(removed_periods)} removed periods"
+    )
+    return pd.DatetimeIndex(changed_periods), pd.DatetimeIndex(removed_periods)
+
+
+def incremental_summary(
+        df_original,
+        df_summary_previous,
+        changed_periods,
+        removed_periods,
+        date_column,
+        generate_summary_fn,
+):
+    """
+    Updates the stored summary data frame by summarising only the new or revised periods.
+
+    Parameters:
+    - df_original (pandas.DataFrame): The newly loaded original data frame.
+    - df_summary_previous (pandas.DataFrame): The previously stored summary data frame.
+    - changed_periods (pandas.DatetimeIndex): New or revised periods.
+    - removed_periods (pandas.DatetimeIndex): Periods no longer in the source.
+    - date_column (str): The name of the date column.
+    - generate_summary_fn (callable): Summarises a subset of df_original.
+
+    Returns:
+    - pandas.DataFrame: The updated summary data frame.
+    """
+    df_summary_kept = df_summary_previous[
+        ~df_summary_previous[date_column].isin(changed_periods.union(removed_periods))]
+
+    df_summary_changed = generate_summary_fn(
+        df_original[df_original[date_column].isin(changed_periods)])
+
+    df_summary = pd.concat([df_summary_kept, df_summary_changed[df_summary_previous.columns]])
+    df_summary = df_summary.sort_values(by=date_column, kind='stable').reset_index(drop=True)
+
+    return df_summary
+
+
+def incremental_cleaned(
+        df_named,
+        df_cleaned_previous,
+        changed_periods,
+        removed_periods,
+        date_column,
+        company_column,
+        complete_and_rank_fn,
+):
+    """
+    Updates the stored cleaned data frame by completing and ranking only the affected months.
+
+    Completion covers every company across every month, so the update is only possible when
+    the set of companies and the first month are unchanged and no months were dropped from the
+    end of the series. Otherwise None is returned and a full rebuild is needed.
+
+    Parameters:
+    - df_named (pandas.DataFrame): The newly loaded data, with disambiguated company names.
+    - df_cleaned_previous (pandas.DataFrame): The previously stored cleaned data frame.
+    - changed_periods (pandas.DatetimeIndex): New or revised periods.
+    - removed_periods (pandas.DatetimeIndex): Periods no longer in the source.
+    - date_column (str): The name of the date column.
+    - company_column (str): The name of the company column.
+    - complete_and_rank_fn (callable): Completes and ranks rows for the given companies and periods.
+
+    Returns:
+    - pandas.DataFrame or None: The updated cleaned data frame, or None if a full rebuild is needed.
+    """
+    previous_companies = list(df_cleaned_previous[company_column].unique())
+    previous_periods = pd.DatetimeIndex(df_cleaned_previous[date_column].unique())
+    all_periods = month_end_range(start=df_named[date_column].min(), end=df_named[date_column].max())
+
+    if (
+        set(df_named[company_column].unique()) != set(previous_companies) or
+        all_periods.min() != previous_periods.min() or
+        all_periods.max() < previous_periods.max()
+    ):
+        logger.info("Incremental refresh: company list or date range changed, full rebuild needed")
+        return None
+
+    # Months to rebuild: new or revised months, removed months (completed as zeros) and new gaps
+    refresh_periods = (
+        changed_periods
+        .union(removed_periods.intersection(all_periods))
+        .union(all_periods.difference(previous_periods))
+    )
+
+    df_cleaned_changed = complete_and_rank_fn(
+        df_named[df_named[date_column].isin(refresh_periods)],
+        previous_companies,
+        refresh_periods,
+    )
+
+    df_cleaned_kept = df_cleaned_previous[~df_cleaned_previous[date_column].isin(refresh_periods)]
+    df_cleaned = pd.concat([df_cleaned_kept, df_cleaned_changed])
+    df_cleaned = df_cleaned.sort_values(by=date_column, kind='stable').reset_index(drop=True)
+
+    return df_cleaned
@@ -1,49 +1,76 @@
 import os
-import pickle
 import pandas as pd
 import logging
-from datetime import datetime, timedelta
-from dateutil.relativedelta import relativedelta
-from urllib.parse import quote
-import requests
+from datetime import datetime
 
 # from data_processing.business_loans.business_loans import business_loans_fn
-from utils_dataframe_calcs import new_calculated_column
+from utils_calculated_columns import compile_calculated_columns, evaluate_calculated_columns
+from utils_calendar import to_month_index, month_end_range
+from data_download import download_file, get_download_session
+from data_discovery import discover_latest_release
+from xlsx_streaming import read_excel_streaming
+from data_store import DATASET_FILE_EXTENSION, dataset_exists, read_dataset, write_dataset
+from data_store import read_store_manifest, update_store_manifest
+from data_incremental import detect_changed_periods, incremental_summary, incremental_cleaned
+from data_back_series import back_series_fingerprint, reconcile_back_series
+from data_quality import profile_data_quality, combine_data_quality_reports
+from data_tables import read_table, parse_in_processes, table_dataset_name
+from data_vintages import read_vintage_manifest, read_vintage, record_vintage, list_vintages
+from institution_registry import read_institution_registry, write_institution_registry, update_institution_registry
+from institution_registry import institution_ids, institution_display_names
+from utils_fingerprint import cache_fingerprints, fingerprinted_name, prune_stale_cache_files
 
 logger = logging.getLogger(__name__)
 
-def load_url_xlsx():
-    base_url = 'https://www.apra.gov.au/sites/default/files/'
-    last_month_eom = datetime.now().replace(day=1) - timedelta(days=1)
-    last_month_yyyy_mm = last_month_eom.strftime('%Y-%m')
-    file_path = '/Monthly%20authorised%20deposit-taking%20institution%20statistics%20back-series%20March%202019%20-%20'
-    two_months_ago = last_month_eom - relativedelta(months=1)
-    two_months_ago_mmm_yyyy = two_months_ago.strftime('%B %Y')
-    file_extension = '.xlsx'
+def load_url_xlsx(data_config_dict):
+    """
+    Discovers the latest MADIS workbook, downloads (or revalidates) it and returns its local path.
+
+    Parameters:
+    - data_config_dict (dict): The data configuration dictionary, using its download_settings
+      and release_discovery sections.
 
-    # Concatenate the strings to form the full URL
-    full_url = base_url + last_month_yyyy_mm + file_path + quote(two_months_ago_mmm_yyyy) + file_extension
+    Returns:
+    - str: Path of the workbook to load. Falls back to the last downloaded copy, then to the
+      bundled historical workbook, if the download fails.
+    """
+    download_settings = data_config_dict['download_settings']
 
     try:
-        # Set xlsx path
-        file_name = f"data/madis_{two_months_ago_mmm_yyyy}.xlsx".replace(' ', '_')
+        # Find the newest published release
+        release = discover_latest_release(
+            download_settings=download_settings,
+            discovery_settings=data_config_dict['release_discovery'],
+        )
+        if release is None:
+            raise ValueError("No MADIS release could be found")
 
-        if os.path.exists(file_name):
-            logger.info(f"Excel file has already been downloaded.")
-        else:
-            # Attempt to load URL xlsx
-            response = requests.get(full_url)
-            response.raise_for_status()  # This will raise an exception if there is an error
+        # Set xlsx path
+        data_month_mmm_yyyy = datetime.strptime(release['data_month'], '%Y-%m').strftime('%B %Y')
+        file_name = os.path.join(
+            download_settings['download_folder'],
+            f"madis_{data_month_mmm_yyyy}.xlsx".replace(' ', '_'),
+        )
 
-            with open(file_name, 'wb') as f:
-                f.write(response.content)
+        try:
+            # Download the file, or revalidate the copy already downloaded
+            download_file(
+                url=release['url'],
+                file_name=file_name,
+                session=get_download_session(pool_maxsize=download_settings['pool_maxsize']),
+                chunk_size=download_settings['chunk_size'],
+                timeout=download_settings['timeout'],
+            )
+        except Exception:
+            if not os.path.exists(file_name):
+                raise
+            logger.info(f"Failed to revalidate, using previously downloaded file: {file_name}")
 
-            logger.debug(f"File downloaded successfully! file_name:{file_name}")
     except Exception as e:
         logger.info(f"Failed to download the file: {e}")
 
         # Set xlsx path
-        file_name = 'data_historical/Monthly authorised deposit-taking institution statistics back-series March 2019 - December 2023.xlsx'
+        file_name = download_settings['fallback_file_name']
         logger.info(f"Using alternative file: {file_name}")
     
     return file_name
@@ -66,54 +93,6 @@ def check_column_coverage(df, drop_cols_list, numeric_cols):
         logger.warning(f"Columns not covered by drop or numeric lists: {not_covered_cols}")
 
 
-def convert_columns_by_type(df, cols_list, cols_type):
-    """
-    Convert specified columns in a DataFrame to the specified data type.
-
-    Parameters:
-        df (pd.DataFrame): The DataFrame to perform column conversions on.
-        cols_list (list): List of column names to convert.
-        cols_type (str): Desired data type for the specified columns ('date', 'str', 'float').
-
-    Raises:
-        ValueError: If an unexpected data type is provided.
-
-    Returns:
-        None: The function modifies the DataFrame in place.
-    """
-    if cols_type == 'date':
-        df[cols_list] = df[cols_list].apply(pd.to_datetime, errors='coerce').apply(lambda x: x.dt.date)
-    elif cols_type == 'str':
-        df[cols_list] = df[cols_list].astype(str)
-    elif cols_type == 'float':
-        df[cols_list] = df[cols_list].astype(float)
-    else:
-        raise ValueError('Unexpected data type. Supported types are: "date", "str", "float".')
-    
-    return df
-
-
-def convert_columns_dict_type_allocation(df, col_types_dict):
-    # Initialize an empty dictionary for the transformed structure
-    type_to_columns_dict = {}
-
-    # Iterate over the original dictionary to populate the new structure
-    for column, dtype in col_types_dict.items():
-        if dtype not in type_to_columns_dict:
-            type_to_columns_dict[dtype] = [column]
-        else:
-            type_to_columns_dict[dtype].append(column)
-    
-    for column_type, column_list in type_to_columns_dict.items():
-        df = convert_columns_by_type(
-                df=df,
-                cols_list=column_list,
-                cols_type=column_type
-            )
-
-    return df
-
-
 def column_scaling(df, col_list, adjustment_type, adjustment_value):
     """
     Scale specified columns in a DataFrame based on the provided adjustment type and value.
@@ -163,74 +142,56 @@ def generate_calculated_columns(
         df,
         calculated_columns_dict,
 ):
-    for new_column_name, calculations in calculated_columns_dict.items():
-        df[new_column_name] = 0
-        for column_calculation in calculations:
-            calculation = column_calculation[0]
-            column = column_calculation[1]
-            df = new_calculated_column(
-                df=df,
-                new_column_name=new_column_name,
-                calculation=calculation,
-                column=column,
-            )
-    
-    return df
+    """
+    Adds the calculated columns of a config section (e.g. source_data_calculated_columns).
+
+    The section is compiled once into NumPy ufunc chains, which are evaluated over the
+    underlying arrays, see utils_calculated_columns.
+    """
+    return evaluate_calculated_columns(
+        df=df,
+        compiled_columns=compile_calculated_columns(calculated_columns_dict),
+    )
 
 
-def read_and_process_data(
+def read_table_one(
         file_name,
         data_config_dict,
         date_column,
 ):
     """
-    Reads and processes data from an Excel file according to specified configurations.
+    Streams Table 1 of a workbook, with duplicates and rows without keys dropped, and empty
+    values left empty.
 
     Parameters:
     - file_name (str): The path to the Excel file to be read.
     - data_config_dict (dict): A dictionary containing data configuration details such as:
         - file_loading_details: Dict with keys 'sheet_name' and 'skiprows' for loading the file.
-        - expected_columns_list: List of expected columns in the file.
-        - column_typing_dict: Dict specifying the data types for columns.
+        - expected_columns_and_types_dict: Dict of the expected columns and their data types.
     - date_column (str): The name of the column containing dates to be processed as datetime objects.
 
     Returns:
-    - pandas.DataFrame: The processed DataFrame.
+    - tuple: (df, numeric_cols, coercion_failures_dict) with the table, its numeric columns and
+      the values per column that could not be converted to their type.
     """
     try:
-        # Load the Excel file
-        df = pd.read_excel(
-            io=file_name,
+        # Stream the expected columns from the Excel file, cast to their final types
+        df, coercion_failures_dict = read_excel_streaming(
+            file_name=file_name,
             sheet_name=data_config_dict['file_loading_details']['sheet_name'],
             skiprows=data_config_dict['file_loading_details']['skiprows'],
+            col_types_dict=data_config_dict['expected_columns_and_types_dict'],
+        )
+        logger.info(
+            f"Excel data loaded successfully, {sum(coercion_failures_dict.values())} values "
+            "could not be converted to their expected type."
         )
-        logger.info("Excel data loaded successfully.")
     except Exception as e:
         logger.error(f"Failed to load Excel file data: {e}")
         raise
 
-    # Ensure the expected columns exist
-    expected_columns = set(data_config_dict['expected_columns_and_types_dict'].keys())
-    if not expected_columns.issubset(df.columns):
-        missing_columns = expected_columns - set(df.columns)
-        logger.error(f"Missing expected columns: {missing_columns}")
-        raise ValueError(f"Missing expected columns: {missing_columns}")
-    
-    # Identify columns in the DataFrame that are not in the expected columns list
-    unexpected_columns = set(df.columns) - expected_columns
-    if unexpected_columns:
-        logger.info(f"Dropping unexpected columns: {unexpected_columns}")
-        df = df.drop(columns=unexpected_columns)
-
-    # Column Data Types
-    df=convert_columns_dict_type_allocation(
-        df=df.copy(),
-        col_types_dict=data_config_dict['expected_columns_and_types_dict'],
-    )
-    
     # Processing steps
     df.sort_values(by=date_column, inplace=True)
-    df[date_column] = pd.to_datetime(df[date_column], errors='coerce')
 
     # Identify columns for processing
     drop_cols_list = [date_column] + data_config_dict['column_type_lists']['str']
@@ -242,6 +203,39 @@ def read_and_process_data(
     # Clean data
     df.dropna(subset=drop_cols_list, inplace=True)
     df = df.drop_duplicates(subset=drop_cols_list, keep='first')
+
+    return df, numeric_cols, coercion_failures_dict
+
+
+def read_and_process_data(
+        file_name,
+        data_config_dict,
+        date_column,
+):
+    """
+    Reads and processes data from an Excel file according to specified configurations.
+
+    Parameters:
+    - file_name (str): The path to the Excel file to be read.
+    - data_config_dict (dict): The data configuration dictionary, see read_table_one.
+    - date_column (str): The name of the column containing dates to be processed as datetime objects.
+
+    Returns:
+    - tuple: (df, data_quality_report) with the processed DataFrame and its data quality
+      profile (see data_quality.profile_data_quality).
+    """
+    df, numeric_cols, coercion_failures_dict = read_table_one(file_name, data_config_dict, date_column)
+
+    # Data quality profile, before empty values are filled
+    data_quality_report = profile_data_quality(
+        df=df,
+        numeric_cols=numeric_cols,
+        date_column=date_column,
+        coercion_failures_dict=coercion_failures_dict,
+        workbook_name=os.path.basename(file_name),
+        data_config_dict=data_config_dict,
+    )
+
     df[numeric_cols] = df[numeric_cols].fillna(0)
 
     # Column Adjustments - convert to dollar amounts (not scaled)
@@ -253,7 +247,92 @@ def read_and_process_data(
         calculated_columns_dict=data_config_dict['source_data_calculated_columns'],
     )
 
-    return df
+    return df, data_quality_report
+
+
+def profile_workbook(
+        file_name,
+        data_config_dict,
+        date_column,
+):
+    """
+    Profiles the data quality of a workbook's Table 1 without processing it, for when only the
+    data quality settings have changed.
+
+    Returns:
+    - dict: The data quality profile, see data_quality.profile_data_quality.
+    """
+    df, numeric_cols, coercion_failures_dict = read_table_one(file_name, data_config_dict, date_column)
+
+    return profile_data_quality(
+        df=df,
+        numeric_cols=numeric_cols,
+        date_column=date_column,
+        coercion_failures_dict=coercion_failures_dict,
+        workbook_name=os.path.basename(file_name),
+        data_config_dict=data_config_dict,
+    )
+
+
+def read_source_tables(
+        file_names,
+        table_names,
+        data_config_dict,
+        date_column,
+):
+    """
+    Reads and processes source tables, all in parallel processes.
+
+    'df_original' is Table 1 of every back-series workbook, combined into one history with each
+    period taken from the newest workbook holding it. 'data_quality_report' is the data quality
+    profiles of the workbooks, computed with 'df_original' or from the workbooks alone. The
+    other tables are the workbook tables in workbook_tables, read from the source workbook.
+
+    Parameters:
+    - file_names (list): The workbooks, the source workbook first.
+    - table_names (list): Tables to read, 'df_original', 'data_quality_report' and/or names in
+      workbook_tables.
+    - data_config_dict (dict): The data configuration dictionary.
+    - date_column (str): The name of the date column.
+
+    Returns:
+    - dict: Table name to its DataFrame (a dict of DataFrames for 'data_quality_report').
+    """
+    source_table_names = ['df_original', 'data_quality_report']
+    jobs_dict = {}
+    if 'df_original' in table_names or 'data_quality_report' in table_names:
+        read_fn = read_and_process_data if 'df_original' in table_names else profile_workbook
+        for i, file_name in enumerate(file_names):
+            jobs_dict[('df_original', i)] = (read_fn, {
+                'file_name': file_name,
+                'data_config_dict': data_config_dict,
+                'date_column': date_column,
+            })
+    for table_name in table_names:
+        if table_name not in source_table_names:
+            jobs_dict[table_name] = (read_table, {
+                'file_name': file_names[0],
+                'table_settings': data_config_dict['workbook_tables'][table_name],
+            })
+
+    results_dict = parse_in_processes(jobs_dict, max_workers=data_config_dict['parse_settings']['max_workers'])
+
+    tables_dict = {
+        table_name: results_dict[table_name] for table_name in table_names if table_name not in source_table_names
+    }
+    if 'df_original' in table_names:
+        frames, data_quality_reports = zip(*[results_dict[('df_original', i)] for i in range(len(file_names))])
+        tables_dict['df_original'] = reconcile_back_series(
+            frames=list(frames),
+            file_names=file_names,
+            date_column=date_column,
+        )
+        tables_dict['data_quality_report'] = combine_data_quality_reports(data_quality_reports)
+    elif 'data_quality_report' in table_names:
+        tables_dict['data_quality_report'] = combine_data_quality_reports(
+            [results_dict[('df_original', i)] for i in range(len(file_names))]
+        )
+    return tables_dict
 
 
 def generate_summary(
@@ -282,175 +361,840 @@ def fill_company_data_for_all_dates(
         df_cleaned,
         date_column,
         company_column,
+        all_companies=None,
+        date_range=None,
 ):
     """
     Ensures every company has data all dates
+
+    all_companies and date_range default to every company and every month in df_cleaned.
+    Company-months without data are added with zeros by reindexing on (date, company), rows
+    outside of all_companies and date_range are dropped.
     """
 
     # Create a date range covering all months in your data
-    date_range = pd.date_range(start=df_cleaned[date_column].min(), end=df_cleaned[date_column].max(), freq='M')
+    if date_range is None:
+        date_range = month_end_range(start=df_cleaned[date_column].min(), end=df_cleaned[date_column].max())
 
-    # Create a DataFrame of all unique companies and all months
-    all_companies = df_cleaned[company_column].unique()
-    all_periods = pd.DataFrame(date_range, columns=[date_column])
-    all_periods['key'] = 1
-    all_companies_df = pd.DataFrame(all_companies, columns=[company_column])
-    all_companies_df['key'] = 1
+    # All unique companies
+    if all_companies is None:
+        all_companies = df_cleaned[company_column].unique()
 
-    # Cartesian product of companies and periods
-    complete_df = pd.merge(all_periods, all_companies_df, on='key')[[date_column, company_column]].copy()
-    complete_df = complete_df[[date_column, company_column]].copy()
-
-    # Merge with the original DataFrame
-    final_df = pd.merge(complete_df, df_cleaned, on=[date_column, company_column], how='left')
-    final_df
+    # Every company for every month
+    complete_index = pd.MultiIndex.from_product(
+        [pd.DatetimeIndex(date_range), pd.Index(all_companies)],
+        names=[date_column, company_column],
+    )
 
-    # Replace NaNs with zeros
-    final_df.fillna(0, inplace=True)
+    final_df = (
+        df_cleaned
+        .set_index([date_column, company_column])
+        .reindex(complete_index, fill_value=0)
+        .reset_index()
+    )
 
     return final_df
 
-def rank_companies(df, date_column, value_cols):
+def rank_companies(df, date_column, value_cols, rank_dtype='int16'):
     """
     Ranks companies within each month for specified value columns.
-    
+
+    Dense descending ranks for every value column and every month are computed in a single
+    grouped rank over the value columns.
+
     Parameters:
     - df: DataFrame containing the data.
     - date_column: Column name with datetime representing the month.
     - value_cols: List of column names with dollar amounts to rank.
-    
+    - rank_dtype: Integer dtype of the rank columns.
+
     Returns:
-    - DataFrame with ranks added for each value column.
+    - DataFrame with ranks added for each value column, as "<column> - Rank".
     """
-    # Ensure the date column is in datetime format
-    # df[date_column] = pd.to_datetime(df[date_column]).dt.to_period('M')
-    
-    # Function to rank companies within each group
-    def rank_within_group(group, cols):
-        for col in cols:
-            rank_col_name = f"{col} - Rank"
-            group[rank_col_name] = group[col].rank(method='dense', ascending=False).astype('int')
-        return group
-    
-    # Apply the ranking function for each month and value column
-    ranked_df = df.groupby(date_column, group_keys=False).apply(rank_within_group, value_cols)
-    
+    value_cols = list(value_cols)
+    ranks = df.groupby(date_column)[value_cols].rank(method='dense', ascending=False)
+
+    ranked_df = df.assign(**{
+        f"{col} - Rank": ranks[col].to_numpy(dtype=rank_dtype) for col in value_cols
+    })
+
     return ranked_df
 
 
-def generate_cleaned_df( ## To DO: Cal this "clean" rather than "original" and update source to original
+def disambiguated_company_names(
         df,
         date_column,
         data_config_dict,
 ):
-    # Initiate dataframe
-    df_cleaned = df.copy()
+    """
+    Returns the company names with the ABN appended, e.g. "Name (ABN)", for every name that is
+    shared by more than one ABN in any month. Collisions are found once and all labels are
+    built in one vectorized pass.
 
-    # Get company and abn column names
+    Returns:
+    - pandas.Series: The disambiguated company name of each row of df.
+    """
     company_column = data_config_dict['column_settings']['company_column']
     abn_column = data_config_dict['column_settings']['abn_column']
 
-    # First, find all unique companies that have duplicates in any given month
-    duplicate_companies = df_cleaned[df_cleaned.duplicated([date_column, company_column], keep=False)][company_column].unique()
+    # Find all unique companies that have duplicates in any given month
+    duplicate_companies = df.loc[df.duplicated([date_column, company_column], keep=False), company_column].unique()
 
     # Append ABN to these company names globally across all their occurrences
-    for company in duplicate_companies:
-        df_cleaned.loc[df_cleaned[company_column] == company, company_column] = df_cleaned[company_column] + ' (' + df[abn_column] + ')'
+    company_names = df[company_column].astype(str)
+    is_duplicate_company = company_names.isin(duplicate_companies)
+    return company_names.where(~is_duplicate_company, company_names + ' (' + df[abn_column].astype(str) + ')')
+
 
-    # Remove excluded columns
-    df_cleaned = df_cleaned.drop(columns=[abn_column])
+def identify_institutions(
+        df,
+        date_column,
+        data_config_dict,
+        registry,
+):
+    """
+    Replaces the ABN and company name columns with the registry's integer institution ID.
+    """
+    company_column = data_config_dict['column_settings']['company_column']
+    abn_column = data_config_dict['column_settings']['abn_column']
+    id_column = data_config_dict['institution_registry']['id_column']
+
+    df_identified = df.drop(columns=[abn_column, company_column])
+    df_identified.insert(1, id_column, institution_ids(registry, df[abn_column]))
+
+    # An institution is reported once a month, keep the first row if not
+    is_duplicate = df_identified.duplicated([date_column, id_column], keep='first')
+    if is_duplicate.any():
+        logger.warning(f"Dropping {is_duplicate.sum()} rows reported more than once a month for the same ABN")
+        df_identified = df_identified[~is_duplicate]
+
+    return df_identified
+
+
+def label_institutions(
+        df_cleaned,
+        data_config_dict,
+        registry,
+):
+    """
+    Sets the company column to the registry display name of each row's institution ID, so an
+    institution keeps one (its latest) name across renames.
+    """
+    company_column = data_config_dict['column_settings']['company_column']
+    id_column = data_config_dict['institution_registry']['id_column']
+
+    company_names = df_cleaned[id_column].map(institution_display_names(registry))
+    if company_column in df_cleaned.columns:
+        df_cleaned[company_column] = company_names
+    else:
+        df_cleaned.insert(df_cleaned.columns.get_loc(id_column), company_column, company_names)
+
+    return df_cleaned
+
+
+def generate_company_abn_lookup(
+        df,
+        date_column,
+        data_config_dict,
+):
+    """
+    Builds the lookup of disambiguated company names to ABNs, with the source company name and
+    the first and last month each pair was reported.
+
+    Returns:
+    - pandas.DataFrame: One row per company name and ABN pair, sorted by company name.
+    """
+    company_column = data_config_dict['column_settings']['company_column']
+    abn_column = data_config_dict['column_settings']['abn_column']
+
+    df_names = pd.DataFrame({
+        company_column: disambiguated_company_names(
+            df=df,
+            date_column=date_column,
+            data_config_dict=data_config_dict,
+        ),
+        abn_column: df[abn_column],
+        f"Source {company_column}": df[company_column],
+        date_column: df[date_column],
+    })
+
+    company_abn_lookup = df_names.groupby([company_column, abn_column], sort=True).agg(**{
+        f"Source {company_column}": (f"Source {company_column}", 'last'),
+        f"First {date_column}": (date_column, 'min'),
+        f"Last {date_column}": (date_column, 'max'),
+    }).reset_index()
+
+    return company_abn_lookup
+
+
+def complete_and_rank_companies(
+        df_cleaned,
+        date_column,
+        data_config_dict,
+        all_companies=None,
+        date_range=None,
+):
+    """
+    Completes every company for every month, then ranks the companies within each month if
+    rank_settings.materialise_rank_columns is set (otherwise ranks come from the rank index).
 
-    # Ensure every company has data completed within each row
-    df_cleaned = fill_company_data_for_all_dates(
+    Companies are identified by their institution ID, all_companies is a list of IDs.
+
+    With completion_settings.sparse set, only the observed company-months are kept (within
+    all_companies and date_range) and absent ones are implicit zeros, so they aren't ranked.
+    """
+    company_column = data_config_dict['institution_registry']['id_column']
+
+    if data_config_dict['completion_settings']['sparse']:
+        # Keep the observed company-months only
+        if all_companies is not None:
+            df_cleaned = df_cleaned[df_cleaned[company_column].isin(all_companies)]
+        if date_range is not None:
+            df_cleaned = df_cleaned[df_cleaned[date_column].isin(date_range)]
+        df_cleaned = df_cleaned.reset_index(drop=True)
+    else:
+        # Ensure every company has data completed within each row
+        df_cleaned = fill_company_data_for_all_dates(
+            df_cleaned=df_cleaned,
+            date_column=date_column,
+            company_column=company_column,
+            all_companies=all_companies,
+            date_range=date_range,
+        )
+
+    # Generate ranking columns
+    if data_config_dict['rank_settings']['materialise_rank_columns']:
+        group_by_columns = (
+            data_config_dict['column_type_lists']['str'] + data_config_dict['column_type_lists']['date'] +
+            [company_column]
+        )
+        ranking_columns = [col for col in df_cleaned.columns if col not in group_by_columns]
+        df_cleaned = rank_companies(
+            df=df_cleaned,
+            date_column=date_column,
+            value_cols=ranking_columns,
+            rank_dtype=data_config_dict['compact_dtypes']['rank_dtype'],
+        )
+
+    return df_cleaned
+
+
+def compact_cleaned_df(
+        df_cleaned,
+        date_column,
+        data_config_dict,
+):
+    """
+    Converts the cleaned data frame to the compact layout set in compact_dtypes.
+
+    - The company column becomes categorical, and the institution ID int32.
+    - An int32 month index column is added for the date column.
+    - Rank columns are stored as rank_dtype (e.g. int16).
+    - Balance columns are stored as balance_dtype (float64, or float32 to halve their size).
+    """
+    compact_dtypes_dict = data_config_dict['compact_dtypes']
+    company_column = data_config_dict['column_settings']['company_column']
+    period_index_column = compact_dtypes_dict['period_index_column']
+
+    # Categorical institutions
+    df_cleaned[company_column] = df_cleaned[company_column].astype(str).astype('category')
+    id_column = data_config_dict['institution_registry']['id_column']
+    df_cleaned[id_column] = df_cleaned[id_column].astype('int32')
+
+    # Month index next to the date column
+    df_cleaned[period_index_column] = to_month_index(df_cleaned[date_column])
+
+    # Compact ranks and balances
+    rank_columns = [col for col in df_cleaned.columns if col.endswith(' - Rank')]
+    balance_columns = df_cleaned.select_dtypes(include=['float']).columns
+    df_cleaned = df_cleaned.astype({
+        **{col: compact_dtypes_dict['rank_dtype'] for col in rank_columns},
+        **{col: compact_dtypes_dict['balance_dtype'] for col in balance_columns},
+    })
+
+    return df_cleaned
+
+
+def generate_cleaned_df( ## To DO: Cal this "clean" rather than "original" and update source to original
+        df,
+        date_column,
+        data_config_dict,
+        registry,
+):
+    # Identify institutions by their registry ID
+    df_cleaned = identify_institutions(
+        df=df,
+        date_column=date_column,
+        data_config_dict=data_config_dict,
+        registry=registry,
+    )
+
+    # Complete and rank every company for every month
+    df_cleaned = complete_and_rank_companies(
         df_cleaned=df_cleaned,
         date_column=date_column,
-        company_column=company_column,
+        data_config_dict=data_config_dict,
     )
 
-    # Generate ranking columns
-    group_by_columns = (
-        data_config_dict['column_type_lists']['str'] + data_config_dict['column_type_lists']['date']
+    # Display names for the institution IDs
+    df_cleaned = label_institutions(
+        df_cleaned=df_cleaned,
+        data_config_dict=data_config_dict,
+        registry=registry,
     )
-    ranking_columns = list(set(df_cleaned.columns) - set(group_by_columns))
-    df_cleaned = rank_companies(
-        df=df_cleaned,
+
+    # Compact dtypes
+    df_cleaned = compact_cleaned_df(
+        df_cleaned=df_cleaned,
         date_column=date_column,
-        value_cols=ranking_columns,
+        data_config_dict=data_config_dict,
     )
-    # for col in ranking_columns:
-    #     rank_col_name = f"{col} - rank"
-    #     # Adjust ranking method here. Using 'average' (default) or 'first'.
-    #     df_cleaned[rank_col_name] = df_cleaned.groupby(date_column)[col].rank(method="first").astype('int')
 
     return df_cleaned
 
-def data_loader(
+
+def read_previous_summary(
         pkl_folder_name,
         data_config_dict,
-        date_column,
 ):
-    logger.info("Executing: data_loader")
+    """
+    Reads the last stored summary data frame, if it was built with the same config and code
+    version, apart from summary_data_calculated_columns.
 
-    # Set pickle variable paths
-    df_original_pkl=os.path.join(pkl_folder_name, "df_original.pkl")
-    df_cleaned_pkl=os.path.join(pkl_folder_name, "df_cleaned.pkl")
-    df_summary_pkl=os.path.join(pkl_folder_name, "df_summary.pkl")
+    Returns:
+    - tuple: (previous summary data frame, its store manifest entry), or (None, None) if there
+      isn't a compatible one.
+    """
+    previous_entry = read_store_manifest(pkl_folder_name).get('df_summary')
+    if previous_entry is None or 'calculated_columns' not in previous_entry:
+        return None, None
+
+    # Only the calculated columns may have changed since
+    previous_config_fingerprint = cache_fingerprints(
+        source_fingerprint=None,
+        data_config_dict={**data_config_dict, 'summary_data_calculated_columns': previous_entry['calculated_columns']},
+    )['df_summary']
+    previous_dataset_name = fingerprinted_name('df_summary', previous_entry['fingerprint'])
+    if (
+        previous_config_fingerprint != previous_entry['config_fingerprint'] or
+        not dataset_exists(pkl_folder_name, previous_dataset_name)
+    ):
+        return None, None
+
+    return read_dataset(pkl_folder_name, previous_dataset_name), previous_entry
+
+
+def recalculate_summary(
+        df_summary_previous,
+        previous_calculated_columns_dict,
+        data_config_dict,
+):
+    """
+    Updates a summary data frame built with previous_calculated_columns_dict to the current
+    summary_data_calculated_columns, recalculating only the calculated columns that are new or
+    changed and the calculated columns using them (see utils_calculated_columns).
 
-    # Check if data has already been loaded into pkl file
-    if os.path.exists(df_cleaned_pkl) and os.path.exists(df_summary_pkl):
-        # Data exists, load it from pickle
-        logger.info("Loading data from pickle files")
+    Returns:
+    - pandas.DataFrame or None: The updated summary data frame, or None if a calculated column
+      replaces a column of the same name, which can't be recalculated.
+    """
+    calculated_columns_dict = data_config_dict['summary_data_calculated_columns'] or {}
+    if list(calculated_columns_dict.items()) == list(previous_calculated_columns_dict.items()):
+        return df_summary_previous
+
+    compiled_columns = compile_calculated_columns(calculated_columns_dict)
+    if any(
+        compiled_column['column'] in compiled_column['input_columns']
+        for compiled_column in compiled_columns + compile_calculated_columns(previous_calculated_columns_dict)
+    ):
+        return None
+
+    summarised_columns = [column for column in df_summary_previous.columns if column not in previous_calculated_columns_dict]
+    kept_columns = [column for column in previous_calculated_columns_dict if column in calculated_columns_dict]
+    changed_columns = [
+        column for column, calculation in calculated_columns_dict.items()
+        if previous_calculated_columns_dict.get(column) != calculation
+    ]
+    logger.info(f"Recalculating the summary columns affected by {changed_columns}")
+
+    df_summary = evaluate_calculated_columns(
+        df=df_summary_previous[summarised_columns + kept_columns],
+        compiled_columns=compiled_columns,
+        changed_columns=changed_columns,
+    )
+    return df_summary[summarised_columns + list(calculated_columns_dict)]
 
-        # Load df original data
-        with open(df_original_pkl, 'rb') as f:
-            df_original = pickle.load(f)
 
-        # Load df cleaned data
-        with open(df_cleaned_pkl, 'rb') as f:
-            df_cleaned = pickle.load(f)
-        
-        # Load df summary data
-        with open(df_summary_pkl, 'rb') as f:
-            df_summary = pickle.load(f)
+def generate_incremental_dataset(
+        dataset_name,
+        df_original,
+        period_changes,
+        df_previous,
+        date_column,
+        data_config_dict,
+        registry,
+):
+    """
+    Updates a previously stored summary or cleaned data frame with only the periods of
+    df_original that are new or revised.
 
-    else:
-        # Data needs to be sourced from APRA website
-        logger.info("Loading data from APRA website")
+    Parameters:
+    - dataset_name (str): 'df_summary' or 'df_cleaned'.
+    - df_original (pandas.DataFrame): The original data frame.
+    - period_changes (tuple): (changed_periods, removed_periods) of df_original against the
+      original data frame df_previous was built from, see detect_changed_periods.
+    - df_previous (pandas.DataFrame): The previously stored data frame.
+    - date_column (str): The name of the date column.
+    - data_config_dict (dict): The data configuration dictionary.
+    - registry (dict): The institution registry.
 
-        # Load data
-        original_file_name=load_url_xlsx()
+    Returns:
+    - pandas.DataFrame or None: The updated data frame, or None if a full rebuild is needed.
+    """
+    changed_periods, removed_periods = period_changes
+
+    if dataset_name == 'df_summary':
+        return incremental_summary(
+            df_original=df_original,
+            df_summary_previous=df_previous,
+            changed_periods=changed_periods,
+            removed_periods=removed_periods,
+            date_column=date_column,
+            generate_summary_fn=lambda df: generate_summary(
+                df=df,
+                date_column=date_column,
+                data_config_dict=data_config_dict,
+            ),
+        )
+
+    elif dataset_name == 'df_cleaned':
+        df_cleaned = incremental_cleaned(
+            df_named=identify_institutions(
+                df=df_original,
+                date_column=date_column,
+                data_config_dict=data_config_dict,
+                registry=registry,
+            ),
+            df_cleaned_previous=df_previous,
+            changed_periods=changed_periods,
+            removed_periods=removed_periods,
+            date_column=date_column,
+            company_column=data_config_dict['institution_registry']['id_column'],
+            complete_and_rank_fn=lambda df, all_companies, date_range: complete_and_rank_companies(
+                df_cleaned=df,
+                date_column=date_column,
+                data_config_dict=data_config_dict,
+                all_companies=all_companies,
+                date_range=date_range,
+            ),
+        )
+        if df_cleaned is None:
+            return None
 
-        # Read and process data
-        df_original = read_and_process_data(
+        # Relabel every month, as the latest name of an institution may have changed
+        df_cleaned = label_institutions(
+            df_cleaned=df_cleaned,
             data_config_dict=data_config_dict,
-            file_name=original_file_name,
+            registry=registry,
+        )
+        return compact_cleaned_df(
+            df_cleaned=df_cleaned,
             date_column=date_column,
+            data_config_dict=data_config_dict,
         )
-        
-        # Generate summary data frame
-        df_summary = generate_summary(
-                df=df_original,
+
+    else:
+        raise ValueError(f"Incremental refresh is not supported for {dataset_name}")
+
+
+def read_previous_dataset(
+        pkl_folder_name,
+        dataset_name,
+        config_fingerprint,
+        parent_fingerprint=None,
+):
+    """
+    Reads the last stored version of a dataset, if it was built with the same config and code
+    version (i.e. only the source workbook has changed since). If parent_fingerprint is given,
+    the previous version must also have been built from that version of its parent layer.
+
+    Returns:
+    - tuple: (previous dataset, its store manifest entry), or (None, None) if there isn't a
+      compatible one.
+    """
+    previous_entry = read_store_manifest(pkl_folder_name).get(dataset_name)
+
+    if (
+        previous_entry is None or
+        previous_entry['config_fingerprint'] != config_fingerprint or
+        (parent_fingerprint is not None and previous_entry.get('parent_fingerprint') != parent_fingerprint)
+    ):
+        return None, None
+
+    previous_dataset_name = fingerprinted_name(dataset_name, previous_entry['fingerprint'])
+    if not dataset_exists(pkl_folder_name, previous_dataset_name):
+        return None, None
+
+    return read_dataset(pkl_folder_name, previous_dataset_name), previous_entry
+
+
+def load_or_generate_dataset(
+        pkl_folder_name,
+        dataset_name,
+        fingerprint,
+        config_fingerprint,
+        parent_fingerprint,
+        data_config_dict,
+        generate_fn,
+        generate_incremental_fn=None,
+        previous_parent_fingerprint=None,
+        manifest_details=None,
+):
+    """
+    Loads a dataset from the data store if it exists for the given fingerprint, otherwise
+    generates it, writes it to the data store and removes versions with other fingerprints.
+
+    If generate_incremental_fn is provided and the previously stored version was built with
+    the same config_fingerprint from previous_parent_fingerprint, it is called with that
+    version to update it incrementally. It may return None to fall back to generate_fn.
+    manifest_details are recorded in the dataset's store manifest entry with its fingerprints.
+    """
+    fingerprinted_dataset_name = fingerprinted_name(dataset_name, fingerprint)
+
+    if dataset_exists(pkl_folder_name, fingerprinted_dataset_name):
+        logger.info(f"Loading {dataset_name} from data store")
+        df = read_dataset(pkl_folder_name, fingerprinted_dataset_name)
+    else:
+        df = None
+
+        if generate_incremental_fn is not None:
+            df_previous, _ = read_previous_dataset(
+                pkl_folder_name, dataset_name, config_fingerprint, previous_parent_fingerprint)
+            if df_previous is not None:
+                logger.info(f"Updating {dataset_name} incrementally")
+                df = generate_incremental_fn(df_previous)
+
+        if df is None:
+            logger.info(f"Generating {dataset_name}")
+            df = generate_fn()
+
+        write_dataset(df, pkl_folder_name, fingerprinted_dataset_name, data_config_dict)
+        update_store_manifest(pkl_folder_name, dataset_name, {
+            'fingerprint': fingerprint,
+            'config_fingerprint': config_fingerprint,
+            'parent_fingerprint': parent_fingerprint,
+            **(manifest_details or {}),
+        })
+        prune_stale_cache_files(pkl_folder_name, dataset_name, fingerprint, DATASET_FILE_EXTENSION)
+
+    return df
+
+
+def source_file_names(file_name, data_config_dict):
+    """
+    Returns the source workbooks: the source workbook, then the back-series workbooks.
+    """
+    return [file_name] + [
+        back_series_file_name for back_series_file_name in data_config_dict['back_series_settings']['file_names']
+        if os.path.abspath(back_series_file_name) != os.path.abspath(file_name)
+    ]
+
+
+def loadable_vintages(data_config_dict):
+    """
+    Returns the recorded vintages that data_loader can load with the current file loading
+    config, newest first.
+    """
+    return list_vintages(
+        vintage_folder=data_config_dict['vintage_store']['folder'],
+        config_fingerprint=cache_fingerprints(source_fingerprint=None, data_config_dict=data_config_dict)['df_original'],
+    )
+
+
+def data_loader(
+        pkl_folder_name,
+        data_config_dict,
+        date_column,
+        file_name=None,
+        vintage_id=None,
+        source_fingerprint=None,
+        aliases_dict=None,
+):
+    """
+    Loads the original, cleaned and summary data frames.
+
+    Each data frame is cached in the data store under a fingerprint of the source workbook, the
+    config sections it depends on and its code version, so only the layers invalidated by a new
+    workbook or a config change are rebuilt. With incremental_refresh set in cache_settings, a
+    new workbook only summarises, completes and ranks the periods that are new or revised.
+    The company name to ABN lookup is also written to the data store, as 'company_abn_lookup',
+    and new institutions are added to the institution registry in pkl_folder_name. Institutions
+    are identified by their registry ID in the cleaned data frame.
+
+    The workbooks in back_series_settings.file_names are loaded with the source workbook and
+    combined into one history, and the other workbook tables in workbook_tables are written to
+    the data store as 'table_<name>' (see read_source_tables). Each source loaded is recorded
+    in the vintage store (see data_vintages), and an earlier vintage can be loaded again with
+    vintage_id instead of a workbook.
+
+    Parameters:
+    - pkl_folder_name (str): Folder holding the data store.
+    - data_config_dict (dict): The data configuration dictionary.
+    - date_column (str): The name of the date column.
+    - file_name (str, optional): Source workbook. Defaults to the latest APRA release.
+    - vintage_id (str, optional): Vintage to load instead of the source workbook, into the
+      vintage's own folder (see data_vintages.vintage_data_store_folder).
+    - source_fingerprint (str, optional): Source already in the data store (e.g. a compiled
+      bundle) to load instead of the source workbook, without reading any workbook.
+    - aliases_dict (dict, optional): Institution name to short alias, set on the registry's
+      institutions.
+
+    Returns:
+    - tuple: df_original, df_cleaned, df_summary and the dictionary of cache layer fingerprints.
+    """
+    logger.info("Executing: data_loader")
+
+    # Fingerprint each layer's config alone (without the source workbook)
+    config_fingerprints_dict = cache_fingerprints(
+        source_fingerprint=None,
+        data_config_dict=data_config_dict,
+    )
+
+    # Source workbooks, a recorded vintage of them, or a source already in the data store
+    vintage_folder = data_config_dict['vintage_store']['folder']
+    file_names = None
+    if vintage_id is not None:
+        vintage_entry = read_vintage_manifest(vintage_folder)[vintage_id]
+        if vintage_entry['config_fingerprint'] != config_fingerprints_dict['df_original']:
+            raise ValueError(f"Vintage {vintage_id} was recorded with a different file loading config")
+        source_fingerprint = vintage_entry['source_fingerprint']
+    elif source_fingerprint is None:
+        if file_name is None:
+            file_name=load_url_xlsx(data_config_dict)
+        file_names = source_file_names(file_name, data_config_dict)
+        source_fingerprint = back_series_fingerprint(file_names)
+
+    # Fingerprint each cache layer
+    fingerprints_dict = cache_fingerprints(
+        source_fingerprint=source_fingerprint,
+        data_config_dict=data_config_dict,
+    )
+
+    # Keep the previous original data frame to find new or revised periods
+    df_original_previous, df_original_previous_entry = None, None
+    needs_refresh = not all(
+        dataset_exists(pkl_folder_name, fingerprinted_name(dataset_name, fingerprints_dict[dataset_name]))
+        for dataset_name in ['df_original', 'df_summary', 'df_cleaned']
+    )
+    if needs_refresh and data_config_dict['cache_settings']['incremental_refresh']:
+        df_original_previous, df_original_previous_entry = read_previous_dataset(
+            pkl_folder_name, 'df_original', config_fingerprints_dict['df_original'])
+
+    # Read the source tables missing from the data store, all in parallel
+    source_tables_dict = {}
+    if file_names is not None:
+        missing_table_names = [
+            table_name for table_name in data_config_dict['workbook_tables']
+            if not dataset_exists(pkl_folder_name, fingerprinted_name(
+                table_dataset_name(table_name), fingerprints_dict['workbook_tables']))
+        ]
+        if not dataset_exists(pkl_folder_name, fingerprinted_name('df_original', fingerprints_dict['df_original'])):
+            missing_table_names = ['df_original'] + missing_table_names
+        elif not all(
+            dataset_exists(pkl_folder_name, fingerprinted_name(f"data_quality_{part}", fingerprints_dict['data_quality']))
+            for part in ['summary', 'issues']
+        ):
+            missing_table_names = ['data_quality_report'] + missing_table_names
+        if missing_table_names:
+            source_tables_dict = read_source_tables(
+                file_names=file_names,
+                table_names=missing_table_names,
+                data_config_dict=data_config_dict,
                 date_column=date_column,
+            )
+
+    # Store the other workbook tables
+    for table_name in data_config_dict['workbook_tables']:
+        if table_name in source_tables_dict:
+            load_or_generate_dataset(
+                pkl_folder_name=pkl_folder_name,
+                dataset_name=table_dataset_name(table_name),
+                fingerprint=fingerprints_dict['workbook_tables'],
+                config_fingerprint=config_fingerprints_dict['workbook_tables'],
+                parent_fingerprint=None,
+                data_config_dict=data_config_dict,
+                generate_fn=lambda table_name=table_name: source_tables_dict[table_name],
+            )
+
+    def read_original():
+        if vintage_id is not None:
+            return read_vintage(vintage_folder, vintage_id)
+        if file_names is None:
+            raise FileNotFoundError(f"Source {source_fingerprint[:16]} isn't in the data store {pkl_folder_name}")
+        return source_tables_dict['df_original']
+
+    # Read and process data
+    df_original = load_or_generate_dataset(
+        pkl_folder_name=pkl_folder_name,
+        dataset_name='df_original',
+        fingerprint=fingerprints_dict['df_original'],
+        config_fingerprint=config_fingerprints_dict['df_original'],
+        parent_fingerprint=None,
+        data_config_dict=data_config_dict,
+        generate_fn=read_original,
+    )
+
+    # Store the data quality report of the original data frame
+    if 'data_quality_report' in source_tables_dict:
+        for part, df_report in source_tables_dict['data_quality_report'].items():
+            load_or_generate_dataset(
+                pkl_folder_name=pkl_folder_name,
+                dataset_name=f"data_quality_{part}",
+                fingerprint=fingerprints_dict['data_quality'],
+                config_fingerprint=config_fingerprints_dict['data_quality'],
+                parent_fingerprint=fingerprints_dict['df_original'],
                 data_config_dict=data_config_dict,
+                generate_fn=lambda df_report=df_report: df_report,
+            )
+
+    # Record the source workbook as a vintage
+    if file_names is not None:
+        record_vintage(
+            df_original=df_original,
+            source_fingerprint=source_fingerprint,
+            config_fingerprint=config_fingerprints_dict['df_original'],
+            source_file_name=file_name,
+            date_column=date_column,
+            data_config_dict=data_config_dict,
         )
 
-        # Generate original data frame
-        df_cleaned = generate_cleaned_df(
+    # Persist the company name to ABN lookup for the disambiguated company names
+    company_abn_lookup = load_or_generate_dataset(
+        pkl_folder_name=pkl_folder_name,
+        dataset_name='company_abn_lookup',
+        fingerprint=fingerprints_dict['company_abn_lookup'],
+        config_fingerprint=config_fingerprints_dict['company_abn_lookup'],
+        parent_fingerprint=fingerprints_dict['df_original'],
+        data_config_dict=data_config_dict,
+        generate_fn=lambda: generate_company_abn_lookup(
             df=df_original,
             date_column=date_column,
             data_config_dict=data_config_dict,
+        ),
+    )
+
+    # Add new institutions and names to the institution registry
+    registry_file_name = os.path.join(pkl_folder_name, data_config_dict['institution_registry']['file_name'])
+    registry, registry_changed = update_institution_registry(
+        registry=read_institution_registry(registry_file_name, aliases_dict=aliases_dict),
+        company_abn_lookup=company_abn_lookup,
+        data_config_dict=data_config_dict,
+        date_column=date_column,
+        aliases_dict=aliases_dict,
+    )
+    if registry_changed:
+        write_institution_registry(registry, registry_file_name)
+
+    # Summary and cleaned data frames can only be updated if built from df_original_previous
+    previous_original_fingerprint = None
+    if df_original_previous_entry is not None:
+        previous_original_fingerprint = df_original_previous_entry['fingerprint']
+
+    # Periods changed since df_original_previous, hashed once for both data frames on first use
+    period_changes_list = []
+
+    def period_changes():
+        if not period_changes_list:
+            period_changes_list.append(detect_changed_periods(
+                df_new=df_original,
+                df_previous=df_original_previous,
+                date_column=date_column,
+            ))
+        return period_changes_list[0]
+
+    def incremental_fn(dataset_name):
+        if df_original_previous is None:
+            return None
+        return lambda df_previous: generate_incremental_dataset(
+            dataset_name=dataset_name,
+            df_original=df_original,
+            period_changes=period_changes(),
+            df_previous=df_previous,
+            date_column=date_column,
+            data_config_dict=data_config_dict,
+            registry=registry,
         )
 
-        # Write data frame to pickle file
-        with open(df_original_pkl, 'wb') as f:
-            pickle.dump(df_original, f)
+    def summarise_original():
+        # Reuse the last stored summary if it was built from df_original, or from
+        # df_original_previous for its unchanged periods, recalculating only the calculated
+        # columns changed since
+        df_summary_previous, previous_entry = read_previous_summary(pkl_folder_name, data_config_dict)
+        if df_summary_previous is not None:
+            if previous_entry['parent_fingerprint'] == fingerprints_dict['df_original']:
+                df_summary = recalculate_summary(
+                    df_summary_previous=df_summary_previous,
+                    previous_calculated_columns_dict=previous_entry['calculated_columns'],
+                    data_config_dict=data_config_dict,
+                )
+                if df_summary is not None:
+                    return df_summary
+
+            elif df_original_previous is not None and previous_entry['parent_fingerprint'] == previous_original_fingerprint:
+                changed_periods, removed_periods = period_changes()
+                df_summary_kept = recalculate_summary(
+                    df_summary_previous=df_summary_previous[
+                        ~df_summary_previous[date_column].isin(changed_periods.union(removed_periods))],
+                    previous_calculated_columns_dict=previous_entry['calculated_columns'],
+                    data_config_dict=data_config_dict,
+                )
+                if df_summary_kept is not None:
+                    logger.info("Updating df_summary incrementally")
+                    return generate_incremental_dataset(
+                        dataset_name='df_summary',
+                        df_original=df_original,
+                        period_changes=(changed_periods, removed_periods),
+                        df_previous=df_summary_kept,
+                        date_column=date_column,
+                        data_config_dict=data_config_dict,
+                        registry=registry,
+                    )
+
+        return generate_summary(
+            df=df_original,
+            date_column=date_column,
+            data_config_dict=data_config_dict,
+        )
 
-        with open(df_cleaned_pkl, 'wb') as f:
-            pickle.dump(df_cleaned, f)
+    # Generate summary data frame
+    df_summary = load_or_generate_dataset(
+        pkl_folder_name=pkl_folder_name,
+        dataset_name='df_summary',
+        fingerprint=fingerprints_dict['df_summary'],
+        config_fingerprint=config_fingerprints_dict['df_summary'],
+        parent_fingerprint=fingerprints_dict['df_original'],
+        data_config_dict=data_config_dict,
+        generate_fn=summarise_original,
+        manifest_details={'calculated_columns': data_config_dict['summary_data_calculated_columns'] or {}},
+    )
 
-        # Write summary data frame to pickle file
-        with open(df_summary_pkl, 'wb') as f:
-            pickle.dump(df_summary, f)
+    # Generate cleaned data frame
+    df_cleaned = load_or_generate_dataset(
+        pkl_folder_name=pkl_folder_name,
+        dataset_name='df_cleaned',
+        fingerprint=fingerprints_dict['df_cleaned'],
+        config_fingerprint=config_fingerprints_dict['df_cleaned'],
+        parent_fingerprint=fingerprints_dict['df_original'],
+        data_config_dict=data_config_dict,
+        generate_fn=lambda: generate_cleaned_df(
+            df=df_original,
+            date_column=date_column,
+            data_config_dict=data_config_dict,
+            registry=registry,
+        ),
+        generate_incremental_fn=incremental_fn('df_cleaned'),
+        previous_parent_fingerprint=previous_original_fingerprint,
+    )
 
     logger.info("Executed: data_loader")
-    return df_original, df_cleaned, df_summary
+    return df_original, df_cleaned, df_summary, fingerprints_dict
@@ -0,0 +1,178 @@
+import logging
+import numpy as np
+import pandas as pd
+
+from data_store import read_dataset
+from utils_fingerprint import fingerprinted_name
+
+logger = logging.getLogger(__name__)
+
+DATA_QUALITY_SUMMARY_COLUMNS = ['Workbook', 'Check', 'Column', 'Count']
+
+
+def check_issues(check, columns, mask, expected_values, values, row_labels_dict):
+    """
+    Lists the flagged cells of one check, as issue rows.
+
+    Parameters:
+    - check (str): The check's name.
+    - columns (list): Column name of each mask column.
+    - mask (numpy.ndarray): Boolean (row, column) array of flagged cells.
+    - expected_values (numpy.ndarray): (row, column) array of the values the check expected.
+    - values (numpy.ndarray): (row, column) array of the values found.
+    - row_labels_dict (dict): Label column name to its (row) array, e.g. the date and ABN.
+
+    Returns:
+    - pandas.DataFrame: One row per flagged cell.
+    """
+    row_positions, column_positions = np.nonzero(mask)
+    return pd.DataFrame({
+        'Check': check,
+        'Column': np.array(columns, dtype=object)[column_positions],
+        **{label: labels[row_positions] for label, labels in row_labels_dict.items()},
+        'Value': values[row_positions, column_positions],
+        'Expected value': expected_values[row_positions, column_positions],
+    })
+
+
+def profile_data_quality(
+        df,
+        numeric_cols,
+        date_column,
+        coercion_failures_dict,
+        workbook_name,
+        data_config_dict,
+):
+    """
+    Profiles the data quality of a workbook's Table 1 in one vectorized pass over its numeric
+    block, before empty values are filled.
+
+    Checks (see data_quality_settings):
+    - null: empty values, counted per column.
+    - coercion failure: values that could not be converted to their type, counted per column.
+    - negative: negative balances, outside the columns allowed to be negative.
+    - reconciliation: totals that differ from the sum of their components by more than the
+      rounding tolerance.
+    - outlier: month-on-month changes larger than both a ratio of the previous value and a
+      minimum change.
+    - zeroed: balances that drop to zero from at least a minimum in the previous month.
+
+    Parameters:
+    - df (pandas.DataFrame): Table 1, with duplicates and rows without keys dropped.
+    - numeric_cols (list): The numeric columns.
+    - date_column (str): The name of the date column.
+    - coercion_failures_dict (dict): Values per column that could not be converted.
+    - workbook_name (str): Name the workbook is reported under.
+    - data_config_dict (dict): The data configuration dictionary.
+
+    Returns:
+    - dict: 'summary' (count per check and column, for the checks with any) and 'issues' (one
+      row per flagged cell with its date, ABN, institution, value and expected value).
+    """
+    quality_settings = data_config_dict['data_quality_settings']
+    abn_column = data_config_dict['column_settings']['abn_column']
+    company_column = data_config_dict['column_settings']['company_column']
+    numeric_cols = list(numeric_cols)
+    column_positions = {column: i for i, column in enumerate(numeric_cols)}
+
+    # Rows in (ABN, date) order, so each row's previous month is the row before it
+    order = np.lexsort((df[date_column].to_numpy(), df[abn_column].to_numpy()))
+    values = df[numeric_cols].to_numpy(dtype='float64')[order]
+    row_labels_dict = {
+        date_column: df[date_column].to_numpy()[order],
+        abn_column: df[abn_column].to_numpy()[order],
+        company_column: df[company_column].to_numpy()[order],
+    }
+
+    is_null = np.isnan(values)
+    filled_values = np.where(is_null, 0.0, values)
+
+    # Negative balances
+    can_be_negative = np.isin(numeric_cols, quality_settings['negative_allowed_columns'])
+    is_negative = (filled_values < 0) & ~can_be_negative
+
+    # Totals against the sum of their components
+    total_columns = list(quality_settings['reconciliations'])
+    totals = filled_values[:, [column_positions[column] for column in total_columns]]
+    component_sums = np.column_stack([
+        filled_values[:, [column_positions[column] for column in component_columns]].sum(axis=1)
+        for component_columns in quality_settings['reconciliations'].values()
+    ]) if total_columns else np.empty((len(values), 0))
+    is_unreconciled = np.abs(totals - component_sums) > quality_settings['reconciliation_tolerance']
+
+    # Month-on-month changes of the same institution
+    is_same_institution = np.zeros(len(values), dtype=bool)
+    is_same_institution[1:] = row_labels_dict[abn_column][1:] == row_labels_dict[abn_column][:-1]
+    previous_values = np.full_like(filled_values, np.nan)
+    previous_values[1:][is_same_institution[1:]] = filled_values[:-1][is_same_institution[1:]]
+    with np.errstate(invalid='ignore'):
+        changes = np.abs(filled_values - previous_values)
+        is_outlier = (
+            (changes > quality_settings['outlier_min_change']) &
+            (changes > quality_settings['outlier_change_ratio'] * np.abs(previous_values))
+        )
+        is_zeroed = (filled_values == 0) & (np.abs(previous_values) >= quality_settings['zeroed_min_previous'])
+
+    issues_list = [
+        check_issues('negative', numeric_cols, is_negative, np.zeros_like(filled_values), filled_values, row_labels_dict),
+        check_issues('reconciliation', total_columns, is_unreconciled, component_sums, totals, row_labels_dict),
+        check_issues('outlier', numeric_cols, is_outlier, previous_values, filled_values, row_labels_dict),
+        check_issues('zeroed', numeric_cols, is_zeroed, previous_values, filled_values, row_labels_dict),
+    ]
+    df_issues = pd.concat(issues_list, ignore_index=True)
+    df_issues.insert(0, 'Workbook', workbook_name)
+
+    # Counts per check and column
+    counts_list = [
+        pd.DataFrame({'Check': 'null', 'Column': numeric_cols, 'Count': is_null.sum(axis=0)}),
+        pd.DataFrame({
+            'Check': 'coercion failure',
+            'Column': list(coercion_failures_dict.keys()),
+            'Count': list(coercion_failures_dict.values()),
+        }),
+        df_issues.groupby(['Check', 'Column'], sort=False).size().rename('Count').reset_index(),
+    ]
+    df_summary = pd.concat(counts_list, ignore_index=True)
+    df_summary = df_summary[df_summary['Count'] > 0].reset_index(drop=True)
+    df_summary.insert(0, 'Workbook', workbook_name)
+    df_summary['Count'] = df_summary['Count'].astype('int64')
+
+    logger.info(
+        f"Data quality of {workbook_name}: " +
+        ', '.join(f"{count} {check}" for check, count in df_summary.groupby('Check', sort=False)['Count'].sum().items())
+    )
+
+    return {
+        'summary': df_summary[DATA_QUALITY_SUMMARY_COLUMNS],
+        'issues': df_issues,
+    }
+
+
+def combine_data_quality_reports(reports_list):
+    """
+    Combines the data quality reports of several workbooks.
+    """
+    return {
+        part: pd.concat([report[part] for report in reports_list], ignore_index=True)
+        for part in ['summary', 'issues']
+    }
+
+
+def read_data_quality_report(pkl_folder_name, cache_fingerprints_dict):
+    """
+    Reads the data quality report of the loaded source from the data store, as written by
+    data_loader.
+
+    Raises:
+        FileNotFoundError: If there is no report, e.g. for a vintage loaded without its workbook.
+
+    Returns:
+    - dict: 'summary' and 'issues', see profile_data_quality.
+    """
+    return {
+        part: read_dataset(
+            pkl_folder_name,
+            fingerprinted_name(f"data_quality_{part}", cache_fingerprints_dict['data_quality']),
+        )
+        for part in ['summary', 'issues']
+    }
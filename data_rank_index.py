@@ -0,0 +1,105 @@
+import logging
+import numpy as np
+from collections import OrderedDict
+
+from data_cube import observed_cells
+
+logger = logging.getLogger(__name__)
+
+
+def create_rank_index(data_cube, cache_size=256, observed=None):
+    """
+    Creates a rank index over a data cube. Companies are ordered by value per (period, metric)
+    on first request and kept in a least recently used cache of cache_size entries.
+
+    Parameters:
+    - data_cube (dict): The data cube, see data_cube.build_data_cube.
+    - cache_size (int): Maximum number of (period, metric) orderings kept.
+    - observed (numpy.ndarray, optional): Boolean (period, company) array of the cells with a
+      row in the cleaned data frame. Other cells aren't ranked.
+
+    Returns:
+    - dict: The rank index, used with top_companies.
+    """
+    return {
+        'data_cube': data_cube,
+        'observed': observed,
+        'cache': OrderedDict(),
+        'cache_size': cache_size,
+    }
+
+
+def rank_index_for_data_cube(data_cube, df_cleaned, date_column, data_config_dict):
+    """
+    Creates the rank index of the data cube with the rank_settings of the data config. With
+    completion_settings.sparse set, the company-months absent from df_cleaned (zeros in the
+    cube) aren't ranked.
+
+    Returns:
+    - dict: The rank index, see create_rank_index.
+    """
+    observed = None
+    if data_config_dict['completion_settings']['sparse']:
+        observed = observed_cells(
+            data_cube=data_cube,
+            df_cleaned=df_cleaned,
+            date_column=date_column,
+            company_column=data_config_dict['column_settings']['company_column'],
+        )
+
+    return create_rank_index(
+        data_cube=data_cube,
+        cache_size=data_config_dict['rank_settings']['cache_size'],
+        observed=observed,
+    )
+
+
+def compute_period_metric_order(values):
+    """
+    Orders one period's companies by their values for one metric, largest first.
+
+    Parameters:
+    - values (numpy.ndarray): Value of each company, NaN for companies without data.
+
+    Returns:
+    - numpy.ndarray: Positions of the companies with data, largest value first (tied
+      companies in cube order).
+    """
+    positions = np.flatnonzero(~np.isnan(values))
+    return positions[np.argsort(-values[positions], kind='stable')]
+
+
+def period_metric_order(rank_index, period, metric):
+    """
+    Returns the company order of a (period, metric), computing and caching it on first request.
+    """
+    cache = rank_index['cache']
+    key = (period, metric)
+
+    if key in cache:
+        cache.move_to_end(key)
+        return cache[key]
+
+    data_cube = rank_index['data_cube']
+    period_position = data_cube['period_lookup'][period]
+    values = np.asarray(data_cube['values'][period_position, :, data_cube['metric_lookup'][metric]])
+    if rank_index['observed'] is not None:
+        values = np.where(rank_index['observed'][period_position], values, np.nan)
+
+    order = compute_period_metric_order(values=values)
+
+    cache[key] = order
+    if len(cache) > rank_index['cache_size']:
+        cache.popitem(last=False)
+
+    return order
+
+
+def top_companies(rank_index, period, metric, count):
+    """
+    Returns the count companies with the largest values for a metric in a period, largest
+    first (tied companies in cube order).
+    """
+    order = period_metric_order(rank_index, period, metric)
+    companies = rank_index['data_cube']['companies']
+    return [companies[position] for position in order[:count]]
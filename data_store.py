@@ -0,0 +1,131 @@
+import os
+import json
+import logging
+import pyarrow as pa
+import pyarrow.feather as feather
+
+logger = logging.getLogger(__name__)
+
+# Arrow types used for each of the column types in expected_columns_and_types_dict
+ARROW_COLUMN_TYPES = {
+    'date': pa.timestamp('ns'),
+    'str': pa.string(),
+    'float': pa.float64(),
+}
+
+DATASET_FILE_EXTENSION = '.arrow'
+
+# Records the fingerprints each dataset was last written with
+STORE_MANIFEST_FILE_NAME = 'store_manifest.json'
+
+
+def dataset_path(pkl_folder_name, dataset_name):
+    """
+    Returns the on-disk path for a named dataset in the data store folder.
+    """
+    return os.path.join(pkl_folder_name, dataset_name + DATASET_FILE_EXTENSION)
+
+
+def dataset_exists(pkl_folder_name, dataset_name):
+    return os.path.exists(dataset_path(pkl_folder_name, dataset_name))
+
+
+def build_dataset_schema(df, data_config_dict):
+    """
+    Builds a typed Arrow schema for a DataFrame.
+
+    Columns listed in expected_columns_and_types_dict are pinned to the Arrow type of their
+    configured type (dictionary encoded if the column is categorical), all other (derived)
+    columns keep the type inferred from the DataFrame.
+
+    Parameters:
+    - df (pandas.DataFrame): DataFrame to build the schema for.
+    - data_config_dict (dict): The data configuration dictionary.
+
+    Returns:
+    - pyarrow.Schema: The typed schema.
+    """
+    inferred_schema = pa.Schema.from_pandas(df, preserve_index=False)
+    expected_types_dict = data_config_dict['expected_columns_and_types_dict']
+
+    fields = []
+    for field in inferred_schema:
+        if field.name in expected_types_dict:
+            arrow_type = ARROW_COLUMN_TYPES[expected_types_dict[field.name]]
+            if pa.types.is_dictionary(field.type):
+                arrow_type = pa.dictionary(field.type.index_type, arrow_type)
+            field = field.with_type(arrow_type)
+        fields.append(field)
+
+    return pa.schema(fields, metadata=inferred_schema.metadata)
+
+
+def write_dataset(df, pkl_folder_name, dataset_name, data_config_dict):
+    """
+    Writes a DataFrame to the data store as an uncompressed Arrow IPC file.
+
+    The file is left uncompressed so that it can be memory-mapped on read, and is written to a
+    temporary file first and renamed into place so readers never see a partial file.
+
+    Parameters:
+    - df (pandas.DataFrame): DataFrame to write.
+    - pkl_folder_name (str): Folder holding the data store.
+    - dataset_name (str): Name of the dataset, e.g. 'df_cleaned'.
+    - data_config_dict (dict): The data configuration dictionary.
+    """
+    file_path = dataset_path(pkl_folder_name, dataset_name)
+    tmp_file_path = file_path + '.tmp'
+
+    table = pa.Table.from_pandas(
+        df,
+        schema=build_dataset_schema(df, data_config_dict),
+        preserve_index=False,
+    )
+    feather.write_feather(table, tmp_file_path, compression='uncompressed')
+    os.replace(tmp_file_path, file_path)
+
+    logger.debug(f"Dataset written: {file_path} ({table.num_rows} rows, {table.num_columns} columns)")
+
+
+def read_dataset(pkl_folder_name, dataset_name):
+    """
+    Reads a dataset from the data store using a memory-mapped Arrow IPC read.
+
+    The table is converted to pandas one block per column (split_blocks) and its Arrow buffers
+    are released as each column is converted (self_destruct), so the columns aren't consolidated
+    into copies held alongside the Arrow table. Columns backed by the file are read-only, so
+    callers copy a frame before writing to it in place.
+
+    Parameters:
+    - pkl_folder_name (str): Folder holding the data store.
+    - dataset_name (str): Name of the dataset, e.g. 'df_cleaned'.
+
+    Returns:
+    - pandas.DataFrame: The dataset.
+    """
+    table = feather.read_table(dataset_path(pkl_folder_name, dataset_name), memory_map=True)
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def read_store_manifest(pkl_folder_name):
+    """
+    Returns the data store manifest, mapping dataset names to the entry they were last written with.
+    """
+    manifest_path = os.path.join(pkl_folder_name, STORE_MANIFEST_FILE_NAME)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r') as f:
+            return json.load(f)
+    return {}
+
+
+def update_store_manifest(pkl_folder_name, dataset_name, entry):
+    """
+    Records the entry (e.g. fingerprints) a dataset was written with in the data store manifest.
+    """
+    manifest = read_store_manifest(pkl_folder_name)
+    manifest[dataset_name] = entry
+
+    manifest_path = os.path.join(pkl_folder_name, STORE_MANIFEST_FILE_NAME)
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_path + '.tmp', manifest_path)
@@ -0,0 +1,118 @@
+import os
+import logging
+import multiprocessing
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from xlsx_streaming import read_excel_streaming
+
+logger = logging.getLogger(__name__)
+
+# pandas dtype of each column type, for tables missing from a workbook
+TABLE_COLUMN_DTYPES = {
+    'date': 'datetime64[ns]',
+    'str': object,
+    'float': 'float64',
+}
+
+
+def table_dataset_name(table_name):
+    """
+    Returns the data store dataset name of a workbook table, e.g. 'table_revisions'.
+    """
+    return f"table_{table_name}"
+
+
+def read_table(file_name, table_settings):
+    """
+    Reads one workbook table with its adapter settings (see workbook_tables in data_config.yaml).
+
+    Only the declared columns are kept, cast to their declared types. Rows missing any of the
+    key columns (such as notes below the header) are dropped before they are cast, and rows
+    whose key values could not be cast after.
+
+    Parameters:
+    - file_name (str): The workbook.
+    - table_settings (dict): The table's adapter, with 'sheet_name', 'skiprows',
+      'columns_and_types_dict', 'key_columns' and 'optional'.
+
+    Raises:
+        KeyError: If the sheet is missing from the workbook and the table isn't optional.
+
+    Returns:
+    - pandas.DataFrame: The table.
+    """
+    col_types_dict = table_settings['columns_and_types_dict']
+
+    try:
+        df, _ = read_excel_streaming(
+            file_name=file_name,
+            sheet_name=table_settings['sheet_name'],
+            skiprows=table_settings['skiprows'],
+            col_types_dict=col_types_dict,
+            key_columns=table_settings['key_columns'],
+        )
+    except KeyError:
+        if not table_settings['optional']:
+            raise
+        logger.info(f"Sheet '{table_settings['sheet_name']}' not in {file_name}, the table is empty")
+        return pd.DataFrame({
+            column: pd.Series(dtype=TABLE_COLUMN_DTYPES[column_type])
+            for column, column_type in col_types_dict.items()
+        })
+
+    # Empty strings are read as 'nan'
+    key_columns = table_settings['key_columns']
+    is_missing = df[key_columns].isna() | df[key_columns].eq('nan')
+    df = df[~is_missing.any(axis=1)].drop_duplicates().reset_index(drop=True)
+
+    logger.info(f"Read {len(df)} rows from '{table_settings['sheet_name']}'")
+    return df
+
+
+def parse_in_processes(jobs_dict, max_workers=4):
+    """
+    Runs parse jobs in a pool of processes, as workbook parsing is CPU bound. The first job
+    is run in this process while the pool runs the others, so a single job never waits for
+    worker processes to start.
+
+    Workers are spawned, so scripts calling this (e.g. through data_loader) must guard their
+    entry point with `if __name__ == '__main__':`. If the pool can't run the jobs, they are
+    run in this process instead. Every job is run in this process with max_workers 0, or on a
+    single CPU.
+
+    Parameters:
+    - jobs_dict (dict): Job name to (function, keyword arguments), the longest job first.
+      Functions must be module level (picklable).
+    - max_workers (int): Maximum number of worker processes.
+
+    Returns:
+    - dict: Job name to the function's result.
+    """
+    (first_job_name, (first_parse_fn, first_parse_kwargs)), *pool_jobs = jobs_dict.items()
+    results_dict = {}
+
+    # This process parses too, so it leaves one CPU fewer for the workers
+    max_workers = min(max_workers, len(pool_jobs), (os.cpu_count() or 1) - 1)
+    if max_workers > 0:
+        try:
+            # Spawned workers, as forking a process with running threads (e.g. Streamlit's) isn't safe
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+            ) as executor:
+                futures_dict = {
+                    job_name: executor.submit(parse_fn, **parse_kwargs)
+                    for job_name, (parse_fn, parse_kwargs) in pool_jobs
+                }
+                results_dict[first_job_name] = first_parse_fn(**first_parse_kwargs)
+                results_dict.update({job_name: future.result() for job_name, future in futures_dict.items()})
+        except BrokenProcessPool as e:
+            logger.warning(f"Parse workers failed ({e}), parsing in this process instead")
+
+    for job_name, (parse_fn, parse_kwargs) in jobs_dict.items():
+        if job_name not in results_dict:
+            results_dict[job_name] = parse_fn(**parse_kwargs)
+
+    return {job_name: results_dict[job_name] for job_name in jobs_dict}
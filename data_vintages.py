@@ -0,0 +1,282 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from data_store import build_dataset_schema
+
+logger = logging.getLogger(__name__)
+
+VINTAGE_MANIFEST_FILE_NAME = 'vintages.json'
+VINTAGE_CHUNKS_FOLDER_NAME = 'chunks'
+VINTAGE_CHUNK_EXTENSION = '.arrow'
+
+# Subfolder of the data store folder the vintages are built in
+VINTAGE_DATA_STORE_FOLDER_NAME = 'vintages'
+
+
+def read_vintage_manifest(vintage_folder):
+    """
+    Returns the vintage manifest, mapping vintage IDs to their entries.
+    """
+    manifest_path = os.path.join(vintage_folder, VINTAGE_MANIFEST_FILE_NAME)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r') as f:
+            return json.load(f)
+    return {}
+
+
+def write_vintage_manifest(vintage_folder, manifest):
+    manifest_path = os.path.join(vintage_folder, VINTAGE_MANIFEST_FILE_NAME)
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_path + '.tmp', manifest_path)
+
+
+def list_vintages(vintage_folder, config_fingerprint=None):
+    """
+    Returns the recorded vintages, newest (latest period, then most recently recorded) first.
+    If config_fingerprint is given, only vintages recorded with that df_original config are
+    returned.
+    """
+    return sorted(
+        [
+            vintage_entry for vintage_entry in read_vintage_manifest(vintage_folder).values()
+            if config_fingerprint is None or vintage_entry['config_fingerprint'] == config_fingerprint
+        ],
+        key=lambda entry: (entry['latest_period'], entry['recorded_at']),
+        reverse=True,
+    )
+
+
+def vintage_data_store_folder(pkl_folder_name, vintage_id, registry_file_name):
+    """
+    Returns the data store folder a vintage is built in, pkl_folder_name/vintages/<vintage ID>,
+    creating it if needed.
+
+    Each vintage has its own folder, as building a data store removes the files written under
+    other fingerprints, so vintages sharing one would remove each other's (and the latest
+    release's) files. A new folder starts with a copy of the institution registry of
+    pkl_folder_name, so institutions keep their IDs.
+    """
+    vintage_pkl_folder_name = os.path.join(pkl_folder_name, VINTAGE_DATA_STORE_FOLDER_NAME, vintage_id)
+    if not os.path.isdir(vintage_pkl_folder_name):
+        os.makedirs(vintage_pkl_folder_name)
+        registry_path = os.path.join(pkl_folder_name, registry_file_name)
+        if os.path.exists(registry_path):
+            shutil.copy2(registry_path, os.path.join(vintage_pkl_folder_name, registry_file_name))
+
+    return vintage_pkl_folder_name
+
+
+def vintage_label(vintage_entry):
+    """
+    Returns a display label for a vintage, e.g. 'December 2023 (file name.xlsx, recorded 2024-01-31)'.
+    """
+    latest_period = pd.Timestamp(vintage_entry['latest_period'])
+    return (
+        f"{latest_period.strftime('%B %Y')} "
+        f"({vintage_entry['file_name']}, recorded {vintage_entry['recorded_at'][:10]})"
+    )
+
+
+def chunk_hash(df_chunk):
+    """
+    Returns the sha256 of a chunk's column names, dtypes and row contents.
+    """
+    sha256 = hashlib.sha256()
+    sha256.update(json.dumps([[column, str(dtype)] for column, dtype in df_chunk.dtypes.items()]).encode('utf-8'))
+    sha256.update(pd.util.hash_pandas_object(df_chunk, index=False).to_numpy().tobytes())
+    return sha256.hexdigest()
+
+
+def chunk_path(vintage_folder, chunk_id):
+    return os.path.join(vintage_folder, VINTAGE_CHUNKS_FOLDER_NAME, chunk_id + VINTAGE_CHUNK_EXTENSION)
+
+
+def record_vintage(
+        df_original,
+        source_fingerprint,
+        config_fingerprint,
+        source_file_name,
+        date_column,
+        data_config_dict,
+):
+    """
+    Records a release (its df_original) in the vintage store, if it isn't recorded yet.
+
+    The release is split into one chunk per period, with rows in ABN order. Chunks are stored
+    compressed and content addressed, so periods that weren't revised between releases are
+    stored once and shared by every vintage.
+
+    Parameters:
+    - df_original (pandas.DataFrame): The release's original data frame.
+    - source_fingerprint (str): sha256 of the source workbook.
+    - config_fingerprint (str): Fingerprint of the df_original config and code version.
+    - source_file_name (str): The source workbook.
+    - date_column (str): The name of the date column.
+    - data_config_dict (dict): The data configuration dictionary.
+
+    Returns:
+    - str: The vintage ID.
+    """
+    vintage_settings = data_config_dict['vintage_store']
+    vintage_folder = vintage_settings['folder']
+    abn_column = data_config_dict['column_settings']['abn_column']
+    company_column = data_config_dict['column_settings']['company_column']
+
+    manifest = read_vintage_manifest(vintage_folder)
+    for vintage_id, vintage_entry in manifest.items():
+        if (
+            vintage_entry['source_fingerprint'] == source_fingerprint and
+            vintage_entry['config_fingerprint'] == config_fingerprint
+        ):
+            return vintage_id
+
+    os.makedirs(os.path.join(vintage_folder, VINTAGE_CHUNKS_FOLDER_NAME), exist_ok=True)
+
+    chunks_dict = {}
+    new_chunk_count = 0
+    for period, df_chunk in df_original.groupby(date_column, sort=True):
+        df_chunk = df_chunk.sort_values(by=[abn_column, company_column], kind='stable').reset_index(drop=True)
+        chunk_id = chunk_hash(df_chunk)
+        chunks_dict[period.strftime('%Y-%m-%d')] = chunk_id
+
+        file_path = chunk_path(vintage_folder, chunk_id)
+        if not os.path.exists(file_path):
+            table = pa.Table.from_pandas(
+                df_chunk,
+                schema=build_dataset_schema(df_chunk, data_config_dict),
+                preserve_index=False,
+            )
+            feather.write_feather(table, file_path + '.tmp', compression=vintage_settings['compression'])
+            os.replace(file_path + '.tmp', file_path)
+            new_chunk_count += 1
+
+    latest_period = max(chunks_dict.keys())
+    vintage_id = f"{latest_period[:7]}-{source_fingerprint[:8]}-{config_fingerprint[:8]}"
+    manifest[vintage_id] = {
+        'vintage_id': vintage_id,
+        'source_fingerprint': source_fingerprint,
+        'config_fingerprint': config_fingerprint,
+        'file_name': os.path.basename(source_file_name),
+        'latest_period': latest_period,
+        'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        'chunks': chunks_dict,
+    }
+    write_vintage_manifest(vintage_folder, manifest)
+
+    logger.info(
+        f"Vintage recorded: {vintage_id}, {len(chunks_dict)} periods, "
+        f"{new_chunk_count} new chunks ({len(chunks_dict) - new_chunk_count} shared)"
+    )
+    return vintage_id
+
+
+def read_vintage(
+        vintage_folder,
+        vintage_id,
+        periods=None,
+):
+    """
+    Reads a vintage's original data frame, or only some of its periods, from its chunks.
+
+    Parameters:
+    - vintage_folder (str): Folder holding the vintage store.
+    - vintage_id (str): The vintage to read.
+    - periods (list, optional): Periods to read ('YYYY-MM-DD' strings or dates). Defaults to all.
+
+    Returns:
+    - pandas.DataFrame: The vintage's rows, by period and then ABN.
+    """
+    chunks_dict = read_vintage_manifest(vintage_folder)[vintage_id]['chunks']
+
+    if periods is not None:
+        periods = {pd.Timestamp(period).strftime('%Y-%m-%d') for period in periods}
+        chunks_dict = {period: chunk_id for period, chunk_id in chunks_dict.items() if period in periods}
+
+    tables = [
+        feather.read_table(chunk_path(vintage_folder, chunk_id))
+        for _, chunk_id in sorted(chunks_dict.items())
+    ]
+    if not tables:
+        return None
+    return pa.concat_tables(tables).to_pandas()
+
+
+def vintage_revisions(
+        vintage_folder,
+        previous_vintage_id,
+        revised_vintage_id,
+        date_column,
+        data_config_dict,
+):
+    """
+    Lists every value revised between two vintages.
+
+    Only the periods whose chunks differ between the vintages are read. The two vintages are
+    aligned on (period, ABN) and compared for all value columns in one vectorized pass.
+
+    Returns:
+    - pandas.DataFrame: One row per revised (period, institution, metric), with the
+      'Previous value', 'Revised value' and 'Revision' (NaN where the institution or period
+      is only in one of the vintages).
+    """
+    abn_column = data_config_dict['column_settings']['abn_column']
+    company_column = data_config_dict['column_settings']['company_column']
+    manifest = read_vintage_manifest(vintage_folder)
+    previous_chunks = manifest[previous_vintage_id]['chunks']
+    revised_chunks = manifest[revised_vintage_id]['chunks']
+
+    changed_periods = [
+        period for period in sorted(set(previous_chunks) | set(revised_chunks))
+        if previous_chunks.get(period) != revised_chunks.get(period)
+    ]
+    revision_columns = [date_column, abn_column, company_column, 'Metric', 'Previous value', 'Revised value', 'Revision']
+    if not changed_periods:
+        return pd.DataFrame(columns=revision_columns)
+
+    df_previous = read_vintage(vintage_folder, previous_vintage_id, periods=changed_periods)
+    df_revised = read_vintage(vintage_folder, revised_vintage_id, periods=changed_periods)
+    frames = [df for df in [df_previous, df_revised] if df is not None]
+    value_columns = list(frames[0].select_dtypes(include=['float']).columns)
+
+    def keyed(df):
+        if df is None:
+            return pd.DataFrame(columns=[company_column] + value_columns)
+        return df.set_index([date_column, abn_column])[[company_column] + value_columns]
+
+    df_previous, df_revised = keyed(df_previous), keyed(df_revised)
+    keys = df_previous.index.union(df_revised.index)
+    df_previous, df_revised = df_previous.reindex(keys), df_revised.reindex(keys)
+
+    previous_values = df_previous[value_columns].to_numpy(dtype='float64')
+    revised_values = df_revised[value_columns].to_numpy(dtype='float64')
+    is_revised = ~(
+        (previous_values == revised_values) |
+        (np.isnan(previous_values) & np.isnan(revised_values))
+    )
+    row_positions, column_positions = np.nonzero(is_revised)
+
+    company_names = df_revised[company_column].fillna(df_previous[company_column]).to_numpy()
+    df_revisions = pd.DataFrame({
+        date_column: keys.get_level_values(0)[row_positions],
+        abn_column: keys.get_level_values(1)[row_positions],
+        company_column: company_names[row_positions],
+        'Metric': np.array(value_columns, dtype=object)[column_positions],
+        'Previous value': previous_values[row_positions, column_positions],
+        'Revised value': revised_values[row_positions, column_positions],
+    })
+    df_revisions['Revision'] = df_revisions['Revised value'] - df_revisions['Previous value']
+
+    logger.info(
+        f"{len(df_revisions)} revisions between vintages {previous_vintage_id} and "
+        f"{revised_vintage_id} across {len(changed_periods)} periods"
+    )
+    return df_revisions[revision_columns]
@@ -0,0 +1,176 @@
+import os
+import json
+import logging
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class InstitutionRecord:
+    """
+    Identity and display metadata of one institution (one ABN).
+
+    - institution_id (int): Stable integer ID, never reused.
+    - abn (str): The institution's ABN.
+    - name (str): The latest reported name.
+    - display_name (str): The name shown in outputs, the latest name with the ABN appended if
+      another institution has the same latest name.
+    - alias (str): Short alias from configs/aliases.yaml, or None.
+    - name_history (list): Reported names, dicts with 'name', 'first_period' and 'last_period'.
+    """
+    __slots__ = ('institution_id', 'abn', 'name', 'display_name', 'alias', 'name_history')
+
+    def __init__(self, institution_id, abn, name_history, alias=None):
+        self.institution_id = institution_id
+        self.abn = abn
+        self.name_history = sorted(name_history, key=lambda entry: (entry['last_period'], entry['first_period'], entry['name']))
+        self.name = self.name_history[-1]['name']
+        self.display_name = self.name
+        self.alias = alias
+
+    def to_dict(self):
+        return {
+            'institution_id': self.institution_id,
+            'abn': self.abn,
+            'name_history': self.name_history,
+        }
+
+    def __repr__(self):
+        return f"InstitutionRecord({self.institution_id}, {self.abn!r}, {self.display_name!r})"
+
+
+def create_institution_registry(records, aliases_dict=None):
+    """
+    Builds the registry from institution records, setting display names and aliases.
+
+    Returns:
+    - dict: 'records' (institution ID to InstitutionRecord) and 'abn_lookup' (ABN to institution ID).
+    """
+    # Disambiguate institutions whose latest names are the same
+    name_counts = pd.Series([record.name for record in records]).value_counts()
+    for record in records:
+        if name_counts[record.name] > 1:
+            record.display_name = f"{record.name} ({record.abn})"
+
+    # Short aliases, matched on any reported name
+    aliases_dict = aliases_dict or {}
+    for record in records:
+        record.alias = next(
+            (aliases_dict[entry['name']] for entry in reversed(record.name_history) if entry['name'] in aliases_dict),
+            None,
+        )
+
+    return {
+        'records': {record.institution_id: record for record in records},
+        'abn_lookup': {record.abn: record.institution_id for record in records},
+    }
+
+
+def read_institution_registry(file_name, aliases_dict=None):
+    """
+    Reads the institution registry, or returns an empty registry if it doesn't exist yet.
+    """
+    records = []
+    if os.path.exists(file_name):
+        with open(file_name, 'r') as f:
+            records = [InstitutionRecord(**record_dict) for record_dict in json.load(f)]
+
+    return create_institution_registry(records, aliases_dict=aliases_dict)
+
+
+def write_institution_registry(registry, file_name):
+    records_list = [record.to_dict() for _, record in sorted(registry['records'].items())]
+    with open(file_name + '.tmp', 'w') as f:
+        json.dump(records_list, f, indent=2)
+    os.replace(file_name + '.tmp', file_name)
+
+
+def update_institution_registry(
+        registry,
+        company_abn_lookup,
+        data_config_dict,
+        date_column,
+        aliases_dict=None,
+):
+    """
+    Adds the ABNs and names in a company name to ABN lookup to the registry.
+
+    New ABNs get the next IDs, in order of their first period and then ABN, and the name
+    history of known ABNs is extended, so an institution keeps its ID across renames.
+
+    Parameters:
+    - registry (dict): The institution registry.
+    - company_abn_lookup (pandas.DataFrame): The lookup from generate_company_abn_lookup.
+    - data_config_dict (dict): The data configuration dictionary.
+    - date_column (str): The name of the date column.
+    - aliases_dict (dict, optional): Institution name to short alias.
+
+    Returns:
+    - tuple: (registry, changed) with the updated registry and whether anything changed.
+    """
+    company_column = data_config_dict['column_settings']['company_column']
+    abn_column = data_config_dict['column_settings']['abn_column']
+
+    name_history_dict = {
+        record.abn: {entry['name']: dict(entry) for entry in record.name_history}
+        for record in registry['records'].values()
+    }
+    next_institution_id = max(registry['records'].keys(), default=0) + 1
+    abn_institution_ids = dict(registry['abn_lookup'])
+
+    new_abns = (
+        company_abn_lookup
+        .groupby(abn_column)[f"First {date_column}"].min()
+        .reset_index()
+        .sort_values(by=[f"First {date_column}", abn_column])
+    )
+    for abn in new_abns[abn_column]:
+        if abn not in abn_institution_ids:
+            abn_institution_ids[abn] = next_institution_id
+            next_institution_id += 1
+
+    for abn, name, first_period, last_period in zip(
+            company_abn_lookup[abn_column],
+            company_abn_lookup[f"Source {company_column}"],
+            company_abn_lookup[f"First {date_column}"].dt.strftime('%Y-%m-%d'),
+            company_abn_lookup[f"Last {date_column}"].dt.strftime('%Y-%m-%d'),
+    ):
+        names_dict = name_history_dict.setdefault(abn, {})
+        entry = names_dict.setdefault(name, {'name': name, 'first_period': first_period, 'last_period': last_period})
+        entry['first_period'] = min(entry['first_period'], first_period)
+        entry['last_period'] = max(entry['last_period'], last_period)
+
+    records = [
+        InstitutionRecord(abn_institution_ids[abn], abn, list(names_dict.values()))
+        for abn, names_dict in name_history_dict.items()
+    ]
+    updated_registry = create_institution_registry(records, aliases_dict=aliases_dict)
+
+    changed = (
+        [record.to_dict() for _, record in sorted(updated_registry['records'].items())] !=
+        [record.to_dict() for _, record in sorted(registry['records'].items())]
+    )
+    if changed:
+        logger.info(
+            f"Institution registry updated: {len(updated_registry['records'])} institutions, "
+            f"{len(updated_registry['records']) - len(registry['records'])} new"
+        )
+
+    return updated_registry, changed
+
+
+def institution_ids(registry, abns):
+    """
+    Returns the int32 institution ID of each ABN (-1 for ABNs not in the registry).
+    """
+    return pd.Series(abns).map(registry['abn_lookup']).fillna(-1).to_numpy(dtype='int32')
+
+
+def institution_display_names(registry):
+    """
+    Returns the display name of every institution, as a Series indexed by institution ID.
+    """
+    return pd.Series(
+        {institution_id: record.display_name for institution_id, record in registry['records'].items()},
+        dtype=object,
+    ).sort_index()
@@ -88,6 +88,9 @@ def read_yamls():
             type_to_columns_dict[dtype].append(column)
     data_config_dict['column_type_lists'] = type_to_columns_dict
 
+    # Keep the aliases with the data config, so the cache layers that use them are fingerprinted on them
+    data_config_dict['institution_aliases'] = aliases_dict
+
     # Check if there is exactly one date column in the configuration
     if len(data_config_dict['column_type_lists']['date']) != 1:
         raise ValueError("There must only be 1 date column.")
@@ -4,40 +4,34 @@ import streamlit as st
 import numpy as np
 import datetime as dt
 
+from data_cube import period_companies
+from utils_calendar import month_labels
+
 logger = logging.getLogger(__name__)
 
 
 def date_selection(
-        df,
-        date_column,
+        data_cube,
         col1,
 ):
-    # Extract unique values from the column for dropdown options
-    complete_dates_list = sorted(list(df[date_column].unique()), reverse=True)
-
-    # Convert to datetime.datetime object
-    complete_dates_list = pd.to_datetime(complete_dates_list).to_pydatetime()
+    # Month indices of the dates in the data cube for dropdown options, latest first
+    period_month_indices = sorted(data_cube['period_month_lookup'], reverse=True)
 
-    # Convet list to strings to present in list
-    complete_dates_list_str = [
-        timestamp.strftime('%Y %B %d') for timestamp in complete_dates_list]
-        
-    # max date from df
-    max_date = complete_dates_list_str[0]
+    # Labels to present in the list
+    period_labels_dict = dict(zip(period_month_indices, month_labels(period_month_indices, '%Y %B %d')))
 
-    # Create a dropdown widget with the unique values from the column
+    # Create a dropdown widget with the dates, defaulting to the max date
     # Place a selectbox in each column
     with col1:
-        selected_date_picked = st.selectbox('Date', complete_dates_list_str, index=complete_dates_list_str.index(max_date))
+        selected_month_index = st.selectbox('Date', period_month_indices, index=0, format_func=period_labels_dict.get)
 
-    selected_date = complete_dates_list[complete_dates_list_str.index(selected_date_picked)]
+    selected_date = data_cube['periods'][data_cube['period_month_lookup'][selected_month_index]]
 
     return selected_date
 
 
 def company_selection(
-        df,
-        date_column,
+        data_cube,
         selected_date,
         company_column,
         default_company,
@@ -45,8 +39,8 @@ def company_selection(
 ):
     """Select Company to track in the output"""
 
-    # Extract unique values from the column for dropdown options for the date selected
-    categories = list(df[df[date_column] == selected_date][company_column].unique())
+    # Companies with data for the date selected for dropdown options
+    categories = period_companies(data_cube, selected_date)
     
     # Set a default selected value for the dropdown, if it exists
     default_company = default_company if default_company in categories else categories[0]
@@ -59,14 +53,12 @@ def company_selection(
 
 
 def top_x_selection(
-        df,
-        date_column,
+        data_cube,
         selected_date,
-        company_column,
         default_x_value = None,
 ):
 
-    company_list_for_month = df[df[date_column] == selected_date][company_column].unique()
+    company_list_for_month = period_companies(data_cube, selected_date)
 
     # Define default_x_value if not set
     if default_x_value == None:
@@ -79,8 +71,7 @@ def top_x_selection(
 
 
 def select_data_filters(
-        df,
-        date_column,
+        data_cube,
         company_column,
         default_company
 ):
@@ -95,16 +86,14 @@ def select_data_filters(
 
     # Filter for the selected date
     selected_date = date_selection(
-        df=df,
-        date_column=date_column,
+        data_cube=data_cube,
         col1=col1,
     )
 
     # Select company
     selected_company = company_selection(
         # only select categories from the relevant date selected
-        df=df,
-        date_column=date_column,
+        data_cube=data_cube,
         selected_date=selected_date,
         company_column=company_column,
         default_company=default_company,
@@ -113,10 +102,8 @@ def select_data_filters(
 
     # Select top x
     top_x_value = top_x_selection(
-        df=df,
-        date_column=date_column,
+        data_cube=data_cube,
         selected_date=selected_date,
-        company_column=company_column,
         default_x_value = 15,
     )
 
@@ -5,7 +5,12 @@ import os
 
 from utils_logging import setup_logging
 from utils_logging import close_log_handlers
-from data_loading import data_loader
+from data_loading import data_loader, load_url_xlsx, loadable_vintages
+from data_vintages import vintage_label, vintage_revisions, vintage_data_store_folder
+from data_quality import read_data_quality_report
+from artifact_bundle import load_current_bundle
+from data_cube import load_or_generate_data_cube
+from data_rank_index import rank_index_for_data_cube
 from read_yaml_files import read_yamls
 ## from data_filtering import filter_data
 ## from tabs.tab_column_summary import tab_column_summary_content
@@ -17,7 +22,9 @@ from select_filters import select_data_filters
 ## from descriptions import generate_descriptions
 ## from summary_generator import generate_summary
 
+from calc_summary.summary_utils import determine_reference_dates
 from calc_summary.calc_summary_outputs import generate_summary_outputs
+from calc_summary.summary_movements import load_or_generate_summary_movements
 from calc_entity.calc_entity_outputs import generate_entity_outputs
 
 from tabs.tab_market_overview import generate_market_overview_tab
@@ -71,11 +78,103 @@ group_by_columns = [date_column] + [company_column]
 # Default Selections
 default_company = data_config_dict['column_settings']['default_company'] # 'Macquarie Bank Limited'
 
+# Compiled artifact bundle (see compile_bundle.py), validated once per session. If there is a
+# valid one it is served as is, otherwise the data is built here
+if 'bundle_path' not in st.session_state:
+    st.session_state.bundle_path, st.session_state.bundle_manifest = load_current_bundle(data_config_dict)
+if st.session_state.bundle_path is not None:
+    st.session_state.source_file_name = None
+
+# Source workbook, resolved once per session
+elif 'source_file_name' not in st.session_state or st.session_state.source_file_name is None:
+    st.session_state.source_file_name = load_url_xlsx(data_config_dict)
+
+# Release vintage, the latest release unless an earlier recorded one is selected
+vintages_list = loadable_vintages(data_config_dict)
+vintage_entries_dict = {vintage_entry['vintage_id']: vintage_entry for vintage_entry in vintages_list}
+selected_vintage_id = None
+if len(vintages_list) > 1:
+    selected_vintage_id = st.sidebar.selectbox(
+        'Release vintage',
+        options=[None] + list(vintage_entries_dict),
+        format_func=lambda vintage_id: 'Latest release' if vintage_id is None else vintage_label(vintage_entries_dict[vintage_id]),
+    )
+
+# The bundle is the data store of the latest release, other vintages are each built in their own folder
+serve_bundle = st.session_state.bundle_path is not None and selected_vintage_id is None
+if serve_bundle:
+    pkl_folder_name = st.session_state.bundle_path
+elif selected_vintage_id is not None:
+    pkl_folder_name = vintage_data_store_folder(
+        pkl_folder_name=pkl_folder_name,
+        vintage_id=selected_vintage_id,
+        registry_file_name=data_config_dict['institution_registry']['file_name'],
+    )
+
 # Get data
-df_original, df_cleaned, df_summary = data_loader(
+df_original, df_cleaned, df_summary, cache_fingerprints_dict = data_loader(
     pkl_folder_name=pkl_folder_name,
     data_config_dict=data_config_dict,
     date_column=date_column,
+    file_name=st.session_state.source_file_name,
+    vintage_id=selected_vintage_id,
+    source_fingerprint=st.session_state.bundle_manifest['source_fingerprint'] if serve_bundle else None,
+    aliases_dict=aliases_dict,
+)
+
+# Revisions of the selected vintage (or the newest) against the vintage before it
+revision_vintage_ids = list(vintage_entries_dict)
+revised_vintage_id = selected_vintage_id or (revision_vintage_ids[0] if revision_vintage_ids else None)
+if revised_vintage_id in revision_vintage_ids[:-1]:
+    previous_vintage_id = revision_vintage_ids[revision_vintage_ids.index(revised_vintage_id) + 1]
+    revisions_key = (previous_vintage_id, revised_vintage_id)
+    if st.session_state.get('vintage_revisions_key') != revisions_key:
+        st.session_state.vintage_revisions_key = revisions_key
+        st.session_state.df_vintage_revisions = vintage_revisions(
+            vintage_folder=data_config_dict['vintage_store']['folder'],
+            previous_vintage_id=previous_vintage_id,
+            revised_vintage_id=revised_vintage_id,
+            date_column=date_column,
+            data_config_dict=data_config_dict,
+        )
+    with st.sidebar.expander(f"Revisions since {vintage_label(vintage_entries_dict[previous_vintage_id])}"):
+        st.dataframe(st.session_state.df_vintage_revisions, hide_index=True)
+
+# Data quality profile of the source workbooks (not stored for vintages loaded without them)
+try:
+    data_quality_report = read_data_quality_report(pkl_folder_name, cache_fingerprints_dict)
+    with st.sidebar.expander(f"Data quality ({data_quality_report['summary']['Count'].sum()} flags)"):
+        st.dataframe(data_quality_report['summary'], hide_index=True)
+        st.dataframe(data_quality_report['issues'], hide_index=True)
+except FileNotFoundError:
+    pass
+
+# Dense period x company x metric cube of the cleaned data, memory-mapped read-only
+data_cube = load_or_generate_data_cube(
+    df_cleaned=df_cleaned,
+    pkl_folder_name=pkl_folder_name,
+    fingerprint=cache_fingerprints_dict['data_cube'],
+    date_column=date_column,
+    data_config_dict=data_config_dict,
+)
+
+# Rank index of the data cube, kept across reruns so its rankings are computed once
+if st.session_state.get('rank_index_fingerprint') != cache_fingerprints_dict['data_cube']:
+    st.session_state.rank_index_fingerprint = cache_fingerprints_dict['data_cube']
+    st.session_state.rank_index = rank_index_for_data_cube(
+        data_cube=data_cube,
+        df_cleaned=df_cleaned,
+        date_column=date_column,
+        data_config_dict=data_config_dict,
+    )
+
+# Movements of the summary data from every reference date, looked up per selected date
+df_summary_movements = load_or_generate_summary_movements(
+    df_summary=df_summary,
+    pkl_folder_name=pkl_folder_name,
+    fingerprint=cache_fingerprints_dict['summary_movements'],
+    date_column=date_column,
+    data_config_dict=data_config_dict,
 )
 
 # Header
@@ -94,27 +193,39 @@ st.write("Please make your filtering selections below:")
     selected_company,
     top_x_value,
 ) = select_data_filters(
-    df=df_cleaned,
-    date_column=date_column,
+    data_cube=data_cube,
     # group_by_columns=group_by_columns,
     company_column=company_column,
     default_company=default_company,
 )
 
+# Reference dates of the selected date
+reference_dates = determine_reference_dates(
+    selected_date=selected_date,
+    available_dates=set(df_summary[date_column]),
+    date_periods=data_config_dict['reference_dates_config'],
+)
+if reference_dates is None:
+    st.error(f"Error: All {len(data_config_dict['reference_dates_config'])} date references must be present.")
+    st.error("Please make another selection")
+    st.stop()
 
 # Create summary data outputs
 summary_dict = generate_summary_outputs(
     df_summary=df_summary,
+    df_summary_movements=df_summary_movements,
     pkl_folder_name=pkl_folder_name,
     date_column=date_column,
     selected_date=selected_date,
     top_x_value=top_x_value,
-    data_config_dict=data_config_dict,
+    reference_dates=reference_dates,
+    cache_fingerprint=cache_fingerprints_dict['summary_outputs'],
 )
 
 # Create entity data outputs
 entity_dict = generate_entity_outputs(
-    df_cleaned=df_cleaned,
+    data_cube=data_cube,
+    rank_index=st.session_state.rank_index,
     date_column=date_column,
     selected_date=selected_date,
     company_column=company_column,
@@ -123,6 +234,7 @@ entity_dict = generate_entity_outputs(
     pkl_folder_name=pkl_folder_name,
     data_config_dict=data_config_dict,
     color_discrete_map=color_discrete_map,
+    cache_fingerprint=cache_fingerprints_dict['entity_outputs'],
 )
 
 # Insert containers separated into tabs:
@@ -0,0 +1,86 @@
+import os
+import sys
+
+import pytest
+
+# Tests import the modules at the repo root, and read configs/ relative to it
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+
+@pytest.fixture
+def repo_root(monkeypatch):
+    """
+    Runs the test from the repo root, as the app is.
+    """
+    monkeypatch.chdir(REPO_ROOT)
+    return REPO_ROOT
+
+
+@pytest.fixture
+def config(repo_root):
+    """
+    Returns (aliases_dict, color_discrete_map, data_config_dict, date_column) from read_yamls.
+    """
+    from read_yaml_files import read_yamls
+    return read_yamls()
+
+
+HISTORICAL_WORKBOOK = os.path.join(
+    REPO_ROOT,
+    'data_historical',
+    'Monthly authorised deposit-taking institution statistics back-series March 2019 - December 2023.xlsx',
+)
+
+
+@pytest.fixture
+def data_config_dict(config, tmp_path):
+    """
+    The data config, with the vintage store in a temporary folder and workbooks parsed in this
+    process.
+    """
+    _, _, data_config_dict, _ = config
+    data_config_dict['vintage_store']['folder'] = str(tmp_path / 'vintages')
+    data_config_dict['parse_settings']['max_workers'] = 0
+    data_config_dict['back_series_settings']['file_names'] = []
+    return data_config_dict
+
+
+@pytest.fixture(scope='session')
+def table_one():
+    """
+    Table 1 of the historical workbook, as read from the workbook (before processing), limited
+    to its last 8 periods to keep the tests quick.
+    """
+    from read_yaml_files import read_yaml
+    from xlsx_streaming import read_excel_streaming
+
+    data_config_dict = read_yaml(file_path=os.path.join(REPO_ROOT, 'configs', 'data_config.yaml'))
+    df, _ = read_excel_streaming(
+        file_name=HISTORICAL_WORKBOOK,
+        sheet_name=data_config_dict['file_loading_details']['sheet_name'],
+        skiprows=data_config_dict['file_loading_details']['skiprows'],
+        col_types_dict=data_config_dict['expected_columns_and_types_dict'],
+    )
+    last_periods = sorted(df['Period'].unique())[-8:]
+    return df[df['Period'].isin(last_periods)].reset_index(drop=True)
+
+
+def write_workbook(file_name, df, sheet_name='Table 1'):
+    """
+    Writes a data frame as a MADIS workbook sheet: a units row, the header row, then the rows.
+    """
+    import openpyxl
+    import pandas as pd
+
+    workbook = openpyxl.Workbook(write_only=True)
+    worksheet = workbook.create_sheet(sheet_name)
+    worksheet.append(['($million)'])
+    worksheet.append(list(df.columns))
+    for row in df.itertuples(index=False):
+        worksheet.append([
+            value.to_pydatetime() if isinstance(value, pd.Timestamp) else (None if pd.isna(value) else value)
+            for value in row
+        ])
+    workbook.save(file_name)
+    return str(file_name)
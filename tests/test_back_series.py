@@ -0,0 +1,70 @@
+import pandas as pd
+
+from conftest import write_workbook
+from data_back_series import reconcile_back_series
+from data_loading import data_loader
+
+DATE_COLUMN = 'Period'
+VALUE_COLUMN = 'Cash and deposits with financial institutions'
+
+
+def periods_frame(periods, institutions, value):
+    return pd.DataFrame([
+        {DATE_COLUMN: pd.Timestamp(period), 'ABN': institution, VALUE_COLUMN: value}
+        for period in periods for institution in institutions
+    ])
+
+
+def test_reconcile_back_series_takes_each_period_from_the_newest_workbook():
+    df_old = periods_frame(['2023-01-31', '2023-02-28', '2023-03-31'], ['111', '222'], value=1.0)
+    df_new = periods_frame(['2023-02-28', '2023-03-31', '2023-04-30'], ['111'], value=2.0)
+
+    # The newest workbook wins whatever its place in the list
+    df_combined = reconcile_back_series([df_old, df_new], ['old.xlsx', 'new.xlsx'], DATE_COLUMN)
+
+    # An overlapping period is taken whole, so '222' is dropped where the newer workbook revised it
+    expected = pd.concat([
+        periods_frame(['2023-01-31'], ['111', '222'], value=1.0),
+        periods_frame(['2023-02-28', '2023-03-31', '2023-04-30'], ['111'], value=2.0),
+    ], ignore_index=True)
+    pd.testing.assert_frame_equal(df_combined, expected)
+
+
+def test_reconcile_back_series_breaks_ties_by_list_order():
+    df_first = periods_frame(['2023-01-31', '2023-02-28'], ['111'], value=1.0)
+    df_second = periods_frame(['2022-12-31', '2023-02-28'], ['111'], value=2.0)
+
+    df_combined = reconcile_back_series([df_first, df_second], ['first.xlsx', 'second.xlsx'], DATE_COLUMN)
+
+    assert df_combined[VALUE_COLUMN].tolist() == [2.0, 1.0, 1.0]
+    assert df_combined[DATE_COLUMN].is_monotonic_increasing
+
+
+def sorted_frame(df, key_columns):
+    return df.sort_values(key_columns).reset_index(drop=True)
+
+
+def test_data_loader_combines_back_series_workbooks(table_one, data_config_dict, tmp_path):
+    periods = sorted(table_one[DATE_COLUMN].unique())
+    # The back-series holds the first 6 periods, with a stale value in one the release revised
+    df_back_series = table_one[table_one[DATE_COLUMN].isin(periods[:6])].copy()
+    df_back_series.loc[df_back_series.index[df_back_series[DATE_COLUMN] == periods[4]][0], VALUE_COLUMN] += 1000.0
+    back_series_workbook = write_workbook(tmp_path / 'back_series.xlsx', df_back_series)
+    release_workbook = write_workbook(tmp_path / 'release.xlsx', table_one[table_one[DATE_COLUMN].isin(periods[3:])])
+    full_workbook = write_workbook(tmp_path / 'full.xlsx', table_one)
+
+    data_config_dict['back_series_settings']['file_names'] = [back_series_workbook]
+    combined_folder = tmp_path / 'combined'
+    combined_folder.mkdir()
+    df_original, _, df_summary, _ = data_loader(
+        str(combined_folder), data_config_dict, DATE_COLUMN, file_name=release_workbook)
+
+    data_config_dict['back_series_settings']['file_names'] = []
+    full_folder = tmp_path / 'full'
+    full_folder.mkdir()
+    df_original_full, _, df_summary_full, _ = data_loader(
+        str(full_folder), data_config_dict, DATE_COLUMN, file_name=full_workbook)
+
+    key_columns = [DATE_COLUMN, data_config_dict['column_settings']['abn_column']]
+    pd.testing.assert_frame_equal(sorted_frame(df_original, key_columns), sorted_frame(df_original_full, key_columns))
+    pd.testing.assert_frame_equal(sorted_frame(df_summary, [DATE_COLUMN]), sorted_frame(df_summary_full, [DATE_COLUMN]))
@@ -0,0 +1,91 @@
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import write_workbook
+from data_loading import data_loader
+from utils_calculated_columns import compile_calculated_columns, evaluate_calculated_columns
+
+DATE_COLUMN = 'Period'
+
+# Out of dependency order: 'Doubled' uses 'Sum', which is calculated after it in config order
+CALCULATED_COLUMNS = {
+    'Doubled': '[Sum] * 2',
+    'Sum': '[A] + [B]',
+    'Tripled A': [['add', 'A'], ['multiply', 3]],
+}
+
+
+def test_evaluate_calculated_columns_in_generations():
+    df = pd.DataFrame({'A': [1.0, 2.0], 'B': [10.0, 20.0]})
+
+    df_calculated = evaluate_calculated_columns(df, compile_calculated_columns(CALCULATED_COLUMNS))
+
+    expected = df.assign(**{'Doubled': [22.0, 44.0], 'Sum': [11.0, 22.0], 'Tripled A': [3.0, 6.0]})
+    pd.testing.assert_frame_equal(df_calculated, expected)
+
+
+def test_evaluate_calculated_columns_recalculates_only_the_changed_descendants():
+    compiled_columns = compile_calculated_columns(CALCULATED_COLUMNS)
+    df = evaluate_calculated_columns(pd.DataFrame({'A': [1.0, 2.0], 'B': [10.0, 20.0]}), compiled_columns)
+
+    # 'Tripled A' doesn't use B, so it keeps its stale value
+    df['B'] = [100.0, 200.0]
+    df['Tripled A'] = np.nan
+    df_recalculated = evaluate_calculated_columns(df, compiled_columns, changed_columns=['B'])
+
+    assert df_recalculated['Sum'].tolist() == [101.0, 202.0]
+    assert df_recalculated['Doubled'].tolist() == [202.0, 404.0]
+    assert df_recalculated['Tripled A'].isna().all()
+    assert list(df_recalculated.columns) == list(df.columns)
+
+
+def test_evaluate_calculated_columns_rejects_cycles():
+    with pytest.raises(ValueError, match='cycle'):
+        compile_calculated_columns({'X': '[Y] + 1', 'Y': '[X] + 1'})
+
+
+def changed_summary_calculated_columns(calculated_columns_dict):
+    """
+    Changes the base total and adds a column using the columns derived from it, ahead of them.
+    """
+    calculated_columns_dict = {
+        'Housing Percentage Check': (
+            '[Loans to Housing: Owner-occupied Property Percentage] + '
+            '[Loans to Housing: Investment Property Percentage]'
+        ),
+        **calculated_columns_dict,
+    }
+    calculated_columns_dict['Total Loans for Housing'] = calculated_columns_dict['Total Loans for Housing'] + [
+        ['add', 'Loans to households: Credit cards']]
+    return calculated_columns_dict
+
+
+@pytest.mark.parametrize('new_release', [False, True])
+def test_recalculated_summary_equals_full_build(table_one, data_config_dict, tmp_path, caplog, new_release):
+    periods = sorted(table_one[DATE_COLUMN].unique())
+    previous_workbook = write_workbook(tmp_path / 'previous.xlsx', table_one[table_one[DATE_COLUMN] != periods[-1]])
+    # With a new release, the summary is also updated for its new period
+    new_workbook = write_workbook(tmp_path / 'new.xlsx', table_one) if new_release else previous_workbook
+
+    recalculated_folder = tmp_path / 'recalculated'
+    recalculated_folder.mkdir()
+    data_loader(str(recalculated_folder), data_config_dict, DATE_COLUMN, file_name=previous_workbook)
+
+    data_config_dict['summary_data_calculated_columns'] = changed_summary_calculated_columns(
+        data_config_dict['summary_data_calculated_columns'])
+    with caplog.at_level(logging.INFO):
+        _, _, df_summary, _ = data_loader(str(recalculated_folder), data_config_dict, DATE_COLUMN, file_name=new_workbook)
+
+    assert "Recalculating the summary columns affected by ['Housing Percentage Check', 'Total Loans for Housing']" in caplog.messages
+    assert ('Updating df_summary incrementally' in caplog.messages) == new_release
+
+    full_folder = tmp_path / 'full'
+    full_folder.mkdir()
+    _, _, df_summary_full, _ = data_loader(str(full_folder), data_config_dict, DATE_COLUMN, file_name=new_workbook)
+
+    pd.testing.assert_frame_equal(df_summary, df_summary_full)
+    # The percentages no longer add up to 1, as the total now includes credit cards
+    assert (df_summary['Housing Percentage Check'] < 1).all()
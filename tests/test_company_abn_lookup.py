@@ -0,0 +1,47 @@
+import pandas as pd
+
+from data_loading import disambiguated_company_names, generate_company_abn_lookup
+
+
+DATE_COLUMN = 'Period'
+
+
+def company_frame():
+    """
+    Two ABNs share 'Shared Bank' in March only, while 'Solo Bank' is unique in both months.
+    """
+    return pd.DataFrame({
+        DATE_COLUMN: pd.to_datetime(['2023-02-28', '2023-02-28', '2023-03-31', '2023-03-31', '2023-03-31']),
+        'ABN': ['111', '333', '111', '222', '333'],
+        'Institution Name': ['Shared Bank', 'Solo Bank', 'Shared Bank', 'Shared Bank', 'Solo Bank'],
+    })
+
+
+def test_disambiguated_company_names(data_config_dict):
+    company_names = disambiguated_company_names(
+        df=company_frame(),
+        date_column=DATE_COLUMN,
+        data_config_dict=data_config_dict,
+    )
+
+    # A shared name gets the ABN in every month, including the months it was not shared
+    assert company_names.tolist() == [
+        'Shared Bank (111)', 'Solo Bank', 'Shared Bank (111)', 'Shared Bank (222)', 'Solo Bank',
+    ]
+
+
+def test_generate_company_abn_lookup(data_config_dict):
+    company_abn_lookup = generate_company_abn_lookup(
+        df=company_frame(),
+        date_column=DATE_COLUMN,
+        data_config_dict=data_config_dict,
+    )
+
+    expected = pd.DataFrame({
+        'Institution Name': ['Shared Bank (111)', 'Shared Bank (222)', 'Solo Bank'],
+        'ABN': ['111', '222', '333'],
+        'Source Institution Name': ['Shared Bank', 'Shared Bank', 'Solo Bank'],
+        f"First {DATE_COLUMN}": pd.to_datetime(['2023-02-28', '2023-03-31', '2023-02-28']),
+        f"Last {DATE_COLUMN}": pd.to_datetime(['2023-03-31', '2023-03-31', '2023-03-31']),
+    })
+    pd.testing.assert_frame_equal(company_abn_lookup, expected)
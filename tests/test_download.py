@@ -0,0 +1,133 @@
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from data_download import create_session, download_file, download_metadata_path, write_download_metadata
+
+BODY = bytes(range(256)) * 64
+ETAG = '"v1"'
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """
+    Serves BODY with an ETag, honouring If-None-Match and Range requests (416 for ranges past
+    the end).
+    """
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        if self.headers.get('If-None-Match') == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        range_header = self.headers.get('Range')
+        if range_header is None:
+            self.send_body(200, BODY)
+            return
+
+        start = int(range_header.split('=')[1].rstrip('-'))
+        if start >= len(BODY):
+            self.send_response(416)
+            self.send_header('Content-Range', f"bytes */{len(BODY)}")
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_body(206, BODY[start:], content_range=f"bytes {start}-{len(BODY) - 1}/{len(BODY)}")
+
+    def send_body(self, status, body, content_range=None):
+        self.send_response(status)
+        self.send_header('ETag', ETAG)
+        self.send_header('Content-Length', str(len(body)))
+        if content_range:
+            self.send_header('Content-Range', content_range)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), RangeHandler)
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def session():
+    with create_session(max_retries=0) as session:
+        yield session
+
+
+def url_of(server):
+    return f"http://127.0.0.1:{server.server_address[1]}/madis.xlsx"
+
+
+def write_part(file_name, url, part_bytes, content_length=None):
+    with open(file_name + '.part', 'wb') as f:
+        f.write(part_bytes)
+    write_download_metadata(file_name, {'partial': {
+        'url': url, 'etag': ETAG, 'last_modified': None, 'content_length': content_length,
+    }})
+
+
+def assert_complete(file_name, url):
+    with open(file_name, 'rb') as f:
+        assert f.read() == BODY
+    assert not os.path.exists(file_name + '.part')
+    with open(download_metadata_path(file_name)) as f:
+        assert json.load(f) == {'url': url, 'etag': ETAG, 'last_modified': None}
+
+
+def test_download_then_revalidate(server, session, tmp_path):
+    file_name = str(tmp_path / 'madis.xlsx')
+
+    assert download_file(url_of(server), file_name, session=session)
+    assert_complete(file_name, url_of(server))
+
+    # Unchanged file: a conditional request, and the file is kept
+    assert not download_file(url_of(server), file_name, session=session)
+    assert server.requests[-1].get('If-None-Match') == ETAG
+    assert_complete(file_name, url_of(server))
+
+
+def test_resume_interrupted_download(server, session, tmp_path):
+    file_name = str(tmp_path / 'madis.xlsx')
+    write_part(file_name, url_of(server), BODY[:5000])
+
+    assert download_file(url_of(server), file_name, session=session)
+
+    assert server.requests[-1]['Range'] == 'bytes=5000-'
+    assert_complete(file_name, url_of(server))
+
+
+@pytest.mark.parametrize('content_length', [str(len(BODY)), None])
+def test_416_finishes_a_complete_part_file(server, session, tmp_path, content_length):
+    file_name = str(tmp_path / 'madis.xlsx')
+    write_part(file_name, url_of(server), BODY, content_length=content_length)
+
+    assert download_file(url_of(server), file_name, session=session)
+
+    assert len(server.requests) == 1
+    assert_complete(file_name, url_of(server))
+
+
+def test_416_discards_a_part_file_of_another_length(server, session, tmp_path):
+    file_name = str(tmp_path / 'madis.xlsx')
+    write_part(file_name, url_of(server), BODY + b'stale')
+
+    assert download_file(url_of(server), file_name, session=session)
+
+    assert [request.get('Range') for request in server.requests] == [f"bytes={len(BODY) + 5}-", None]
+    assert_complete(file_name, url_of(server))
+
+    # Later calls revalidate the file rather than failing on the part file
+    assert not download_file(url_of(server), file_name, session=session)
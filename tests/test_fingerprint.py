@@ -0,0 +1,80 @@
+import copy
+import os
+
+from utils_fingerprint import (
+    CACHE_LAYER_CONFIG_SECTIONS,
+    CACHE_LAYER_PARENTS,
+    cache_fingerprints,
+    fingerprinted_name,
+    prune_stale_cache_files,
+)
+
+
+def descendants(layer):
+    """
+    Returns the layer and every layer derived from it.
+    """
+    layers = {layer}
+    for child, parent in CACHE_LAYER_PARENTS.items():
+        if parent == layer:
+            layers |= descendants(child)
+    return layers
+
+
+def changed_layers(fingerprints_dict, other_fingerprints_dict):
+    return {layer for layer in fingerprints_dict if fingerprints_dict[layer] != other_fingerprints_dict[layer]}
+
+
+def test_fingerprints_are_deterministic(config):
+    _, _, data_config_dict, _ = config
+    assert cache_fingerprints('source', data_config_dict) == cache_fingerprints('source', copy.deepcopy(data_config_dict))
+
+
+def test_new_source_invalidates_every_layer(config):
+    _, _, data_config_dict, _ = config
+    assert changed_layers(
+        cache_fingerprints('source', data_config_dict),
+        cache_fingerprints('other source', data_config_dict),
+    ) == set(CACHE_LAYER_PARENTS)
+
+
+def test_config_change_invalidates_its_layers_and_their_descendants_only(config):
+    _, _, data_config_dict, _ = config
+    fingerprints_dict = cache_fingerprints('source', data_config_dict)
+
+    sections = {section_path.split('.')[0] for section_paths in CACHE_LAYER_CONFIG_SECTIONS.values() for section_path in section_paths}
+    for section in sections:
+        changed_config_dict = copy.deepcopy(data_config_dict)
+        changed_config_dict[section] = {'changed': True}
+        reading_layers = [
+            layer for layer, section_paths in CACHE_LAYER_CONFIG_SECTIONS.items()
+            if any(section_path.split('.')[0] == section for section_path in section_paths)
+        ]
+
+        assert changed_layers(fingerprints_dict, cache_fingerprints('source', changed_config_dict)) == set().union(
+            *(descendants(layer) for layer in reading_layers)
+        ), section
+
+
+def test_data_quality_settings_keep_df_original(config):
+    _, _, data_config_dict, _ = config
+    changed_config_dict = copy.deepcopy(data_config_dict)
+    changed_config_dict['data_quality_settings']['outlier_change_ratio'] *= 2
+
+    assert changed_layers(
+        cache_fingerprints('source', data_config_dict),
+        cache_fingerprints('source', changed_config_dict),
+    ) == {'data_quality'}
+
+
+def test_prune_keeps_the_current_fingerprint_only(tmp_path):
+    for fingerprint in ['a' * 64, 'b' * 64]:
+        (tmp_path / (fingerprinted_name('df_cleaned', fingerprint) + '.arrow')).write_bytes(b'')
+    (tmp_path / (fingerprinted_name('df_summary', 'c' * 64) + '.arrow')).write_bytes(b'')
+
+    prune_stale_cache_files(str(tmp_path), 'df_cleaned', 'a' * 64, '.arrow')
+
+    assert sorted(os.listdir(tmp_path)) == [
+        fingerprinted_name('df_cleaned', 'a' * 64) + '.arrow',
+        fingerprinted_name('df_summary', 'c' * 64) + '.arrow',
+    ]
@@ -0,0 +1,77 @@
+import logging
+
+import pandas as pd
+import pytest
+
+from conftest import write_workbook
+from data_incremental import detect_changed_periods
+from data_loading import data_loader
+
+DATE_COLUMN = 'Period'
+VALUE_COLUMN = 'Cash and deposits with financial institutions'
+
+
+def revise(df, period_position, row=0, change=1000.0):
+    """
+    Returns a copy of df with one value of a period changed.
+    """
+    df = df.copy()
+    period = sorted(df[DATE_COLUMN].unique())[period_position]
+    df.loc[df.index[df[DATE_COLUMN] == period][row], VALUE_COLUMN] += change
+    return df
+
+
+def test_detect_changed_periods(table_one):
+    periods = sorted(table_one[DATE_COLUMN].unique())
+    df_previous = table_one[table_one[DATE_COLUMN] != periods[-1]]
+    df_new = revise(table_one[table_one[DATE_COLUMN] != periods[0]], period_position=2)
+
+    changed_periods, removed_periods = detect_changed_periods(df_new, df_previous, DATE_COLUMN)
+
+    assert list(changed_periods) == [periods[3], periods[-1]]
+    assert list(removed_periods) == [periods[0]]
+
+
+def test_detect_changed_periods_ignores_row_order(table_one):
+    changed_periods, removed_periods = detect_changed_periods(
+        table_one.sample(frac=1, random_state=0), table_one, DATE_COLUMN)
+
+    assert changed_periods.empty and removed_periods.empty
+
+
+def sorted_frame(df, key_columns):
+    return df.sort_values(key_columns).reset_index(drop=True)
+
+
+@pytest.mark.parametrize('sparse', [False, True])
+def test_incremental_build_equals_full_build(table_one, data_config_dict, tmp_path, caplog, sparse):
+    data_config_dict['completion_settings']['sparse'] = sparse
+    periods = sorted(table_one[DATE_COLUMN].unique())
+    previous_workbook = write_workbook(tmp_path / 'previous.xlsx', table_one[table_one[DATE_COLUMN] != periods[-1]])
+    # The new release adds the last period and revises an earlier one
+    new_workbook = write_workbook(tmp_path / 'new.xlsx', revise(table_one, period_position=2))
+
+    incremental_folder = tmp_path / 'incremental'
+    incremental_folder.mkdir()
+    data_loader(str(incremental_folder), data_config_dict, DATE_COLUMN, file_name=previous_workbook)
+    with caplog.at_level(logging.INFO):
+        _, df_cleaned, df_summary, _ = data_loader(
+            str(incremental_folder), data_config_dict, DATE_COLUMN, file_name=new_workbook)
+
+    # Both data frames were updated incrementally, from one comparison of the periods
+    assert 'Updating df_summary incrementally' in caplog.messages
+    assert 'Updating df_cleaned incrementally' in caplog.messages
+    assert [message for message in caplog.messages if message.startswith('Incremental refresh: ')] == [
+        'Incremental refresh: 2 new or revised periods, 0 removed periods']
+
+    full_folder = tmp_path / 'full'
+    full_folder.mkdir()
+    _, df_cleaned_full, df_summary_full, _ = data_loader(
+        str(full_folder), data_config_dict, DATE_COLUMN, file_name=new_workbook)
+
+    company_column = data_config_dict['column_settings']['company_column']
+    pd.testing.assert_frame_equal(sorted_frame(df_summary, [DATE_COLUMN]), sorted_frame(df_summary_full, [DATE_COLUMN]))
+    pd.testing.assert_frame_equal(
+        sorted_frame(df_cleaned, [DATE_COLUMN, company_column]),
+        sorted_frame(df_cleaned_full, [DATE_COLUMN, company_column]),
+    )
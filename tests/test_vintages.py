@@ -0,0 +1,103 @@
+import os
+
+import pandas as pd
+
+from conftest import write_workbook
+from data_loading import data_loader, loadable_vintages
+from data_vintages import VINTAGE_CHUNKS_FOLDER_NAME, read_vintage, vintage_revisions, vintage_data_store_folder
+
+DATE_COLUMN = 'Period'
+VALUE_COLUMN = 'Cash and deposits with financial institutions'
+
+
+def sorted_frame(df, key_columns):
+    return df.sort_values(key_columns).reset_index(drop=True)
+
+
+def data_store_files(pkl_folder_name):
+    """
+    Returns the modification time of each file in the data store folder (not its subfolders).
+    """
+    return {
+        entry.name: entry.stat().st_mtime_ns
+        for entry in os.scandir(pkl_folder_name) if entry.is_file()
+    }
+
+
+def test_vintages_share_chunks_and_list_revisions(table_one, data_config_dict, tmp_path):
+    periods = sorted(table_one[DATE_COLUMN].unique())
+    abn_column = data_config_dict['column_settings']['abn_column']
+    company_column = data_config_dict['column_settings']['company_column']
+    key_columns = [DATE_COLUMN, abn_column, company_column]
+
+    # The new release adds the last period and revises one value of an earlier one
+    df_revised = table_one.copy()
+    revised_row = df_revised.index[df_revised[DATE_COLUMN] == periods[2]][0]
+    df_revised.loc[revised_row, VALUE_COLUMN] += 1000.0
+    previous_workbook = write_workbook(tmp_path / 'previous.xlsx', table_one[table_one[DATE_COLUMN] != periods[-1]])
+    new_workbook = write_workbook(tmp_path / 'new.xlsx', df_revised)
+
+    pkl_folder_name = str(tmp_path / 'pickle_files')
+    os.makedirs(pkl_folder_name)
+    df_original_previous, _, _, _ = data_loader(pkl_folder_name, data_config_dict, DATE_COLUMN, file_name=previous_workbook)
+    df_original_new, _, _, _ = data_loader(pkl_folder_name, data_config_dict, DATE_COLUMN, file_name=new_workbook)
+
+    vintage_folder = data_config_dict['vintage_store']['folder']
+    new_vintage, previous_vintage = loadable_vintages(data_config_dict)
+    assert new_vintage['file_name'] == 'new.xlsx' and previous_vintage['file_name'] == 'previous.xlsx'
+
+    # The unrevised periods are stored once, only the new and the revised periods add chunks
+    assert len(os.listdir(os.path.join(vintage_folder, VINTAGE_CHUNKS_FOLDER_NAME))) == len(periods) + 1
+
+    for vintage_entry, df_original in [(previous_vintage, df_original_previous), (new_vintage, df_original_new)]:
+        df_vintage = read_vintage(vintage_folder, vintage_entry['vintage_id'])
+        pd.testing.assert_frame_equal(
+            sorted_frame(df_vintage, key_columns),
+            sorted_frame(df_original, key_columns),
+            check_categorical=False,
+        )
+
+    df_revisions = vintage_revisions(
+        vintage_folder=vintage_folder,
+        previous_vintage_id=previous_vintage['vintage_id'],
+        revised_vintage_id=new_vintage['vintage_id'],
+        date_column=DATE_COLUMN,
+        data_config_dict=data_config_dict,
+    )
+    df_revised_values = df_revisions[df_revisions[DATE_COLUMN] != periods[-1]]
+    assert len(df_revised_values) == 1
+    revision = df_revised_values.iloc[0]
+    assert revision[DATE_COLUMN] == periods[2]
+    assert revision[abn_column] == df_revised.loc[revised_row, abn_column]
+    assert revision['Metric'] == VALUE_COLUMN
+    # The workbook is in $ millions, df_original in dollars
+    assert revision['Revision'] == 1000.0 * 1e6
+
+
+def test_loading_a_vintage_keeps_the_latest_data_store(table_one, data_config_dict, tmp_path):
+    periods = sorted(table_one[DATE_COLUMN].unique())
+    previous_workbook = write_workbook(tmp_path / 'previous.xlsx', table_one[table_one[DATE_COLUMN] != periods[-1]])
+    new_workbook = write_workbook(tmp_path / 'new.xlsx', table_one)
+
+    pkl_folder_name = str(tmp_path / 'pickle_files')
+    os.makedirs(pkl_folder_name)
+    df_original_previous, _, _, _ = data_loader(pkl_folder_name, data_config_dict, DATE_COLUMN, file_name=previous_workbook)
+    data_loader(pkl_folder_name, data_config_dict, DATE_COLUMN, file_name=new_workbook)
+    latest_files = data_store_files(pkl_folder_name)
+
+    previous_vintage = loadable_vintages(data_config_dict)[-1]
+    vintage_pkl_folder_name = vintage_data_store_folder(
+        pkl_folder_name=pkl_folder_name,
+        vintage_id=previous_vintage['vintage_id'],
+        registry_file_name=data_config_dict['institution_registry']['file_name'],
+    )
+    df_original_vintage, _, _, _ = data_loader(
+        vintage_pkl_folder_name, data_config_dict, DATE_COLUMN, vintage_id=previous_vintage['vintage_id'])
+
+    key_columns = [DATE_COLUMN, data_config_dict['column_settings']['abn_column']]
+    pd.testing.assert_frame_equal(
+        sorted_frame(df_original_vintage, key_columns),
+        sorted_frame(df_original_previous, key_columns),
+        check_categorical=False,
+    )
+    assert data_store_files(pkl_folder_name) == latest_files
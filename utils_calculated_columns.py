@@ -0,0 +1,311 @@
+import re
+import ast
+import json
+import logging
+import graphlib
+import functools
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Calculations for the [calculation, operand] steps of a calculated column, applied to the
+# running value of the column (which starts at 0) and an operand column or constant
+BINARY_CALCULATIONS = {
+    'add': np.add,
+    'subtract': np.subtract,
+    'multiply': np.multiply,
+    'divide': np.divide,
+    'power': np.power,
+    'minimum': np.fmin,
+    'maximum': np.fmax,
+}
+
+# Calculations for [calculation] steps, applied to the running value alone
+UNARY_CALCULATIONS = {
+    'abs': np.absolute,
+    'negate': np.negative,
+}
+
+# Operators and functions allowed in formula strings
+EXPRESSION_OPERATORS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.divide,
+    ast.Pow: np.power,
+}
+EXPRESSION_UNARY_OPERATORS = {
+    ast.USub: np.negative,
+    ast.UAdd: np.positive,
+}
+EXPRESSION_FUNCTIONS = {
+    'abs': np.absolute,
+    'min': np.fmin,
+    'max': np.fmax,
+}
+
+# Column references in formula strings are written in square brackets, e.g. '[Trading securities]'
+COLUMN_REFERENCE_PATTERN = re.compile(r'\[([^\[\]]+)\]')
+
+
+def compile_calculation_steps(steps):
+    """
+    Compiles a list of [calculation, operand] steps into a function that evaluates them as a
+    chain of in-place NumPy ufuncs over a single output array.
+
+    Parameters:
+    - steps (list): Steps such as [['add', 'Column A'], ['divide', 'Column B'], ['multiply', 100]].
+      Operands are column names or numeric constants, unary calculations (e.g. ['abs']) have none.
+
+    Raises:
+        ValueError: If a step has an unknown calculation or a missing operand.
+
+    Returns:
+    - tuple: (evaluate, input_columns) where evaluate(get_column, n_rows) returns the column values.
+    """
+    operations = []
+    for step in steps:
+        calculation = step[0]
+        if calculation in UNARY_CALCULATIONS:
+            operations.append((UNARY_CALCULATIONS[calculation], None))
+        elif calculation in BINARY_CALCULATIONS:
+            if len(step) < 2:
+                raise ValueError(f"Calculation '{calculation}' needs a column or constant: {step}")
+            operations.append((BINARY_CALCULATIONS[calculation], step[1]))
+        else:
+            raise ValueError(
+                f"Invalid calculation type '{calculation}'. Use one of: "
+                f"{', '.join(list(BINARY_CALCULATIONS) + list(UNARY_CALCULATIONS))}."
+            )
+
+    input_columns = [operand for _, operand in operations if isinstance(operand, str)]
+
+    def evaluate(get_column, n_rows):
+        result = np.zeros(n_rows)
+        for ufunc, operand in operations:
+            if operand is None:
+                ufunc(result, out=result)
+            else:
+                ufunc(result, get_column(operand) if isinstance(operand, str) else operand, out=result)
+        return result
+
+    return evaluate, input_columns
+
+
+def compile_expression(formula):
+    """
+    Compiles a formula string into a function that evaluates it with NumPy ufuncs.
+
+    Formulas support + - * / ** and brackets, numeric constants, the functions abs, min and max
+    (element-wise, ignoring NaN) and column references in square brackets, e.g.
+    '([Loans to households: Housing: Investment] / [Total Loans for Housing]) * 100'.
+
+    Raises:
+        ValueError: If the formula uses anything else.
+
+    Returns:
+    - tuple: (evaluate, input_columns) where evaluate(get_column, n_rows) returns the column values.
+    """
+    # Swap the column references for identifiers, so the formula parses as a Python expression
+    input_columns = []
+
+    def reference_identifier(match):
+        input_columns.append(match.group(1))
+        return f"__column_{len(input_columns) - 1}__"
+
+    try:
+        tree = ast.parse(COLUMN_REFERENCE_PATTERN.sub(reference_identifier, formula), mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"Invalid formula '{formula}': {e}")
+
+    def compile_node(node):
+        if isinstance(node, ast.Expression):
+            return compile_node(node.body)
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            value = float(node.value)
+            return lambda get_column: value
+        if isinstance(node, ast.Name) and node.id.startswith('__column_'):
+            column = input_columns[int(node.id[len('__column_'):-2])]
+            return lambda get_column: get_column(column)
+        if isinstance(node, ast.BinOp) and type(node.op) in EXPRESSION_OPERATORS:
+            ufunc = EXPRESSION_OPERATORS[type(node.op)]
+            left, right = compile_node(node.left), compile_node(node.right)
+            return lambda get_column: ufunc(left(get_column), right(get_column))
+        if isinstance(node, ast.UnaryOp) and type(node.op) in EXPRESSION_UNARY_OPERATORS:
+            ufunc = EXPRESSION_UNARY_OPERATORS[type(node.op)]
+            operand = compile_node(node.operand)
+            return lambda get_column: ufunc(operand(get_column))
+        if (
+            isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and
+            node.func.id in EXPRESSION_FUNCTIONS and not node.keywords
+        ):
+            ufunc = EXPRESSION_FUNCTIONS[node.func.id]
+            arguments = [compile_node(argument) for argument in node.args]
+            if ufunc.nin != len(arguments):
+                raise ValueError(f"{node.func.id}() takes {ufunc.nin} arguments in formula '{formula}'")
+            return lambda get_column: ufunc(*[argument(get_column) for argument in arguments])
+        raise ValueError(f"Unsupported element '{ast.dump(node)}' in formula '{formula}'")
+
+    compiled = compile_node(tree)
+
+    def evaluate(get_column, n_rows):
+        return np.broadcast_to(np.asarray(compiled(get_column), dtype='float64'), (n_rows,)).copy()
+
+    return evaluate, input_columns
+
+
+def calculation_generations(dependencies_dict):
+    """
+    Orders calculated columns by their dependencies on each other.
+
+    Parameters:
+    - dependencies_dict (dict): Each calculated column to the calculated columns it uses, in
+      config order.
+
+    Raises:
+        ValueError: If calculated columns use each other in a cycle.
+
+    Returns:
+    - dict: Each calculated column to its generation, 0 for columns that only use the data
+      frame's columns and otherwise one after the latest generation it uses. Columns of the
+      same generation don't depend on each other.
+    """
+    sorter = graphlib.TopologicalSorter(dependencies_dict)
+    try:
+        sorter.prepare()
+    except graphlib.CycleError as e:
+        raise ValueError(f"Calculated columns use each other in a cycle: {' -> '.join(e.args[1])}")
+
+    generations_dict = {}
+    generation = 0
+    while sorter.is_active():
+        ready_columns = sorter.get_ready()
+        generations_dict.update({column: generation for column in ready_columns})
+        sorter.done(*ready_columns)
+        generation += 1
+
+    return generations_dict
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_calculated_columns(calculated_columns_json):
+    compiled_columns = []
+    for new_column_name, calculation in json.loads(calculated_columns_json).items():
+        if isinstance(calculation, str):
+            evaluate, input_columns = compile_expression(calculation)
+        else:
+            evaluate, input_columns = compile_calculation_steps(calculation)
+        compiled_columns.append({
+            'column': new_column_name,
+            'evaluate': evaluate,
+            'input_columns': input_columns,
+        })
+
+    # A calculated column using its own name uses the data frame's column of that name
+    calculated_columns = {compiled_column['column'] for compiled_column in compiled_columns}
+    generations_dict = calculation_generations({
+        compiled_column['column']: [
+            column for column in compiled_column['input_columns']
+            if column in calculated_columns and column != compiled_column['column']
+        ]
+        for compiled_column in compiled_columns
+    })
+    for compiled_column in compiled_columns:
+        compiled_column['generation'] = generations_dict[compiled_column['column']]
+
+    return tuple(compiled_columns)
+
+
+def compile_calculated_columns(calculated_columns_dict):
+    """
+    Compiles a calculated columns config section (e.g. source_data_calculated_columns), once
+    per distinct config.
+
+    Each calculated column is either a list of [calculation, operand] steps (see
+    compile_calculation_steps) or a formula string (see compile_expression), and may use other
+    calculated columns, in any config order (see calculation_generations).
+
+    Returns:
+    - tuple: Compiled columns, dicts with 'column', 'evaluate', 'input_columns' and
+      'generation' keys, in config order.
+    """
+    return _compile_calculated_columns(json.dumps(calculated_columns_dict or {}))
+
+
+def affected_calculated_columns(compiled_columns, changed_columns):
+    """
+    Returns the calculated columns to recalculate when changed_columns change: the changed
+    calculated columns and every calculated column using a changed column, directly or
+    through other calculated columns.
+
+    Parameters:
+    - compiled_columns (tuple): Compiled columns, from compile_calculated_columns.
+    - changed_columns (list): Changed columns, data frame columns or calculated columns.
+
+    Returns:
+    - set: The calculated columns to recalculate.
+    """
+    changed_set = set(changed_columns)
+    affected_set = set()
+    for compiled_column in sorted(compiled_columns, key=lambda compiled_column: compiled_column['generation']):
+        if compiled_column['column'] in changed_set or changed_set.intersection(compiled_column['input_columns']):
+            affected_set.add(compiled_column['column'])
+            changed_set.add(compiled_column['column'])
+
+    return affected_set
+
+
+def evaluate_calculated_columns(df, compiled_columns, changed_columns=None):
+    """
+    Evaluates compiled calculated columns over the arrays of a DataFrame, generation by
+    generation. The columns of a generation don't use each other, so each generation is added
+    to the DataFrame in one assignment, which the next generation reads.
+
+    With changed_columns, only the calculated columns affected by them are recalculated (see
+    affected_calculated_columns), the others are used as they are in the DataFrame.
+
+    Parameters:
+    - df (pd.DataFrame): The input DataFrame.
+    - compiled_columns (tuple): Compiled columns, from compile_calculated_columns.
+    - changed_columns (list, optional): Columns changed since the calculated columns in df
+      were calculated. Defaults to recalculating every calculated column.
+
+    Raises:
+        ValueError: If a calculated column uses a column that doesn't exist.
+
+    Returns:
+    - pd.DataFrame: The DataFrame with the calculated columns, new ones added in config order.
+    """
+    if changed_columns is None:
+        recalculated_columns = {compiled_column['column'] for compiled_column in compiled_columns}
+    else:
+        recalculated_columns = affected_calculated_columns(compiled_columns, changed_columns)
+
+    generations_dict = {}
+    for compiled_column in compiled_columns:
+        if compiled_column['column'] in recalculated_columns:
+            generations_dict.setdefault(compiled_column['generation'], []).append(compiled_column)
+
+    df_calculated = df
+
+    def get_column(column):
+        if column not in df_calculated.columns:
+            raise ValueError(f"Calculated columns use a column that doesn't exist: '{column}'")
+        return df_calculated[column].to_numpy(dtype='float64')
+
+    # Divisions by zero give inf or NaN, as they do in pandas
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        for generation in sorted(generations_dict):
+            df_calculated = df_calculated.assign(**{
+                compiled_column['column']: compiled_column['evaluate'](get_column, len(df_calculated))
+                for compiled_column in generations_dict[generation]
+            })
+
+    # New columns are added in config order, after the DataFrame's columns
+    columns = list(df.columns) + [
+        compiled_column['column'] for compiled_column in compiled_columns
+        if compiled_column['column'] in recalculated_columns and compiled_column['column'] not in df.columns
+    ]
+    if list(df_calculated.columns) != columns:
+        df_calculated = df_calculated[columns]
+    return df_calculated
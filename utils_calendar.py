@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+
+def to_month_index(dates):
+    """
+    Converts dates to integer month indices, the number of months since January 1970.
+
+    Parameters:
+    - dates (pandas.Series or array-like): Dates to convert.
+
+    Returns:
+    - numpy.ndarray: int32 month index of each date.
+    """
+    month_values = np.asarray(pd.to_datetime(dates), dtype='datetime64[ns]').astype('datetime64[M]')
+    return month_values.astype('int64').astype('int32')
+
+
+def month_end_dates(month_indices):
+    """
+    Converts integer month indices (see to_month_index) to month-end dates.
+
+    Parameters:
+    - month_indices (array-like): Month indices to convert.
+
+    Returns:
+    - pandas.DatetimeIndex: The month-end date of each month index.
+    """
+    month_values = (np.asarray(month_indices, dtype='int64') + 1).astype('datetime64[M]')
+    return pd.DatetimeIndex(month_values.astype('datetime64[D]') - np.timedelta64(1, 'D')).as_unit('ns')
+
+
+def month_end_range(start, end):
+    """
+    Returns every month-end date from the month of start to the month of end, built from their
+    month indices.
+
+    Parameters:
+    - start (pandas.Timestamp): A date in the first month.
+    - end (pandas.Timestamp): A date in the last month.
+
+    Returns:
+    - pandas.DatetimeIndex: The month-end date of each month, in order.
+    """
+    start_month_index, end_month_index = to_month_index([start, end])
+    return month_end_dates(np.arange(start_month_index, end_month_index + 1))
+
+
+def month_index_positions(dates):
+    """
+    Maps the month index of each date to its position, for O(1) month offset and membership
+    checks, e.g. the position of the date 12 months before a month index m is
+    positions.get(m - 12).
+
+    Parameters:
+    - dates (pandas.Series or array-like): Dates, at most one per month.
+
+    Returns:
+    - dict: Month index to position.
+    """
+    return {month_index: position for position, month_index in enumerate(to_month_index(dates).tolist())}
+
+
+def month_labels(month_indices, date_format):
+    """
+    Formats month indices as display labels of their month-end dates, e.g. '2023 December 31'
+    for '%Y %B %d'.
+
+    Returns:
+    - list: The label of each month index.
+    """
+    return list(month_end_dates(month_indices).strftime(date_format))
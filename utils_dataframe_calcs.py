@@ -4,40 +4,6 @@ import logging
 # Create a logger variable
 logger = logging.getLogger(__name__)
 
-def new_calculated_column(
-        df,
-        new_column_name,
-        calculation,
-        column,
-):
-    """
-    Create a new calculated column in a DataFrame based on specified columns and calculation.
-
-    Parameters:
-    - df (pd.DataFrame): The input DataFrame.
-    - column_1 (str): The name of the first column.
-    - column_2 (str): The name of the second column.
-    - calculation (str): The type of calculation ('add', 'subtract', 'multiply', 'divide').
-    - new_column_name (str): The name for the new calculated column.
-
-    Returns:
-    - pd.DataFrame: The DataFrame with the new calculated column.
-    """
-    logger.debug('\nRunning: new_calculated_column')
-
-    if calculation == 'add':
-        df[new_column_name] = df[new_column_name] + df[column]
-    elif calculation == 'subtract':
-        df[new_column_name] = df[new_column_name] - df[column]
-    elif calculation == 'multiply':
-        df[new_column_name] = df[new_column_name] * df[column]
-    elif calculation == 'divide':
-        df[new_column_name] = df[new_column_name] / df[column]
-    else:
-        raise ValueError("Invalid calculation type. Use 'add', 'subtract', 'multiply', or 'divide'.")
-    
-    return df
-
 def filter_dataframe_by_values(df, df_column_filter_dict):
     """
     Filter a DataFrame based on specified values for multiple columns.
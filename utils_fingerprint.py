@@ -0,0 +1,174 @@
+import os
+import glob
+import json
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Bump a layer's version whenever the code producing that layer changes its output
+CACHE_LAYER_VERSIONS = {
+    'df_original': 1,
+    'workbook_tables': 1,
+    'data_quality': 1,
+    'company_abn_lookup': 1,
+    'df_summary': 1,
+    'df_cleaned': 3,
+    'data_cube': 1,
+    'summary_movements': 1,
+    'summary_outputs': 3,
+    'entity_outputs': 2,
+}
+
+# Layer each cache layer is derived from (None for layers built straight from the source workbook)
+CACHE_LAYER_PARENTS = {
+    'df_original': None,
+    'workbook_tables': None,
+    'data_quality': 'df_original',
+    'company_abn_lookup': 'df_original',
+    'df_summary': 'df_original',
+    'df_cleaned': 'df_original',
+    'data_cube': 'df_cleaned',
+    'summary_movements': 'df_summary',
+    'summary_outputs': 'summary_movements',
+    'entity_outputs': 'data_cube',
+}
+
+# data_config_dict sections (dotted paths for nested keys) that feed each layer
+CACHE_LAYER_CONFIG_SECTIONS = {
+    'df_original': [
+        'file_loading_details',
+        'expected_columns_and_types_dict',
+        'column_adjustments_dict',
+        'source_data_calculated_columns',
+    ],
+    'workbook_tables': [
+        'workbook_tables',
+        'expected_columns_and_types_dict',
+    ],
+    'data_quality': [
+        'data_quality_settings',
+    ],
+    'company_abn_lookup': [
+        'column_settings.company_column',
+        'column_settings.abn_column',
+    ],
+    'df_summary': [
+        'summary_data_calculated_columns',
+    ],
+    'df_cleaned': [
+        'column_settings.company_column',
+        'column_settings.abn_column',
+        'institution_registry.id_column',
+        'institution_aliases',
+        'completion_settings',
+        'rank_settings.materialise_rank_columns',
+        'compact_dtypes',
+    ],
+    'data_cube': [
+        'completion_settings',
+    ],
+    'summary_movements': [
+        'reference_dates_config',
+    ],
+    'summary_outputs': [
+        'reference_dates_config',
+    ],
+    'entity_outputs': [
+        'reference_dates_config',
+        'value_columns_to_graph',
+    ],
+}
+
+
+def file_sha256(file_name, chunk_size=1024 * 1024):
+    """
+    Returns the sha256 hex digest of a file, read in chunks.
+    """
+    sha256 = hashlib.sha256()
+    with open(file_name, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def config_section(data_config_dict, section_path):
+    """
+    Returns the value at a dotted section path of the data config, or None if it is not set.
+    """
+    value = data_config_dict
+    for key in section_path.split('.'):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def layer_fingerprint(layer, parent_fingerprint, data_config_dict):
+    """
+    Fingerprints a cache layer from its parent's fingerprint, its code version and the config
+    sections it depends on.
+
+    Parameters:
+    - layer (str): Cache layer name, a key of CACHE_LAYER_VERSIONS.
+    - parent_fingerprint (str): Fingerprint of the parent layer, or of the source workbook.
+    - data_config_dict (dict): The data configuration dictionary.
+
+    Returns:
+    - str: sha256 hex digest identifying the layer's contents.
+    """
+    fingerprint_dict = {
+        'layer': layer,
+        'version': CACHE_LAYER_VERSIONS[layer],
+        'parent': parent_fingerprint,
+        'config': {
+            section_path: config_section(data_config_dict, section_path)
+            for section_path in CACHE_LAYER_CONFIG_SECTIONS[layer]
+        },
+    }
+    fingerprint_json = json.dumps(fingerprint_dict, sort_keys=True, default=str)
+
+    return hashlib.sha256(fingerprint_json.encode('utf-8')).hexdigest()
+
+
+def cache_fingerprints(source_fingerprint, data_config_dict):
+    """
+    Fingerprints every cache layer, starting from the source workbook fingerprint.
+
+    Parameters:
+    - source_fingerprint (str): sha256 of the source workbook.
+    - data_config_dict (dict): The data configuration dictionary.
+
+    Returns:
+    - dict: Cache layer name to fingerprint.
+    """
+    fingerprints_dict = {}
+    for layer, parent_layer in CACHE_LAYER_PARENTS.items():
+        parent_fingerprint = source_fingerprint if parent_layer is None else fingerprints_dict[parent_layer]
+        fingerprints_dict[layer] = layer_fingerprint(layer, parent_fingerprint, data_config_dict)
+
+    return fingerprints_dict
+
+
+def fingerprinted_name(name, fingerprint, length=16):
+    """
+    Appends a shortened fingerprint to a cache artifact name.
+    """
+    return f"{name}-{fingerprint[:length]}"
+
+
+def prune_stale_cache_files(pkl_folder_name, name, fingerprint, extension):
+    """
+    Removes cache files for a cache artifact that were written under any other fingerprint.
+
+    Parameters:
+    - pkl_folder_name (str): Cache folder.
+    - name (str): Artifact name prefix the files were fingerprinted under.
+    - fingerprint (str): The current fingerprint, files with this fingerprint are kept.
+    - extension (str): File extension of the artifact, e.g. '.arrow'.
+    """
+    current_suffix = '-' + fingerprint[:16] + extension
+    for file_name in glob.glob(os.path.join(glob.escape(pkl_folder_name), glob.escape(name) + '*' + extension)):
+        if not file_name.endswith(current_suffix):
+            logger.info(f"Removing stale cache file: {file_name}")
+            os.remove(file_name)
@@ -0,0 +1,69 @@
+import logging
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_COLUMN_TYPES = ['date', 'str', 'float']
+
+
+def convert_block(block, cols_type):
+    """
+    Converts a 2-D block of raw values, one column per block column, to a single type in one
+    vectorized operation.
+
+    Parameters:
+        block (numpy.ndarray): 2-D object array of raw values (rows x columns).
+        cols_type (str): Desired data type for the block ('date', 'str', 'float').
+
+    Raises:
+        ValueError: If an unexpected data type is provided.
+
+    Returns:
+        tuple: (converted, failure_counts) where converted is a 2-D array of the block in its
+        native dtype (datetime64[ns], float64 or object strings) and failure_counts is a 1-D
+        array with the number of non-empty values per column that could not be converted.
+        Empty values become NaT/NaN, or 'nan' for strings.
+    """
+    n_rows, n_columns = block.shape
+    values = block.ravel(order='F')
+    is_empty = pd.isna(values)
+
+    if cols_type == 'date':
+        converted = pd.to_datetime(values, errors='coerce').values
+        is_failure = ~is_empty & np.isnat(converted)
+    elif cols_type == 'str':
+        converted = np.where(is_empty, 'nan', values.astype(str)).astype(object)
+        is_failure = np.zeros(len(values), dtype=bool)
+    elif cols_type == 'float':
+        try:
+            converted = values.astype('float64')
+        except (TypeError, ValueError):
+            converted = pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').to_numpy(dtype='float64')
+        is_failure = ~is_empty & np.isnan(converted)
+    else:
+        raise ValueError('Unexpected data type. Supported types are: "date", "str", "float".')
+
+    return (
+        converted.reshape((n_rows, n_columns), order='F'),
+        is_failure.reshape((n_rows, n_columns), order='F').sum(axis=0),
+    )
+
+
+def group_columns_by_type(col_types_dict):
+    """
+    Groups a column to type dictionary into a type to column list dictionary.
+    """
+    type_to_columns_dict = {}
+    for column, dtype in col_types_dict.items():
+        type_to_columns_dict.setdefault(dtype, []).append(column)
+    return type_to_columns_dict
+
+
+def log_coercion_failures(coercion_failures_dict):
+    """
+    Logs a warning for every column with values that could not be converted.
+    """
+    for column, failure_count in coercion_failures_dict.items():
+        if failure_count:
+            logger.warning(f"{failure_count} values in '{column}' could not be converted and were set to empty")
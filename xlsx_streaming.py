@@ -0,0 +1,111 @@
+import logging
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+from utils_type_conversion import convert_block, group_columns_by_type, log_coercion_failures
+
+logger = logging.getLogger(__name__)
+
+
+def read_excel_streaming(
+        file_name,
+        sheet_name,
+        skiprows,
+        col_types_dict,
+        key_columns=None,
+        chunk_size=2000,
+):
+    """
+    Streams a worksheet in read-only mode, keeping only the expected columns and casting them to
+    their final types chunk by chunk as rows are read. Each chunk is cast with one vectorized
+    conversion per column type.
+
+    The openpyxl object model is never built for the whole workbook, and only one chunk of raw
+    cell values is held in memory at a time.
+
+    Parameters:
+    - file_name (str): The path to the Excel file to be read.
+    - sheet_name (str): The worksheet to read.
+    - skiprows (int): Number of rows above the header row.
+    - col_types_dict (dict): Expected columns and their types, e.g. expected_columns_and_types_dict.
+    - key_columns (list, optional): Columns every row must have a value in. Rows with an
+      empty key column (e.g. notes below a table) are skipped before casting, so they aren't
+      counted as coercion failures.
+    - chunk_size (int): Number of rows to read before casting.
+
+    Raises:
+        ValueError: If any of the expected columns are missing from the header row.
+
+    Returns:
+    - tuple: (df, coercion_failures_dict) with the expected columns in their final types and
+      the number of values per column that could not be converted (and became NaT/NaN).
+    """
+    workbook = load_workbook(filename=file_name, read_only=True, data_only=True)
+    try:
+        rows = workbook[sheet_name].iter_rows(min_row=skiprows + 1, values_only=True)
+
+        # Map the expected columns to their position in the header row
+        header = next(rows)
+        header_positions = {name: i for i, name in enumerate(header) if name is not None}
+        missing_columns = set(col_types_dict.keys()) - set(header_positions.keys())
+        if missing_columns:
+            logger.error(f"Missing expected columns: {missing_columns}")
+            raise ValueError(f"Missing expected columns: {missing_columns}")
+
+        unexpected_columns = set(header_positions.keys()) - set(col_types_dict.keys())
+        if unexpected_columns:
+            logger.info(f"Dropping unexpected columns: {unexpected_columns}")
+
+        positions = [header_positions[column] for column in col_types_dict.keys()]
+        key_positions = [list(col_types_dict.keys()).index(column) for column in key_columns or []]
+
+        # Read and cast the rows a chunk at a time
+        columns = list(col_types_dict.keys())
+        type_positions_dict = {
+            cols_type: [columns.index(column) for column in column_list]
+            for cols_type, column_list in group_columns_by_type(col_types_dict).items()
+        }
+        typed_chunks = {column: [] for column in columns}
+        coercion_failures_dict = {column: 0 for column in columns}
+        chunk = []
+
+        def cast_chunk(chunk):
+            block = np.empty((len(chunk), len(positions)), dtype=object)
+            for i, values in enumerate(chunk):
+                block[i] = values
+            for cols_type, type_positions in type_positions_dict.items():
+                converted, failure_counts = convert_block(block[:, type_positions], cols_type)
+                for i, position in enumerate(type_positions):
+                    column = columns[position]
+                    typed_chunks[column].append(converted[:, i])
+                    coercion_failures_dict[column] += int(failure_counts[i])
+
+        for row in rows:
+            values = tuple(row[i] if i < len(row) else None for i in positions)
+
+            # Skip blank rows, such as the unused rows at the end of the sheet
+            if all(value is None for value in values):
+                continue
+
+            # Skip rows without keys
+            if any(values[i] is None or values[i] == '' for i in key_positions):
+                continue
+
+            chunk.append(values)
+            if len(chunk) >= chunk_size:
+                cast_chunk(chunk)
+                chunk = []
+
+        # Cast the last chunk, an empty chunk still gives typed (empty) columns
+        if chunk or not typed_chunks[columns[0]]:
+            cast_chunk(chunk)
+
+    finally:
+        workbook.close()
+
+    df = pd.DataFrame({column: np.concatenate(typed_chunks[column]) for column in columns})
+    logger.debug(f"Streamed {len(df)} rows from '{sheet_name}'")
+    log_coercion_failures(coercion_failures_dict)
+
+    return df, coercion_failures_dict